@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Micro-benchmark and equivalence check for the Hermes prompt classifier.
+
+classify_prompt() (generated into automem_policy.py) replaces four separate
+regex scans plus a re-split of the prompt in the provider's prefetch. This
+script times both on ~100 KB prompts (a pasted traceback, prose, a prompt with
+no signal at all, a non-ASCII paste and one with a case-folding character that
+forces the slow path) and, with --check, verifies that the classifier
+reproduces the per-pattern results exactly over a fixed corpus and a seeded
+fuzz run.
+
+Usage: python3 scripts/bench-hermes-classifier.py [--size 100000] [--check]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "templates", "hermes", "provider"))
+
+from automem_policy import (  # noqa: E402
+    _ASCII_CASE_FOLD_PATTERN,
+    CASUAL_OPENING_PATTERN,
+    DEBUG_PROMPT_PATTERN,
+    ENTITY_PATTERN,
+    ENTITY_STOPWORDS,
+    EXPLICIT_RECALL_PROMPT_PATTERN,
+    classify_prompt,
+)
+
+
+def reference_classify(prompt: str):
+    """The provider's per-pattern classification before classify_prompt()."""
+    normalized = " ".join((prompt or "").split())
+    words = [word for word in normalized.split(" ") if word]
+    casual = bool(CASUAL_OPENING_PATTERN.search(normalized))
+    if not normalized:
+        substantive = False
+    elif casual and len(words) <= 4:
+        substantive = False
+    else:
+        substantive = len(words) >= 3 or "?" in normalized or bool(DEBUG_PROMPT_PATTERN.search(normalized))
+    entities = set()
+    for match in ENTITY_PATTERN.finditer(prompt or ""):
+        token = match.group(0).strip("-_")
+        normalized_token = token.lower()
+        if len(token) >= 3 and normalized_token not in ENTITY_STOPWORDS:
+            entities.add(normalized_token)
+    return (
+        casual,
+        bool(DEBUG_PROMPT_PATTERN.search(prompt or "")),
+        bool(EXPLICIT_RECALL_PROMPT_PATTERN.search(prompt or "")),
+        substantive,
+        len(words),
+        frozenset(entities),
+    )
+
+
+CORPUS = [
+    "",
+    "   ",
+    "hi",
+    "Hi there!",
+    "thanks",
+    "thank\n you so much",
+    "who are you",
+    "WHO   ARE\tYOU?",
+    "ok cool do it now please",
+    "hiya friend",
+    "testing the Staging-Cluster rollout",
+    "stack\ntrace",
+    "stack\n\ntrace please",
+    "Stack Trace",
+    "it doesn't\twork",
+    "does not work",
+    "fix?",
+    "What do you remember about the Billing-Service?",
+    "do we like FalkorDB",
+    "Tell me about Qdrant and the api-gateway",
+    "Remember when we moved to Railway? Also the TypeError in parser-v2",
+    "ErrorBoundary crashes in React-Router",
+    "RECALL everything on ConnectionResetError",
+    "reinvestigate the flaky e2e-matrix job",
+    "ſtack trace in the İnvestigation",
+    "DEBUG the ſtack trace",
+    "naïve résumé parser: tell me about it",
+    "Straße fails on Ǆemal Kelvin",
+    "Kubernetes deploy failed",
+    "Café-Bar and Naïve-Bayes notes, what do we think of them?",
+    "who's on call for Ingest-Pipeline?",
+    "Should we switch to Terraform, and how do we feel about Pulumi",
+]
+
+_FUZZ_WORDS = (
+    "hi hello thanks thank you ok test who are you error stack trace Traceback fix "
+    "can't doesn't work does not recall remember when tell me about what do we think of "
+    "Billing-Service api-gateway Kubernetes FalkorDB React and the should how why "
+    "ſtack İnvestigat ı Kelvin café Straße ? ! - _ 42 x-y-z"
+).split(" ")
+_FUZZ_SPACES = (" ", " ", " ", "  ", "\n", "\t", " ", " ", "")
+
+
+def fuzz_prompts(count: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(0, 12)):
+            word = rng.choice(_FUZZ_WORDS)
+            if rng.random() < 0.3:
+                word = word.upper() if rng.random() < 0.5 else word.title()
+            parts.append(word)
+            parts.append(rng.choice(_FUZZ_SPACES))
+        yield "".join(parts)
+
+
+def check_case_folds() -> int:
+    """Every non-ASCII character that could break the str.lower() fast path.
+
+    Keywords are lowercase ASCII letters, spaces and apostrophes; a character
+    matters if re.IGNORECASE equates it with one of those or its lowercase
+    form contains one. The generated fold pattern must cover all of them on
+    this interpreter's Unicode database.
+    """
+    keyword_char = re.compile(r"[a-z' ]", re.IGNORECASE)
+    missing = []
+    for codepoint in range(128, sys.maxunicode + 1):
+        char = chr(codepoint)
+        folds = keyword_char.fullmatch(char) is not None or any(ord(c) < 128 for c in char.lower())
+        if folds and _ASCII_CASE_FOLD_PATTERN.fullmatch(char) is None:
+            missing.append(f"U+{codepoint:04X}")
+    if missing:
+        print(f"_ASCII_CASE_FOLD_PATTERN misses {', '.join(missing)}")
+    return len(missing)
+
+
+def check(fuzz: int, seed: int) -> int:
+    if check_case_folds():
+        return 1
+    mismatches = 0
+    checked = 0
+    for prompt in [*CORPUS, *fuzz_prompts(fuzz, seed)]:
+        checked += 1
+        expected = reference_classify(prompt)
+        actual = tuple(classify_prompt(prompt))
+        if actual != expected:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"MISMATCH {prompt!r}\n  expected {expected}\n  actual   {actual}")
+    print(f"checked {checked} prompts, {mismatches} mismatch(es)")
+    return 1 if mismatches else 0
+
+
+def _sample_prompts(size: int):
+    frame = (
+        '  File "/srv/app/handlers/module_{i}.py", line {i}, in handle_{i}\n'
+        "    result = client.fetch(RequestContext(user_id=uid, retries=3))\n"
+    )
+    traceback = "Traceback (most recent call last):\n"
+    i = 0
+    while len(traceback) < size:
+        traceback += frame.format(i=i)
+        i += 1
+    rng = random.Random(7)
+    vocabulary = "the quick Brown fox jumps over lazy dog Kubernetes api-gateway and we should maybe".split()
+    prose = " ".join(rng.choice(vocabulary) for _ in range(size // 4))
+    quiet = " ".join(rng.choice(["lorem", "ipsum", "dolor", "sit", "amet"]) for _ in range(size // 5))
+    return {
+        "traceback": traceback[:size],
+        "prose": prose[:size],
+        "no-signal": quiet[:size],
+        "non-ascii": ("café " + quiet)[:size],
+        "case-fold": ("ſ " + quiet)[:size],
+    }
+
+
+def _time(fn, text: str, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(text)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000, help="Prompt size in characters (default: 100000)")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="Verify exact equivalence and exit")
+    parser.add_argument("--fuzz", type=int, default=20_000, help="Random prompts for --check (default: 20000)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.check:
+        return check(args.fuzz, args.seed)
+
+    print(f"{'prompt':<12} {'per-pattern ms':>15} {'classify_prompt ms':>19} {'speedup':>8}")
+    for name, text in _sample_prompts(args.size).items():
+        if reference_classify(text) != tuple(classify_prompt(text)):
+            print(f"{name}: classifications differ", file=sys.stderr)
+            return 1
+        before = _time(reference_classify, text, args.rounds)
+        after = _time(classify_prompt, text, args.rounds)
+        print(f"{name:<12} {before:>15.2f} {after:>19.2f} {before / after:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Compression benchmark for the Hermes provider's AutoMem transport.
+
+Starts the bundled fake backend behind a simulated bandwidth-limited link and
+drives the provider's two bulky request shapes over the pooled transport:
+detailed recalls (large responses) and auto-captured conversation turns
+(large request bodies). Each runs once with compression off and once with
+gzip responses plus gzip request bodies above the size threshold. The report
+shows bytes on the wire and per-request latency for both.
+
+Usage: python3 scripts/bench-hermes-compression.py [--bandwidth-kbps 2000] [--requests 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "templates", "hermes", "provider"))
+
+from fake_backend import start_fake_backend  # noqa: E402
+from transport import (  # noqa: E402
+    ACCEPT_ENCODING,
+    DEFAULT_COMPRESS_MIN_BYTES,
+    ConnectionPool,
+    gzip_body,
+    raise_for_status,
+)
+
+_VOCABULARY = (
+    "the provider recalls memories about deployment retries webhook backoff Railway Qdrant FalkorDB "
+    "graph vector embedding session prompt user prefers concise answers with code references tests "
+    "vitest matrix nightly staging cluster billing service ingest pipeline fixed ConnectionResetError "
+    "by retrying idempotent requests after the breaker opened and the spool replayed pending writes"
+).split()
+
+
+def _prose(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_VOCABULARY) for _ in range(words)).capitalize() + "."
+
+
+def _turn(rng: random.Random) -> dict:
+    user = _prose(rng, 80)
+    assistant = "\n".join(_prose(rng, 60) for _ in range(6))
+    return {
+        "memories": [
+            {
+                "content": f"[role: user]\n{user}\n\n[role: assistant]\n{assistant}",
+                "tags": ["hermes", "conversation-turn"],
+                "metadata": {"source": "hermes_provider", "session_id": "bench"},
+            }
+        ]
+    }
+
+
+def _run(url: str, compress: bool, requests: int, seed: int) -> dict:
+    pool = ConnectionPool()
+    rng = random.Random(seed)
+    headers = {"Content-Type": "application/json"}
+    if compress:
+        headers["Accept-Encoding"] = ACCEPT_ENCODING
+    report = {}
+    for name in ("recall", "capture"):
+        before = pool.stats()
+        latencies = []
+        for _ in range(requests):
+            if name == "recall":
+                query = urllib.parse.urlencode({"query": _prose(rng, 4), "limit": 10, "format": "detailed"})
+                method, path, body = "GET", f"/recall?{query}", None
+            else:
+                method, path, body = "POST", "/memory/batch", json.dumps(_turn(rng)).encode("utf-8")
+            request_headers = headers
+            if compress and body is not None:
+                compressed = gzip_body(body, DEFAULT_COMPRESS_MIN_BYTES)
+                if compressed is not None:
+                    body = compressed
+                    request_headers = {**headers, "Content-Encoding": "gzip"}
+            started = time.perf_counter()
+            response = pool.request(method, f"{url}{path}", body=body, headers=request_headers)
+            latencies.append(time.perf_counter() - started)
+            raise_for_status(url + path, response)
+            json.loads(response.body)
+        after = pool.stats()
+        latencies.sort()
+        report[name] = {
+            "sent": after["bytes_sent"] - before["bytes_sent"],
+            "received": after["bytes_received"] - before["bytes_received"],
+            "p50_ms": latencies[len(latencies) // 2] * 1000,
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+        }
+    pool.close()
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bandwidth-kbps", type=float, default=2000.0, help="Simulated link speed (default: 2000)")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Added server latency (default: 5)")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per operation (default: 40)")
+    parser.add_argument("--memories", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_fake_backend(
+        memories=0,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        bandwidth_kbps=args.bandwidth_kbps,
+    )
+    rng = random.Random(args.seed)
+    for _ in range(args.memories):
+        server.backend.add({"content": _prose(rng, 90), "tags": ["bench"], "metadata": {"summary": _prose(rng, 20)}})
+    try:
+        plain = _run(server.url, False, args.requests, args.seed)
+        gzipped = _run(server.url, True, args.requests, args.seed)
+    finally:
+        server.stop()
+
+    print(f"link {args.bandwidth_kbps:g} kbit/s, {args.latency_ms:g}ms server latency, {args.requests} requests each")
+    print(f"{'operation':<10} {'mode':<6} {'sent B':>9} {'received B':>11} {'p50 ms':>8} {'mean ms':>8}")
+    for name in ("recall", "capture"):
+        for mode, report in (("plain", plain), ("gzip", gzipped)):
+            row = report[name]
+            print(
+                f"{name:<10} {mode:<6} {row['sent']:>9} {row['received']:>11} "
+                f"{row['p50_ms']:>8.1f} {row['mean_ms']:>8.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
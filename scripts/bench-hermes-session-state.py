@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Memory benchmark for the Hermes provider's per-session state table.
+
+Simulates a long-lived gateway: SESSIONS distinct sessions each run a few
+turns that mention fresh entities, interleaved with a small set of hot
+sessions that keep coming back. Traced heap usage is sampled as the session
+count grows; with the bounded table it stays flat once the LRU cap is reached,
+while the previous unbounded dict-of-sets grows linearly.
+
+Usage: python3 scripts/bench-hermes-session-state.py [--sessions 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "templates", "hermes", "provider"))
+
+from session_state import SessionTable  # noqa: E402
+
+TURNS_PER_SESSION = 3
+ENTITIES_PER_TURN = 8
+HOT_SESSIONS = 32
+
+
+def _entities(session: int, turn: int):
+    return [f"entity-{session}-{turn}-{index}" for index in range(ENTITIES_PER_TURN)]
+
+
+def _run_bounded(table: SessionTable, session: int) -> None:
+    for turn in range(TURNS_PER_SESSION):
+        state = table.get_or_create(f"session-{session}")
+        entities = _entities(session, turn)
+        state.unseen(entities)
+        state.remember(entities)
+        state.first_substantive_done = True
+
+
+def _run_unbounded(table: dict, session: int) -> None:
+    for turn in range(TURNS_PER_SESSION):
+        state = table.setdefault(f"session-{session}", {"first_substantive_done": False, "entities": set()})
+        state["entities"].update(_entities(session, turn))
+        state["first_substantive_done"] = True
+
+
+def _measure(label: str, sessions: int, checkpoints: int, run, table) -> None:
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    step = max(1, sessions // checkpoints)
+    print(f"\n{label}")
+    print(f"  {'sessions':>10}  {'live':>8}  {'heap MiB':>9}")
+    for session in range(sessions):
+        run(table, session)
+        run(table, session % HOT_SESSIONS)
+        if (session + 1) % step == 0:
+            current = tracemalloc.get_traced_memory()[0] - baseline
+            print(f"  {session + 1:>10}  {len(table):>8}  {current / (1024 * 1024):>9.2f}")
+    tracemalloc.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument(
+        "--compare-unbounded",
+        action="store_true",
+        help="Also run the previous unbounded dict-of-sets layout for comparison",
+    )
+    args = parser.parse_args()
+
+    _measure("bounded SessionTable", args.sessions, args.checkpoints, _run_bounded, SessionTable())
+    if args.compare_unbounded:
+        _measure("unbounded dict of sets", args.sessions, args.checkpoints, _run_unbounded, {})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
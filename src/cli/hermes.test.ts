@@ -290,9 +290,51 @@ describe('hermes setup handler', () => {
     );
     expect(fs.readFileSync(path.join(pluginRoot, 'cli.py'), 'utf8')).toContain('def register_cli');
     expect(fs.readFileSync(path.join(pluginRoot, 'cli.py'), 'utf8')).toContain('doctor');
+    expect(fs.readFileSync(path.join(pluginRoot, 'cli.py'), 'utf8')).toContain('def cmd_bench');
     expect(fs.readFileSync(path.join(pluginRoot, 'automem_policy.py'), 'utf8')).toContain(
       'PREFERENCE_RECALL_LIMIT = 5'
     );
+    expect(fs.readFileSync(path.join(pluginRoot, 'transport.py'), 'utf8')).toContain(
+      'class ConnectionPool'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'breaker.py'), 'utf8')).toContain(
+      'class CircuitBreaker'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'recall_cache.py'), 'utf8')).toContain(
+      'class RecallCache'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'write_queue.py'), 'utf8')).toContain(
+      'class WriteQueue'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'spool.py'), 'utf8')).toContain(
+      'class WriteSpool'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'session_state.py'), 'utf8')).toContain(
+      'class SessionTable'
+    );
+    // The fake backend is a development tool and stays in the repository.
+    expect(fs.existsSync(path.join(pluginRoot, 'fake_backend.py'))).toBe(false);
+    expect(fs.readFileSync(path.join(pluginRoot, 'metrics.py'), 'utf8')).toContain(
+      'def render_prometheus'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'recall_decoder.py'), 'utf8')).toContain(
+      'def decode_recall_response'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'mirror.py'), 'utf8')).toContain(
+      'class LocalMirror'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'bulk_import.py'), 'utf8')).toContain(
+      'class BulkImporter'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'bulk_export.py'), 'utf8')).toContain(
+      'class Exporter'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'warm_start.py'), 'utf8')).toContain(
+      'class WarmStartCache'
+    );
+    expect(fs.readFileSync(path.join(pluginRoot, 'routing.py'), 'utf8')).toContain(
+      'class EndpointRouter'
+    );
     expect(fs.readFileSync(path.join(tmpDir, '.env'), 'utf8')).toContain(
       'AUTOMEM_API_URL=https://example.automem.test'
     );
@@ -173,7 +173,25 @@ function installHermesProvider(
   options: Pick<CommonOptions, 'dryRun' | 'quiet'>
 ): void {
   const providerRoot = path.join(paths.home, 'plugins', HERMES_PROVIDER_NAME);
-  const files = ['__init__.py', 'plugin.yaml', 'cli.py', 'automem_policy.py'];
+  const files = [
+    '__init__.py',
+    'plugin.yaml',
+    'cli.py',
+    'automem_policy.py',
+    'transport.py',
+    'breaker.py',
+    'recall_cache.py',
+    'write_queue.py',
+    'spool.py',
+    'session_state.py',
+    'metrics.py',
+    'recall_decoder.py',
+    'mirror.py',
+    'bulk_import.py',
+    'bulk_export.py',
+    'warm_start.py',
+    'routing.py',
+  ];
   for (const fileName of files) {
     const sourcePath = path.join(HERMES_PROVIDER_TEMPLATE_ROOT, fileName);
     const targetPath = path.join(providerRoot, fileName);
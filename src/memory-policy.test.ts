@@ -1,6 +1,6 @@
 import fs from 'fs';
 import path from 'path';
-import { execFileSync } from 'child_process';
+import { execFileSync, spawnSync } from 'child_process';
 import { fileURLToPath } from 'url';
 import { describe, expect, it } from 'vitest';
 import {
@@ -29,6 +29,7 @@ import {
 } from './memory-policy/shared.js';
 
 const REPO_ROOT = path.resolve(fileURLToPath(new URL('..', import.meta.url)));
+const HAS_PYTHON3 = spawnSync('python3', ['--version']).status === 0;
 
 function readRepoFile(relativePath: string): string {
   return fs.readFileSync(path.join(REPO_ROOT, relativePath), 'utf8');
@@ -417,6 +418,22 @@ describe('shared AutoMem memory policy', () => {
     expect(source).toContain('topic shift');
   });
 
+  it.skipIf(!HAS_PYTHON3)(
+    'generates a Hermes prompt classifier that matches the per-pattern checks exactly',
+    () => {
+      const source = readRepoFile('templates/hermes/provider/automem_policy.py');
+      expect(source).toContain('def classify_prompt(prompt: str) -> PromptClassification:');
+      expect(source).toContain('PROMPT_SIGNAL_PATTERN = re.compile(');
+
+      const output = execFileSync(
+        'python3',
+        ['scripts/bench-hermes-classifier.py', '--check', '--fuzz', '5000'],
+        { cwd: REPO_ROOT, encoding: 'utf8' }
+      );
+      expect(output).toContain(', 0 mismatch(es)');
+    }
+  );
+
   it('renders Hermes mode-specific rules from the shared policy surface', () => {
     expect(renderHermesModeRules('mcp')).toContain('mcp_automem_recall_memory');
     expect(renderHermesModeRules('provider')).toContain('automem_recall_memory');
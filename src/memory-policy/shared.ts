@@ -956,8 +956,41 @@ function renderPythonRawRegex(source: string): string {
   return `r"""${source.replace(/"""/g, '\\"\\"\\"')}"""`;
 }
 
+// The Hermes classifier matches these keyword patterns case-sensitively
+// against str.lower() of ASCII prompts, which is only equivalent to
+// re.IGNORECASE while the sources are plain lowercase text. The wrapping group
+// is dropped so Python's regex engine sees a top-level alternation and can
+// skip ahead on the set of first characters.
+// Non-ASCII characters that re.IGNORECASE folds onto ASCII letters (or whose
+// str.lower() contains one): dotted/dotless i, long s and the Kelvin sign.
+// Prompts containing them take the exact case-insensitive patterns instead.
+const PYTHON_ASCII_CASE_FOLD_CHARACTERS = String.raw`[\u0130\u0131\u017f\u212a]`;
+
+function lowercaseKeywordAlternation(name: string, source: string): string {
+  if (/[A-Z\\[.*+?{^$]/.test(source)) {
+    throw new Error(`${name} must stay a lowercase keyword alternation for the Hermes classifier`);
+  }
+  let depth = 0;
+  for (let index = 0; index < source.length; index += 1) {
+    if (source[index] === '(') depth += 1;
+    if (source[index] === ')') depth -= 1;
+    if (depth === 0 && index < source.length - 1) {
+      throw new Error(`${name} must be a single parenthesized alternation`);
+    }
+  }
+  return source.slice(1, -1);
+}
+
 export function renderHermesProviderPolicyPython(): string {
   const provider = AUTOMEM_PROVIDER_POLICY_DEFAULTS;
+  const debugKeywords = lowercaseKeywordAlternation(
+    'DEBUG_PROMPT_PATTERN_SOURCE',
+    DEBUG_PROMPT_PATTERN_SOURCE
+  );
+  const explicitKeywords = lowercaseKeywordAlternation(
+    'EXPLICIT_RECALL_PROMPT_PATTERN_SOURCE',
+    EXPLICIT_RECALL_PROMPT_PATTERN_SOURCE
+  );
   return [
     '"""Generated AutoMem policy constants for the Hermes provider.',
     '',
@@ -965,6 +998,7 @@ export function renderHermesProviderPolicyPython(): string {
     '"""',
     '',
     'import re',
+    'from typing import FrozenSet, NamedTuple',
     '',
     `DEFAULT_RECALL_LIMIT = ${provider.preferenceRecallLimit}`,
     `PREFERENCE_RECALL_LIMIT = ${provider.preferenceRecallLimit}`,
@@ -980,6 +1014,90 @@ export function renderHermesProviderPolicyPython(): string {
     `EXPLICIT_RECALL_PROMPT_PATTERN = re.compile(${renderPythonRawRegex(EXPLICIT_RECALL_PROMPT_PATTERN_SOURCE)}, re.IGNORECASE)`,
     `ENTITY_PATTERN = re.compile(${renderPythonRawRegex(ENTITY_PATTERN_SOURCE)})`,
     '',
+    '# Debug and explicit-recall keywords combined into one alternation, matched',
+    '# without re.IGNORECASE against str.lower() of the prompt. That is equivalent',
+    '# to the case-insensitive patterns above; the combined search finds the first',
+    '# keyword of either kind and classify_prompt() looks for the other from there.',
+    `PROMPT_SIGNAL_PATTERN = re.compile(${renderPythonRawRegex(`${debugKeywords}|${explicitKeywords}`)})`,
+    `_DEBUG_SIGNAL_PATTERN = re.compile(${renderPythonRawRegex(debugKeywords)})`,
+    `_EXPLICIT_SIGNAL_PATTERN = re.compile(${renderPythonRawRegex(explicitKeywords)})`,
+    `_ASCII_CASE_FOLD_PATTERN = re.compile(${renderPythonRawRegex(PYTHON_ASCII_CASE_FOLD_CHARACTERS)})`,
+    '',
+    '',
+    'class PromptClassification(NamedTuple):',
+    '    casual: bool',
+    '    debug: bool',
+    '    explicit: bool',
+    '    substantive: bool',
+    '    word_count: int',
+    '    entities: FrozenSet[str]',
+    '',
+    '',
+    'def extract_prompt_entities(text: str) -> FrozenSet[str]:',
+    '    entities = set()',
+    '    for match in ENTITY_PATTERN.finditer(text or ""):',
+    '        token = match.group(0).strip("-_")',
+    '        normalized = token.lower()',
+    '        if len(token) >= 3 and normalized not in ENTITY_STOPWORDS:',
+    '            entities.add(normalized)',
+    '    return frozenset(entities)',
+    '',
+    '',
+    'def classify_prompt(prompt: str) -> PromptClassification:',
+    '    """Classify a prompt for ambient recall in fewer passes than the per-pattern checks.',
+    '',
+    '    Gives exactly the results of running CASUAL_OPENING_PATTERN on the',
+    '    whitespace-normalized prompt, DEBUG_PROMPT_PATTERN and',
+    '    EXPLICIT_RECALL_PROMPT_PATTERN on the raw prompt, and ENTITY_PATTERN for',
+    '    entities. The prompt is split once; keywords take one combined search plus',
+    '    at most one search for the other kind from the first match, and entities',
+    '    keep their own case-sensitive scan.',
+    '    """',
+    '    text = prompt or ""',
+    '    words = text.split()',
+    '    word_count = len(words)',
+    '    # The casual opener is anchored and at most three words long, so the first',
+    '    # three words decide it exactly as the whole normalized prompt would.',
+    '    casual = CASUAL_OPENING_PATTERN.search(" ".join(words[:3])) is not None',
+    '    # Outside ASCII, str.lower() matches re.IGNORECASE for these keywords',
+    '    # except on the few characters _ASCII_CASE_FOLD_PATTERN finds.',
+    '    if text.isascii() or _ASCII_CASE_FOLD_PATTERN.search(text) is None:',
+    '        lowered = text.lower()',
+    '        match = PROMPT_SIGNAL_PATTERN.search(lowered)',
+    '        if match is None:',
+    '            debug = explicit = False',
+    '        else:',
+    '            # Nothing of either kind starts before the first match, so the',
+    '            # other kind only needs searching from there on.',
+    '            start = match.start()',
+    '            debug = _DEBUG_SIGNAL_PATTERN.match(lowered, start) is not None',
+    '            if debug:',
+    '                explicit = _EXPLICIT_SIGNAL_PATTERN.search(lowered, start) is not None',
+    '            else:',
+    '                explicit = True',
+    '                debug = _DEBUG_SIGNAL_PATTERN.search(lowered, start) is not None',
+    '    else:',
+    '        # Case folding differs from str.lower() here; keep the exact patterns.',
+    '        debug = DEBUG_PROMPT_PATTERN.search(text) is not None',
+    '        explicit = EXPLICIT_RECALL_PROMPT_PATTERN.search(text) is not None',
+    '    if casual and word_count <= 4:',
+    '        substantive = False',
+    '    elif word_count >= 3 or "?" in text or debug:',
+    '        substantive = True',
+    '    else:',
+    '        # A keyword split by a whitespace run ("stack\\ntrace") only matches',
+    '        # once the prompt is normalized.',
+    '        substantive = word_count > 0 and DEBUG_PROMPT_PATTERN.search(" ".join(words)) is not None',
+    '    return PromptClassification(',
+    '        casual=casual,',
+    '        debug=debug,',
+    '        explicit=explicit,',
+    '        substantive=substantive,',
+    '        word_count=word_count,',
+    '        entities=extract_prompt_entities(text),',
+    '    )',
+    '',
+    '',
     'PREFETCH_POLICY_HINTS = {',
     '    "preference_sort": "updated_desc",',
     '    "task_time_query": f"last {CONTEXT_RECALL_WINDOW_DAYS} days",',
@@ -7,15 +7,20 @@ and keeps automatic turn capture disabled by default.
 
 from __future__ import annotations
 
+import http.client
+import hashlib
 import json
 import logging
 import os
 import re
+import sqlite3
 import threading
+import time
 import urllib.error
 import urllib.parse
-import urllib.request
-from typing import Any, Dict, List, Optional, Set, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
 
 from agent.memory_provider import MemoryProvider
 from tools.registry import tool_error
@@ -23,45 +28,110 @@ from tools.registry import tool_error
 if __package__:
     from .automem_policy import (
         AMBIGUOUS_PROJECT_TAGS,
-        CASUAL_OPENING_PATTERN,
         CONTEXT_RECALL_LIMIT,
         CONTEXT_RECALL_WINDOW_DAYS,
-        DEBUG_PROMPT_PATTERN,
         DEBUG_RECALL_LIMIT,
         DEFAULT_RECALL_LIMIT,
-        ENTITY_PATTERN,
-        ENTITY_STOPWORDS,
-        EXPLICIT_RECALL_PROMPT_PATTERN,
         MAX_EXPLICIT_RECALL_LIMIT,
         PREFERENCE_RECALL_LIMIT,
+        classify_prompt,
+        extract_prompt_entities,
     )
+    from .breaker import CircuitBreaker, breaker_for
+    from .metrics import DEFAULT_FLUSH_INTERVAL, metrics, write_snapshot
+    from .mirror import DEFAULT_MAX_ENTRIES as DEFAULT_MIRROR_ENTRIES
+    from .mirror import LocalMirror, mirror_path_for
+    from .recall_cache import RecallCache
+    from .recall_decoder import decode_recall_response
+    from .routing import EndpointRouter, parse_endpoints
+    from .session_state import SessionState, SessionTable
+    from .spool import ReplayRejected, WriteSpool, spool_path_for
+    from .transport import (
+        ACCEPT_ENCODING,
+        DEFAULT_COMPRESS_MIN_BYTES,
+        ConnectionPool,
+        PoolExhausted,
+        TransportResponse,
+        accepts_gzip_requests,
+        gzip_body,
+        raise_for_status,
+        shared_pool,
+    )
+    from .warm_start import WARM_START_FILENAME, WarmStartCache
+    from .write_queue import BatchWriteError, WriteQueue
 else:
     from automem_policy import (
         AMBIGUOUS_PROJECT_TAGS,
-        CASUAL_OPENING_PATTERN,
         CONTEXT_RECALL_LIMIT,
         CONTEXT_RECALL_WINDOW_DAYS,
-        DEBUG_PROMPT_PATTERN,
         DEBUG_RECALL_LIMIT,
         DEFAULT_RECALL_LIMIT,
-        ENTITY_PATTERN,
-        ENTITY_STOPWORDS,
-        EXPLICIT_RECALL_PROMPT_PATTERN,
         MAX_EXPLICIT_RECALL_LIMIT,
         PREFERENCE_RECALL_LIMIT,
+        classify_prompt,
+        extract_prompt_entities,
+    )
+    from breaker import CircuitBreaker, breaker_for
+    from metrics import DEFAULT_FLUSH_INTERVAL, metrics, write_snapshot
+    from mirror import DEFAULT_MAX_ENTRIES as DEFAULT_MIRROR_ENTRIES
+    from mirror import LocalMirror, mirror_path_for
+    from recall_cache import RecallCache
+    from recall_decoder import decode_recall_response
+    from routing import EndpointRouter, parse_endpoints
+    from session_state import SessionState, SessionTable
+    from spool import ReplayRejected, WriteSpool, spool_path_for
+    from transport import (
+        ACCEPT_ENCODING,
+        DEFAULT_COMPRESS_MIN_BYTES,
+        ConnectionPool,
+        PoolExhausted,
+        TransportResponse,
+        accepts_gzip_requests,
+        gzip_body,
+        raise_for_status,
+        shared_pool,
     )
+    from warm_start import WARM_START_FILENAME, WarmStartCache
+    from write_queue import BatchWriteError, WriteQueue
 
 DEFAULT_ENDPOINT = "http://127.0.0.1:8001"
 DEFAULT_TIMEOUT = 8.0
+# End-to-end deadline for ambient recall in prefetch. Explicit tool calls keep
+# DEFAULT_TIMEOUT; AUTOMEM_HERMES_PREFETCH_BUDGET_MS=0 disables the budget.
+DEFAULT_PREFETCH_BUDGET_MS = 3000
+# Shared by every provider instance and session in the process for recall
+# fan-out and speculative recall. One prefetch runs at most three sections;
+# the default matches the transport's per-endpoint connection cap.
+DEFAULT_RECALL_WORKERS = 16
+# The only memory fields ambient recall renders (see _format_memory_result and
+# _memory_key); servers that support projection omit everything else.
+AMBIENT_RECALL_FIELDS = "id,content,tags"
+# The local mirror also keeps updated_at so a stale copy never replaces a newer one.
+MIRROR_RECALL_FIELDS = f"{AMBIENT_RECALL_FIELDS},updated_at"
+# Ambient sections the local mirror can answer when the backend is slow or down.
+LOCAL_MIRROR_SECTIONS = {"Preferences", "Task context"}
+# Characters of memory lines one prefetch may inject across all sections
+# (roughly 1,000 tokens); AUTOMEM_HERMES_CONTEXT_BUDGET_CHARS=0 removes the cap.
+DEFAULT_CONTEXT_BUDGET_CHARS = 4000
+# A memory injected in any of a session's last N turns is not injected again;
+# older repeats are shortened. AUTOMEM_HERMES_REPEAT_WINDOW_TURNS=0 turns
+# cross-turn de-duplication off.
+DEFAULT_REPEAT_WINDOW_TURNS = 10
+REPEAT_PREVIEW_CHARS = 100
+# A line that overruns the budget is clipped only if this much budget is left.
+MIN_CLIPPED_LINE_CHARS = 60
 logger = logging.getLogger(__name__)
 
+_recall_executor: Optional[ThreadPoolExecutor] = None
+_recall_executor_lock = threading.Lock()
+
 
 def _truthy(value: str) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
 def _debug_enabled() -> bool:
-    return _truthy(os.environ.get("AUTOMEM_HERMES_DEBUG", ""))
+    return _env_flag("AUTOMEM_HERMES_DEBUG", False)
 
 
 def _debug(message: str, *args: Any) -> None:
@@ -69,21 +139,130 @@ def _debug(message: str, *args: Any) -> None:
         logger.info("[automem] " + message, *args)
 
 
+def _env_flag(name: str, default: bool) -> bool:
+    """An on/off environment flag; unset or blank means ``default``."""
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    if default:
+        return value not in {"0", "false", "no", "n", "off"}
+    return _truthy(value)
+
+
 def _provider_tools_enabled() -> bool:
-    value = os.environ.get("AUTOMEM_HERMES_PROVIDER_TOOLS", "true")
-    return value.strip().lower() not in {"0", "false", "no", "n", "off"}
+    return _env_flag("AUTOMEM_HERMES_PROVIDER_TOOLS", True)
+
+
+def _prefetch_budget_seconds() -> Optional[float]:
+    raw = os.environ.get("AUTOMEM_HERMES_PREFETCH_BUDGET_MS", "").strip()
+    try:
+        budget_ms = float(raw) if raw else DEFAULT_PREFETCH_BUDGET_MS
+    except ValueError:
+        budget_ms = DEFAULT_PREFETCH_BUDGET_MS
+    if budget_ms <= 0:
+        return None
+    return budget_ms / 1000.0
+
+
+def _recall_cache_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_RECALL_CACHE", True)
+
+
+def _speculative_recall_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_SPECULATIVE_RECALL", False)
+
+
+def _compression_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_COMPRESSION", True)
+
+
+def _compress_min_bytes() -> int:
+    try:
+        return int(os.environ.get("AUTOMEM_HERMES_COMPRESS_MIN_BYTES", "").strip() or DEFAULT_COMPRESS_MIN_BYTES)
+    except ValueError:
+        return DEFAULT_COMPRESS_MIN_BYTES
+
+
+def _recall_projection_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_RECALL_PROJECTION", True)
+
+
+def _recall_batch_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_RECALL_BATCH", True)
+
+
+def _local_mirror_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_LOCAL_MIRROR", False)
+
+
+def _local_mirror_max_entries() -> int:
+    try:
+        entries = int(os.environ.get("AUTOMEM_HERMES_LOCAL_MIRROR_MAX_ENTRIES", "").strip() or DEFAULT_MIRROR_ENTRIES)
+    except ValueError:
+        return DEFAULT_MIRROR_ENTRIES
+    return max(1, entries)
+
+
+def _warm_start_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_WARM_START", False)
+
+
+def _shared_client_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_SHARED_CLIENT", False)
+
+
+def _context_budget_chars() -> Optional[int]:
+    try:
+        chars = int(os.environ.get("AUTOMEM_HERMES_CONTEXT_BUDGET_CHARS", "").strip() or DEFAULT_CONTEXT_BUDGET_CHARS)
+    except ValueError:
+        chars = DEFAULT_CONTEXT_BUDGET_CHARS
+    return chars if chars > 0 else None
+
+
+def _repeat_window_turns() -> int:
+    try:
+        turns = int(os.environ.get("AUTOMEM_HERMES_REPEAT_WINDOW_TURNS", "").strip() or DEFAULT_REPEAT_WINDOW_TURNS)
+    except ValueError:
+        return DEFAULT_REPEAT_WINDOW_TURNS
+    return max(0, turns)
+
+
+def _spool_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_SPOOL", False)
+
+
+def _prometheus_file() -> str:
+    return os.environ.get("AUTOMEM_HERMES_PROMETHEUS_FILE", "").strip()
+
+
+def _hermes_home(kwargs: Dict[str, Any]) -> str:
+    return str(
+        kwargs.get("hermes_home")
+        or os.environ.get("HERMES_HOME")
+        or os.path.join(os.path.expanduser("~"), ".hermes")
+    )
+
+
+def _recall_workers() -> int:
+    try:
+        workers = int(os.environ.get("AUTOMEM_HERMES_RECALL_WORKERS", "").strip() or DEFAULT_RECALL_WORKERS)
+    except ValueError:
+        return DEFAULT_RECALL_WORKERS
+    return max(1, workers)
 
 
 def _api_key() -> str:
     return os.environ.get("AUTOMEM_API_KEY") or os.environ.get("AUTOMEM_API_TOKEN") or ""
 
 
+def _endpoints() -> List[str]:
+    """Configured endpoints, primary first; see routing.py."""
+    value = os.environ.get("AUTOMEM_API_URL") or os.environ.get("AUTOMEM_ENDPOINT") or DEFAULT_ENDPOINT
+    return parse_endpoints(value) or [DEFAULT_ENDPOINT]
+
+
 def _endpoint() -> str:
-    return (
-        os.environ.get("AUTOMEM_API_URL")
-        or os.environ.get("AUTOMEM_ENDPOINT")
-        or DEFAULT_ENDPOINT
-    ).rstrip("/")
+    return _endpoints()[0]
 
 
 def _clean_text(value: str) -> str:
@@ -123,32 +302,24 @@ def _project_tags_for_task_context(prompt: str, *, is_explicit: bool) -> List[st
     return tags
 
 
-def _is_substantive_prompt(prompt: str) -> bool:
-    normalized = " ".join((prompt or "").split())
-    if not normalized:
-        return False
-    words = [word for word in normalized.split(" ") if word]
-    if CASUAL_OPENING_PATTERN.search(normalized) and len(words) <= 4:
-        return False
-    return len(words) >= 3 or "?" in normalized or bool(DEBUG_PROMPT_PATTERN.search(normalized))
-
-
-def _looks_like_debug_prompt(prompt: str) -> bool:
-    return bool(DEBUG_PROMPT_PATTERN.search(prompt or ""))
-
+def _preference_recall_args() -> Dict[str, Any]:
+    return {
+        "tags": ["preference"],
+        "limit": PREFERENCE_RECALL_LIMIT,
+        "sort": "updated_desc",
+        "format": "detailed",
+    }
 
-def _looks_like_explicit_recall_prompt(prompt: str) -> bool:
-    return bool(EXPLICIT_RECALL_PROMPT_PATTERN.search(prompt or ""))
 
-
-def _extract_prompt_entities(prompt: str) -> Set[str]:
-    entities: Set[str] = set()
-    for match in ENTITY_PATTERN.finditer(prompt or ""):
-        token = match.group(0).strip("-_")
-        normalized = token.lower()
-        if len(token) >= 3 and normalized not in ENTITY_STOPWORDS:
-            entities.add(normalized)
-    return entities
+def _project_context_args(project_tags: List[str]) -> Dict[str, Any]:
+    """The project's recent memories, independent of the prompt; kept for warm starts."""
+    return {
+        "tags": list(project_tags),
+        "time_query": f"last {CONTEXT_RECALL_WINDOW_DAYS} days",
+        "limit": CONTEXT_RECALL_LIMIT,
+        "sort": "updated_desc",
+        "format": "detailed",
+    }
 
 
 def _bounded_recall_limit(value: Any) -> int:
@@ -159,6 +330,90 @@ def _bounded_recall_limit(value: Any) -> int:
     return max(1, min(limit, MAX_EXPLICIT_RECALL_LIMIT))
 
 
+def _recall_query_params(args: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in {
+            "query": args.get("query", ""),
+            "limit": _bounded_recall_limit(args.get("limit")),
+            "format": args.get("format") or "detailed",
+            "time_query": args.get("time_query"),
+            "sort": args.get("sort"),
+            "fields": args.get("fields"),
+        }.items()
+        if value not in {"", None}
+    }
+
+
+def _recall_path(args: Dict[str, Any]) -> str:
+    params = urllib.parse.urlencode(_recall_query_params(args), doseq=True)
+    if isinstance(args.get("tags"), list):
+        tag_params = urllib.parse.urlencode({"tags": args["tags"]}, doseq=True)
+        params = f"{params}&{tag_params}" if params else tag_params
+    return f"recall?{params}" if params else "recall"
+
+
+def _fails_over(exc: BaseException) -> bool:
+    """Whether a failed read should be retried on the next endpoint."""
+    if isinstance(exc, urllib.error.HTTPError):
+        # A 4xx is the request's fault and every replica would refuse it too.
+        return exc.code >= 500 or exc.code in {408, 429}
+    return isinstance(exc, (OSError, http.client.HTTPException))
+
+
+def _recall_batch_query(args: Dict[str, Any]) -> Dict[str, Any]:
+    query = _recall_query_params(args)
+    if isinstance(args.get("tags"), list):
+        query["tags"] = list(args["tags"])
+    return query
+
+
+def _health_capabilities(health: Any) -> Set[str]:
+    """Feature names a /health response advertises, as a list or a flag map."""
+    capabilities = health.get("capabilities") if isinstance(health, dict) else None
+    if isinstance(capabilities, dict):
+        return {str(name) for name, enabled in capabilities.items() if enabled}
+    if isinstance(capabilities, list):
+        return {str(name) for name in capabilities}
+    return set()
+
+
+def _recall_cache_key(args: Dict[str, Any]) -> Tuple[Any, ...]:
+    params = _recall_query_params(args)
+    query = " ".join(str(params.pop("query", "")).split())
+    tags = args.get("tags") if isinstance(args.get("tags"), list) else []
+    return (query, tuple(sorted(params.items())), tuple(sorted({str(tag) for tag in tags})))
+
+
+def _recall_kind(args: Dict[str, Any]) -> str:
+    tags = args.get("tags") if isinstance(args.get("tags"), list) else []
+    if "preference" in tags and not args.get("query"):
+        return "preference"
+    if args.get("time_query"):
+        return "context"
+    return "query"
+
+
+def _shared_recall_executor() -> ThreadPoolExecutor:
+    global _recall_executor
+    with _recall_executor_lock:
+        if _recall_executor is None:
+            _recall_executor = ThreadPoolExecutor(
+                max_workers=_recall_workers(),
+                thread_name_prefix="automem-recall",
+            )
+        return _recall_executor
+
+
+def _section_label(label: str) -> str:
+    return label.lower().replace(" ", "_")
+
+
+def _observe_capture_acks(waits: List[float]) -> None:
+    for wait in waits:
+        metrics.observe("automem_capture_ack_seconds", wait)
+
+
 def _format_memory_result(item: Dict[str, Any]) -> str:
     memory = item.get("memory") if isinstance(item.get("memory"), dict) else item
     content = _clean_text(str(memory.get("content") or item.get("content") or ""))
@@ -186,6 +441,55 @@ def _extract_recall_items(response: Any) -> List[Dict[str, Any]]:
     return []
 
 
+def _mirror_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    memory = item.get("memory") if isinstance(item.get("memory"), dict) else item
+    return {
+        "id": memory.get("id") or item.get("id"),
+        "content": memory.get("content") or item.get("content"),
+        "tags": memory.get("tags") or item.get("tags"),
+        "updated_at": memory.get("updated_at") or memory.get("timestamp"),
+    }
+
+
+def _stored_memory_ids(response: Any) -> List[Any]:
+    if not isinstance(response, dict):
+        return []
+    if isinstance(response.get("memory_ids"), list):
+        return response["memory_ids"]
+    return [response.get("memory_id")]
+
+
+def _batch_results(payload: Any, expected: int) -> List[Any]:
+    responses = payload.get("results") if isinstance(payload, dict) else None
+    if not isinstance(responses, list) or len(responses) != expected:
+        raise ValueError("recall/batch returned a mismatched result list")
+    return responses
+
+
+def _batch_idempotency_key(keys: Sequence[Optional[str]]) -> Optional[str]:
+    # Same items, same key: a resent batch is recognised, while the remainder
+    # of a partly written batch (a different body) gets a key of its own.
+    if not keys or not all(keys):
+        return None
+    return "batch-" + hashlib.sha256("\n".join(str(key) for key in keys).encode("utf-8")).hexdigest()[:32]
+
+
+def _with_content_encoding(headers: Dict[str, str], compressed: Optional[bytes]) -> Dict[str, str]:
+    return {**headers, "Content-Encoding": "gzip"} if compressed is not None else headers
+
+
+def _displayable_key(item: Any) -> Optional[str]:
+    if not isinstance(item, dict) or not _format_memory_result(item):
+        return None
+    return _memory_key(item)
+
+
+def _ambient_decode_cap(args: Dict[str, Any]) -> int:
+    # A conforming server returns at most `limit` results, all of which are
+    # decoded; the cap only cuts short a response that overshoots the limit.
+    return _bounded_recall_limit(args.get("limit"))
+
+
 def _memory_key(item: Dict[str, Any]) -> str:
     memory = item.get("memory") if isinstance(item.get("memory"), dict) else item
     memory_id = memory.get("id") or item.get("id")
@@ -195,98 +499,710 @@ def _memory_key(item: Dict[str, Any]) -> str:
     return f"content:{content[:160]}"
 
 
+def _clip_line(line: str, chars: int) -> str:
+    if len(line) <= chars:
+        return line
+    return line[: chars - 1].rstrip() + "…"
+
+
+class _ContextBudget:
+    """One prefetch's character budget and view of the session's injection history.
+
+    Sections spend the budget in plan order, so earlier sections win. Within
+    a section, memories the session has not been shown come before repeats.
+    """
+
+    def __init__(self, state: Optional[SessionState], window: int, chars: Optional[int]):
+        self.remaining = chars
+        self.injected: List[str] = []
+        self._state = state if window > 0 else None
+        self._turn = state.turns if state is not None else 0
+        self._window = window
+
+    def order(self, candidates: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        if self._state is None:
+            return candidates
+        return sorted(candidates, key=lambda candidate: self._state.injected_turn(candidate[0]) is not None)
+
+    def admit(self, key: str, line: str) -> Optional[str]:
+        """Return the line to inject for a memory, shortened if need be, or None to skip it."""
+        outcome = "injected"
+        last = self._state.injected_turn(key) if self._state is not None else None
+        if last is not None:
+            if self._turn - last <= self._window:
+                metrics.inc("automem_context_lines_total", outcome="suppressed")
+                return None
+            line = _clip_line(line, REPEAT_PREVIEW_CHARS)
+            outcome = "shortened"
+        if self.remaining is not None:
+            if len(line) > self.remaining:
+                if self.remaining < MIN_CLIPPED_LINE_CHARS:
+                    metrics.inc("automem_context_lines_total", outcome="over_budget")
+                    return None
+                line = _clip_line(line, self.remaining)
+                outcome = "clipped"
+            self.remaining -= len(line) + 1
+        metrics.inc("automem_context_lines_total", outcome=outcome)
+        self.injected.append(key)
+        return line
+
+
 def _format_recall_section(
     label: str,
     response: Any,
     seen: Set[str],
     limit: int,
+    budget: Optional[_ContextBudget] = None,
 ) -> str:
-    lines: List[str] = []
+    candidates: List[Tuple[str, str]] = []
+    keys: Set[str] = set()
     for item in _extract_recall_items(response):
         if not isinstance(item, dict):
             continue
         key = _memory_key(item)
-        if key in seen:
+        if key in seen or key in keys:
             continue
         line = _format_memory_result(item)
         if not line:
             continue
-        seen.add(key)
-        lines.append(line)
+        keys.add(key)
+        candidates.append((key, line))
+    if budget is not None:
+        candidates = budget.order(candidates)
+    lines: List[str] = []
+    for key, line in candidates:
         if len(lines) >= limit:
             break
+        seen.add(key)
+        admitted = budget.admit(key, line) if budget is not None else line
+        if admitted is not None:
+            lines.append(admitted)
     if not lines:
         return ""
     return f"{label}:\n" + "\n".join(lines)
 
 
+class _PreparedRequest(NamedTuple):
+    """One request as the pool sends it; built by AutoMemClient._prepare()."""
+
+    method: str
+    url: str
+    headers: Dict[str, str]
+    data: Optional[bytes]
+    # gzip copy of data, sent in its place; None once the server rejects gzip.
+    compressed: Optional[bytes]
+    timeout: float
+    breaker: CircuitBreaker
+
+    @property
+    def body(self) -> Optional[bytes]:
+        return self.compressed or self.data
+
+    @property
+    def send_headers(self) -> Dict[str, str]:
+        return _with_content_encoding(self.headers, self.compressed)
+
+
+class _BatchRecallPlan(NamedTuple):
+    queries: List[Dict[str, Any]]
+    # One slot per query, cache hits already filled in.
+    results: List[Any]
+    # Indexes of the queries still to fetch.
+    misses: List[int]
+    # Recall cache generation when the plan was made; see RecallCache.put().
+    generation: int
+    # POST /recall/batch body, or None to fetch the misses one at a time.
+    body: Optional[Dict[str, Any]]
+
+
+def _record_transport_failure(breaker: CircuitBreaker, exc: BaseException) -> None:
+    # A saturated local pool says nothing about the endpoint's health.
+    if not isinstance(exc, PoolExhausted):
+        breaker.record_failure(exc)
+
+
+def _update_request(args: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Split update tool args into (memory id, PATCH body)."""
+    memory_id = str(args.get("memory_id") or "").strip()
+    if not memory_id:
+        raise ValueError("memory_id is required")
+    return memory_id, {key: value for key, value in args.items() if key != "memory_id"}
+
+
 class AutoMemClient:
-    def __init__(self, endpoint: str, api_key: str, timeout: float = DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool: Optional[ConnectionPool] = None,
+        cache: Optional[RecallCache] = None,
+        mirror: Optional[LocalMirror] = None,
+        replicas: Sequence[str] = (),
+    ):
         self.endpoint = endpoint.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
+        self.cache = cache
+        self.mirror = mirror
+        self._pool = pool or shared_pool()
+        # Writes, health and capability learning use the primary; reads are
+        # routed across the primary and any replicas.
+        self.router = EndpointRouter([self.endpoint, *replicas])
+        self.breaker: CircuitBreaker = breaker_for(self.endpoint)
+        # Breakers are shared per endpoint, so the first client to use one
+        # owns its probe; later clients must not re-point it at themselves.
+        self.breaker.adopt_probe(self.health)
+        for replica in self.router.endpoints[1:]:
+            breaker_for(replica).adopt_probe(lambda replica=replica: self.request("GET", "health", endpoint=replica))
+        self._batch_supported: Optional[bool] = None
+        # Learned from /health capabilities; None until the first health call.
+        self._recall_batch_supported: Optional[bool] = None
+        # Learned from the Accept-Encoding response header (RFC 7694); request
+        # bodies stay uncompressed until the server says it takes gzip.
+        self._gzip_requests: Optional[bool] = None
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ) -> Any:
+        return self._fetch(method, path, body, timeout, idempotency_key, endpoint=endpoint)[0]
+
+    def _read(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_items: Optional[int] = None,
+    ) -> Tuple[Any, int]:
+        """Send a read to the fastest healthy endpoint, failing over in latency order."""
+        order = self.router.read_order()
+        for attempt, endpoint in enumerate(order, 1):
+            started = time.perf_counter()
+            try:
+                result = self._fetch(method, path, body, timeout, max_items=max_items, endpoint=endpoint)
+            except Exception as exc:
+                if not self._fail_over(endpoint, exc, last=attempt == len(order)):
+                    raise
+                continue
+            self.router.observe(endpoint, time.perf_counter() - started)
+            return result
+        raise AssertionError("unreachable")
+
+    def _fetch(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        max_items: Optional[int] = None,
+        endpoint: Optional[str] = None,
+    ) -> Tuple[Any, int]:
+        """Send a request and return (payload, decoded body bytes).
+
+        With max_items, a recall body is decoded only until that many distinct
+        displayable results are collected; the undecoded tail is counted in
+        automem_recall_undecoded_bytes_total. The request goes to the primary
+        unless ``endpoint`` names another one.
+        """
+        prepared = self._prepare(method, path, body, timeout, idempotency_key, endpoint)
+        while True:
+            try:
+                response = self._pool.request(
+                    prepared.method,
+                    prepared.url,
+                    body=prepared.body,
+                    headers=prepared.send_headers,
+                    timeout=prepared.timeout,
+                )
+            except (OSError, http.client.HTTPException) as exc:
+                _record_transport_failure(prepared.breaker, exc)
+                raise
+            if not self._rejected_gzip(response, prepared.compressed):
+                break
+            prepared = prepared._replace(compressed=None)
+        return self._decode_response(prepared, response, max_items)
+
+    def _prepare(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]],
+        timeout: Optional[float],
+        idempotency_key: Optional[str],
+        endpoint: Optional[str],
+    ) -> _PreparedRequest:
+        endpoint = endpoint or self.endpoint
+        data, compressed = self._encode_body(method, body)
+        return _PreparedRequest(
+            method=method.upper(),
+            url=f"{endpoint}/{path.lstrip('/')}",
+            headers=self._headers(idempotency_key),
+            data=data,
+            compressed=compressed,
+            timeout=timeout or self.timeout,
+            breaker=self.breaker if endpoint == self.endpoint else breaker_for(endpoint),
+        )
 
-    def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
-        url = f"{self.endpoint}/{path.lstrip('/')}"
-        data = None
+    def _headers(self, idempotency_key: Optional[str]) -> Dict[str, str]:
         headers = {"Content-Type": "application/json"}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
-        if body is not None and method.upper() != "GET":
-            data = json.dumps(body).encode("utf-8")
-        request = urllib.request.Request(url, data=data, method=method.upper(), headers=headers)
-        with urllib.request.urlopen(request, timeout=self.timeout) as response:
-            raw = response.read().decode("utf-8")
-        return json.loads(raw) if raw else {}
-
-    def recall(self, args: Dict[str, Any]) -> Any:
-        params = urllib.parse.urlencode(
-            {
-                key: value
-                for key, value in {
-                    "query": args.get("query", ""),
-                    "limit": _bounded_recall_limit(args.get("limit")),
-                    "format": args.get("format") or "detailed",
-                    "time_query": args.get("time_query"),
-                    "sort": args.get("sort"),
-                }.items()
-                if value not in {"", None}
-            },
-            doseq=True,
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        if _compression_enabled():
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+        return headers
+
+    def _encode_body(self, method: str, body: Optional[Dict[str, Any]]) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """Return (JSON body, gzip body or None)."""
+        if body is None or method.upper() == "GET":
+            return None, None
+        data = json.dumps(body).encode("utf-8")
+        if not (self._gzip_requests and _compression_enabled()):
+            return data, None
+        return data, gzip_body(data, _compress_min_bytes())
+
+    def _rejected_gzip(self, response: TransportResponse, compressed: Optional[bytes]) -> bool:
+        if compressed is None or response.status != 415:
+            return False
+        # The server advertised gzip but rejected this body; stop compressing
+        # and resend it as plain JSON.
+        self._gzip_requests = False
+        return True
+
+    def _decode_response(
+        self,
+        prepared: _PreparedRequest,
+        response: TransportResponse,
+        max_items: Optional[int],
+    ) -> Tuple[Any, int]:
+        if self._gzip_requests is None and _compression_enabled() and accepts_gzip_requests(response.headers):
+            self._gzip_requests = True
+        if prepared.compressed is not None and prepared.data is not None:
+            metrics.inc("automem_request_bytes_saved_total", len(prepared.data) - len(prepared.compressed))
+        # 4xx means the backend answered; only transport errors and 5xx count
+        # toward opening the breaker.
+        if response.status >= 500:
+            prepared.breaker.record_failure(f"HTTP {response.status}")
+        else:
+            prepared.breaker.record_success()
+        raise_for_status(prepared.url, response)
+        size = len(response.body)
+        with metrics.timer("automem_json_decode_seconds"):
+            raw = response.body.decode("utf-8")
+            if max_items and raw:
+                payload, decoded = decode_recall_response(raw, max_items, _displayable_key)
+                if decoded < len(raw):
+                    undecoded = len(raw[decoded:].encode("utf-8"))
+                    metrics.inc("automem_recall_undecoded_bytes_total", undecoded)
+                    size -= undecoded
+            else:
+                payload = json.loads(raw) if raw else {}
+        return payload, size
+
+    def _fail_over(self, endpoint: str, exc: BaseException, last: bool) -> bool:
+        """Record a failed read from ``endpoint``; return whether to try the next one."""
+        if last or not _fails_over(exc):
+            return False
+        self.router.failed(endpoint)
+        metrics.inc("automem_read_failovers_total", endpoint=endpoint)
+        _debug("read from %s failed (%s); failing over", endpoint, exc)
+        return True
+
+    def _cached_recall(self, args: Dict[str, Any]) -> Tuple[Any, int]:
+        """Return (cached response or None, cache generation to store a fetched one under)."""
+        if self.cache is None:
+            return None, 0
+        return self.cache.get(_recall_cache_key(args)), self.cache.generation
+
+    def _recalled(self, args: Dict[str, Any], response: Any, size: int, generation: int) -> Any:
+        if self.cache is not None:
+            self.cache.put(_recall_cache_key(args), response, size, _recall_kind(args), generation)
+        self._mirror_recalls([response])
+        return response
+
+    def _plan_recall_batch(self, queries: List[Dict[str, Any]]) -> _BatchRecallPlan:
+        results: List[Any] = [None] * len(queries)
+        misses: List[int] = []
+        generation = self.cache.generation if self.cache is not None else 0
+        for index, args in enumerate(queries):
+            cached = self.cache.get(_recall_cache_key(args)) if self.cache is not None else None
+            if cached is None:
+                misses.append(index)
+            else:
+                results[index] = cached
+        body = None
+        if len(misses) > 1 and self._recall_batch_supported:
+            body = {"queries": [_recall_batch_query(queries[index]) for index in misses]}
+        return _BatchRecallPlan(queries, results, misses, generation, body)
+
+    def _batch_declined(self, exc: urllib.error.HTTPError) -> bool:
+        """Whether a failed /recall/batch means the server lacks it; if so, remember that."""
+        if exc.code not in {404, 405}:
+            return False
+        self._recall_batch_supported = False
+        _debug("batched recall unsupported by %s; falling back to single recalls", self.endpoint)
+        return True
+
+    def _finish_recall_batch(self, plan: _BatchRecallPlan, responses: List[Any]) -> List[Any]:
+        results = plan.results
+        for index, response in zip(plan.misses, responses):
+            results[index] = response
+            if self.cache is not None:
+                args = plan.queries[index]
+                size = len(json.dumps(response))
+                self.cache.put(_recall_cache_key(args), response, size, _recall_kind(args), plan.generation)
+        self._mirror_recalls(responses)
+        return results
+
+    def recall(
+        self,
+        args: Dict[str, Any],
+        timeout: Optional[float] = None,
+        max_items: Optional[int] = None,
+    ) -> Any:
+        cached, generation = self._cached_recall(args)
+        if cached is not None:
+            return cached
+        response, size = self._read("GET", _recall_path(args), timeout=timeout, max_items=max_items)
+        return self._recalled(args, response, size, generation)
+
+    @property
+    def supports_recall_batch(self) -> bool:
+        return bool(self._recall_batch_supported)
+
+    def recall_batch(self, queries: List[Dict[str, Any]], timeout: Optional[float] = None) -> List[Any]:
+        """Run several recalls in one POST /recall/batch round-trip.
+
+        Returns one response per query, in order. Cached queries are answered
+        locally and only the misses are sent. A server that advertised the
+        capability but answers 404/405 is remembered as unsupported and the
+        misses are fetched as concurrent GET /recall requests.
+        """
+        plan = self._plan_recall_batch(queries)
+        if not plan.misses:
+            return plan.results
+
+        responses: Optional[List[Any]] = None
+        if plan.body is not None:
+            try:
+                payload = self._read("POST", "recall/batch", plan.body, timeout=timeout)[0]
+            except urllib.error.HTTPError as exc:
+                if not self._batch_declined(exc):
+                    raise
+            else:
+                responses = _batch_results(payload, len(plan.misses))
+        if responses is None:
+            responses = self._recall_each([queries[index] for index in plan.misses], timeout)
+        return self._finish_recall_batch(plan, responses)
+
+    def _recall_each(self, queries: List[Dict[str, Any]], timeout: Optional[float]) -> List[Any]:
+        """GET /recall for every query, fanned out on the shared recall executor.
+
+        The caller may itself be a recall worker, so it fetches the first query
+        itself and runs inline any request no worker has started yet; a
+        saturated executor slows the fan-out down but cannot deadlock it.
+        """
+
+        def fetch(args: Dict[str, Any]) -> Any:
+            return self._read("GET", _recall_path(args), timeout=timeout)[0]
+
+        executor = _shared_recall_executor()
+        futures = [executor.submit(fetch, args) for args in queries[1:]]
+        try:
+            responses = [fetch(queries[0])]
+            for future, args in zip(futures, queries[1:]):
+                responses.append(fetch(args) if future.cancel() else future.result())
+            return responses
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _mirror_recalls(self, responses: List[Any]) -> None:
+        if self.mirror is not None:
+            self._mirror_upsert(
+                [_mirror_entry(item) for response in responses for item in _extract_recall_items(response)]
+            )
+
+    def _mirror_stored(self, args: Dict[str, Any], response: Any) -> None:
+        if self.mirror is None:
+            return
+        memories = args.get("memories") if isinstance(args.get("memories"), list) else [args]
+        stored_at = time.time()
+        self._mirror_upsert(
+            [
+                {**memory, "id": memory_id, "updated_at": stored_at}
+                for memory, memory_id in zip(memories, _stored_memory_ids(response))
+                if isinstance(memory, dict)
+            ]
         )
-        if isinstance(args.get("tags"), list):
-            tag_params = urllib.parse.urlencode({"tags": args["tags"]}, doseq=True)
-            params = f"{params}&{tag_params}" if params else tag_params
-        return self.request("GET", f"recall?{params}" if params else "recall")
 
-    def store(self, args: Dict[str, Any]) -> Any:
-        return self.request("POST", "memory", args)
+    def _mirror_upsert(self, memories: List[Dict[str, Any]]) -> None:
+        # The mirror is a best-effort cache; a failing write never fails the request.
+        try:
+            self.mirror.upsert(memories)
+        except sqlite3.Error as exc:
+            _debug("local mirror write failed: %s", exc)
 
-    def associate(self, args: Dict[str, Any]) -> Any:
-        return self.request("POST", "associate", args)
+    def _mirror_discard(self, memory_id: str) -> None:
+        if self.mirror is None:
+            return
+        try:
+            self.mirror.discard(memory_id)
+        except sqlite3.Error as exc:
+            _debug("local mirror write failed: %s", exc)
 
-    def update(self, args: Dict[str, Any]) -> Any:
-        memory_id = str(args.get("memory_id") or "").strip()
-        if not memory_id:
-            raise ValueError("memory_id is required")
-        updates = {key: value for key, value in args.items() if key != "memory_id"}
-        return self.request("PATCH", f"memory/{urllib.parse.quote(memory_id)}", updates)
+    def store(
+        self,
+        args: Dict[str, Any],
+        path: str = "memory",
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        try:
+            response = self.request("POST", path, args, idempotency_key=idempotency_key)
+            self._mirror_stored(args, response)
+            return response
+        finally:
+            self._invalidate_recalls()
+
+    def store_batch(self, memories: List[Dict[str, Any]], idempotency_keys: Optional[List[str]] = None) -> None:
+        """Store several memories, using POST /memory/batch when the server has it.
+
+        With one idempotency key per memory, the batch is sent under a key
+        derived from all of them, so resending the same batch is recognised.
+        Older servers answer 404/405; the client remembers that and falls back
+        to one POST /memory per item under its own key, raising BatchWriteError
+        with the number already written so a retry does not duplicate them.
+        """
+        keys: List[Optional[str]] = list(idempotency_keys) if idempotency_keys else [None] * len(memories)
+        if len(memories) > 1 and self._batch_supported is not False:
+            try:
+                self.store({"memories": memories}, path="memory/batch", idempotency_key=_batch_idempotency_key(keys))
+                self._batch_supported = True
+                return
+            except urllib.error.HTTPError as exc:
+                if exc.code not in {404, 405}:
+                    raise
+                self._batch_supported = False
+                _debug("bulk store unsupported by %s; falling back to single stores", self.endpoint)
+        for index, memory in enumerate(memories):
+            try:
+                self.store(memory, idempotency_key=keys[index])
+            except Exception as exc:
+                if index == 0:
+                    raise
+                raise BatchWriteError(index, exc) from exc
+
+    def associate(self, args: Dict[str, Any], idempotency_key: Optional[str] = None) -> Any:
+        try:
+            return self.request("POST", "associate", args, idempotency_key=idempotency_key)
+        finally:
+            self._invalidate_recalls()
+
+    def update(self, args: Dict[str, Any], idempotency_key: Optional[str] = None) -> Any:
+        memory_id, updates = _update_request(args)
+        try:
+            return self.request(
+                "PATCH",
+                f"memory/{urllib.parse.quote(memory_id)}",
+                updates,
+                idempotency_key=idempotency_key,
+            )
+        finally:
+            self._invalidate_recalls()
+            self._mirror_discard(memory_id)
+
+    def _invalidate_recalls(self) -> None:
+        # Invalidate even when the write fails: a timeout may still have
+        # landed server-side.
+        if self.cache is not None:
+            self.cache.invalidate()
 
     def health(self) -> Any:
-        return self.request("GET", "health")
+        return self._learn_capabilities(self.request("GET", "health"))
+
+    def _learn_capabilities(self, health: Any) -> Any:
+        # Every health call (including breaker probes) refreshes the
+        # capabilities, so a backend upgrade is picked up without a restart.
+        self._recall_batch_supported = "recall_batch" in _health_capabilities(health)
+        return health
+
+
+class _SharedClient:
+    """A client with its recall cache, local mirror and warm-start cache.
+
+    A parent agent, its subagents and the cron and flush contexts each get
+    their own provider instance. Sharing one of these per endpoint and API
+    key lets them reuse each other's cached recalls and learned server
+    capabilities; the pool and breaker are process-wide already. The last
+    release saves the warm-start cache and closes the mirror.
+    """
+
+    def __init__(self, key: Tuple[Any, ...], client: AutoMemClient, warm: Optional[WarmStartCache]):
+        self.key = key
+        self.client = client
+        self.warm = warm
+        self.refs = 0
+
+    def close(self) -> None:
+        if self.warm is not None:
+            try:
+                self.warm.save()
+            except Exception as exc:
+                _debug("warm-start cache write failed: %s", exc)
+        if self.client.cache is not None:
+            stats = self.client.cache.stats()
+            _debug("recall cache hits=%s misses=%s evictions=%s", stats["hits"], stats["misses"], stats["evictions"])
+        if self.client.mirror is not None:
+            mirror, self.client.mirror = self.client.mirror, None
+            mirror.close()
+
+
+_shared_clients: Dict[Tuple[Any, ...], _SharedClient] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _open_client(endpoints: Sequence[str], api_key: str, hermes_home: str, warm_start: bool) -> _SharedClient:
+    endpoint, replicas = endpoints[0], tuple(endpoints[1:])
+    plugin_dir = os.path.join(hermes_home, "plugins", "automem")
+    mirror: Optional[LocalMirror] = None
+    if _local_mirror_enabled():
+        mirror_path = mirror_path_for(plugin_dir, endpoint, api_key)
+        try:
+            mirror = LocalMirror(mirror_path, _local_mirror_max_entries())
+        except Exception as exc:
+            # Most often a Python built against SQLite without FTS5.
+            _debug("local mirror unavailable at %s: %s", mirror_path, exc)
+    client = AutoMemClient(
+        endpoint,
+        api_key,
+        cache=RecallCache() if _recall_cache_enabled() else None,
+        mirror=mirror,
+        replicas=replicas,
+    )
+    warm: Optional[WarmStartCache] = None
+    if warm_start:
+        warm_path = os.path.join(plugin_dir, WARM_START_FILENAME)
+        warm = WarmStartCache(warm_path, endpoint, api_key)
+        _debug("warm-start cache loaded %s entries from %s", warm.load(), warm_path)
+    return _SharedClient((endpoint, replicas, api_key, hermes_home), client, warm)
+
+
+def _acquire_client(
+    endpoints: Sequence[str], api_key: str, hermes_home: str, warm_start: bool
+) -> Tuple[_SharedClient, bool]:
+    """Return the process-wide client for these endpoints and key, and whether it was just created.
+
+    Every call must be paired with _release_client(). Unless
+    AUTOMEM_HERMES_SHARED_CLIENT is on, each call opens a private client.
+    """
+    if not _shared_client_enabled():
+        shared = _open_client(endpoints, api_key, hermes_home, warm_start)
+        shared.refs = 1
+        return shared, True
+    key = (endpoints[0], tuple(endpoints[1:]), api_key, hermes_home)
+    with _shared_clients_lock:
+        shared = _shared_clients.get(key)
+        created = shared is None
+        if shared is None:
+            shared = _open_client(endpoints, api_key, hermes_home, warm_start)
+            _shared_clients[key] = shared
+        shared.refs += 1
+    return shared, created
+
+
+def _release_client(shared: _SharedClient) -> None:
+    with _shared_clients_lock:
+        shared.refs -= 1
+        if shared.refs > 0:
+            return
+        if _shared_clients.get(shared.key) is shared:
+            del _shared_clients[shared.key]
+    shared.close()
+
+
+_SPOOLABLE_TOOLS = {
+    "automem_store_memory": "store",
+    "automem_associate_memories": "associate",
+    "automem_update_memory": "update",
+}
+
+
+def _send_write(
+    client: AutoMemClient,
+    op: str,
+    args: Dict[str, Any],
+    idempotency_key: Optional[str] = None,
+) -> Any:
+    if op == "store":
+        return client.store(args, idempotency_key=idempotency_key)
+    if op == "associate":
+        return client.associate(args, idempotency_key=idempotency_key)
+    if op == "update":
+        return client.update(args, idempotency_key=idempotency_key)
+    raise ValueError(f"unknown AutoMem write: {op}")
+
+
+class _PrefetchPlan(NamedTuple):
+    session_key: str
+    # (label, recall args, rendered item limit) in render order.
+    sections: List[Tuple[str, Dict[str, Any], int]]
+    # Plan index already answered by an in-flight speculative recall.
+    speculative: Optional[Tuple[int, Future]]
+    first_substantive: bool
+    topic_shift: bool
+    is_debug: bool
+    is_explicit: bool
+    # Plan index -> response answered from the warm-start cache.
+    warm: Dict[int, Any]
+    # Plan index -> saved project context, rendered only if that section's
+    # own recall fails, is dropped at the deadline or cannot be sent.
+    fallback: Dict[int, Any] = {}
+    # Warm-start generation when the plan was made; see WarmStartCache.put().
+    warm_generation: int = 0
+    # The circuit breaker is open: only local state is consulted.
+    offline: bool = False
+
+
+# Outcome of a section abandoned at the prefetch deadline.
+_DROPPED = object()
+# Outcome of a section never sent because the circuit breaker is open.
+_OFFLINE = object()
+
+
+def _answered(response: Any) -> Future:
+    future: Future = Future()
+    future.set_result(response)
+    return future
 
 
 class AutoMemMemoryProvider(MemoryProvider):
     def __init__(self):
         self._endpoint = DEFAULT_ENDPOINT
+        self._replicas: List[str] = []
         self._api_key = ""
         self._client: Optional[AutoMemClient] = None
         self._active = False
         self._auto_recall = True
         self._auto_capture = False
+        self._speculative_recall = False
         self._write_enabled = True
-        self._sync_thread: Optional[threading.Thread] = None
-        self._session_state: Dict[str, Dict[str, Any]] = {}
+        self._write_queue: Optional[WriteQueue] = None
+        self._spool: Optional[WriteSpool] = None
+        self._replay_thread: Optional[threading.Thread] = None
+        self._replay_lock = threading.Lock()
+        self._session_state = SessionTable()
+        self._metrics_dir: Optional[str] = None
+        self._warm: Optional[WarmStartCache] = None
+        self._shared: Optional[_SharedClient] = None
 
     @property
     def name(self) -> str:
@@ -317,14 +1233,49 @@ class AutoMemMemoryProvider(MemoryProvider):
         return None
 
     def initialize(self, session_id: str, **kwargs) -> None:
-        self._endpoint = _endpoint()
+        endpoints = _endpoints()
+        self._endpoint, self._replicas = endpoints[0], endpoints[1:]
         self._api_key = _api_key()
         self._auto_recall = not _truthy(os.environ.get("AUTOMEM_HERMES_DISABLE_RECALL", ""))
         self._auto_capture = _truthy(os.environ.get("AUTOMEM_HERMES_AUTO_CAPTURE", ""))
+        self._speculative_recall = _speculative_recall_enabled()
         agent_context = kwargs.get("agent_context", "")
         self._write_enabled = agent_context not in {"cron", "flush", "subagent"}
-        self._client = AutoMemClient(self._endpoint, self._api_key)
+        if self._shared is not None:
+            # Re-initialized without a shutdown in between.
+            _release_client(self._shared)
         self._active = bool(self._endpoint)
+        self._shared, created = _acquire_client(
+            [self._endpoint, *self._replicas],
+            self._api_key,
+            _hermes_home(kwargs),
+            warm_start=self._active and self._auto_recall and _warm_start_enabled(),
+        )
+        self._client = self._shared.client
+        self._warm = self._shared.warm
+        if created and self._warm is not None:
+            # Re-fetch in the background; the first turn uses whatever is on
+            # disk meanwhile, and the next process starts from the new copy.
+            _shared_recall_executor().submit(self._refresh_warm_start)
+        if self._write_enabled and _spool_enabled():
+            spool_path = spool_path_for(
+                os.path.join(_hermes_home(kwargs), "plugins", "automem"), self._endpoint, self._api_key
+            )
+            try:
+                self._spool = WriteSpool(spool_path)
+            except Exception as exc:
+                _debug("write spool unavailable at %s: %s", spool_path, exc)
+                self._spool = None
+        self._metrics_dir = os.path.join(_hermes_home(kwargs), "plugins", "automem")
+        if self._auto_capture and self._write_enabled:
+            self._write_queue = WriteQueue(self._client.store_batch)
+            self._write_queue.on_give_up = self._spool_captures
+            self._write_queue.on_sent = _observe_capture_acks
+        self._maybe_replay_spool()
+        if created and self._active and self._auto_recall and _recall_batch_enabled():
+            # Learn whether the server takes batched recalls before the first
+            # prefetch; until the probe answers, sections go out one by one.
+            _shared_recall_executor().submit(self._probe_capabilities)
         _debug(
             "initialized provider endpoint=%s api_key_set=%s provider_tools=%s auto_capture=%s agent_context=%s",
             self._endpoint,
@@ -356,102 +1307,229 @@ class AutoMemMemoryProvider(MemoryProvider):
         )
 
     def prefetch(self, query: str, *, session_id: str = "") -> str:
+        started = time.perf_counter()
+        try:
+            return self._prefetch(query, session_id)
+        finally:
+            metrics.observe("automem_prefetch_seconds", time.perf_counter() - started)
+
+    def _prefetch(self, query: str, session_id: str) -> str:
+        plan = self._plan_prefetch(query, session_id)
+        if plan is None:
+            return ""
+        if plan.offline:
+            return self._render_prefetch(plan, [plan.warm.get(index, _OFFLINE) for index in range(len(plan.sections))], None)
+        # Sections run concurrently so the turn waits for the slowest recall
+        # rather than the sum; results are still formatted in plan order so
+        # the cross-section de-duplication is unchanged.
+        budget = _prefetch_budget_seconds()
+        deadline = time.monotonic() + budget if budget is not None else None
+        executor = _shared_recall_executor()
+        futures: List[Optional[Future]] = [None] * len(plan.sections)
+        if plan.speculative is not None:
+            futures[plan.speculative[0]] = plan.speculative[1]
+        for index, response in plan.warm.items():
+            futures[index] = _answered(response)
+        to_fetch = [index for index, future in enumerate(futures) if future is None]
+        if len(to_fetch) > 1 and self._batch_recall_ready():
+            batch: List[Future] = [Future() for _ in to_fetch]
+            sections = [plan.sections[index][:2] for index in to_fetch]
+            executor.submit(self._batched_recall, sections, batch, budget)
+            for index, future in zip(to_fetch, batch):
+                futures[index] = future
+        else:
+            for index in to_fetch:
+                label, args, _ = plan.sections[index]
+                futures[index] = executor.submit(self._timed_recall, label, args, budget)
+
+        outcomes: List[Any] = []
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                outcomes.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                # Past the prefetch budget: keep what has completed and abandon
+                # the rest. A queued recall is cancelled; one already on the
+                # wire finishes in the background, bounded by the same budget.
+                future.cancel()
+                outcomes.append(_DROPPED)
+            except Exception as exc:
+                outcomes.append(exc)
+        return self._render_prefetch(plan, outcomes, budget)
+
+    def _plan_prefetch(self, query: str, session_id: str) -> Optional[_PrefetchPlan]:
         prompt = _clean_text(query)
         if not self._active or not self._auto_recall or not self._client or not prompt:
-            return ""
+            return None
 
-        session_key = session_id or "default"
-        state = self._session_state.setdefault(
-            session_key,
-            {"first_substantive_done": False, "entities": set()},
-        )
-        known_entities = state.get("entities")
-        if not isinstance(known_entities, set):
-            known_entities = set()
-            state["entities"] = known_entities
-
-        entities = _extract_prompt_entities(prompt)
-        is_substantive = _is_substantive_prompt(prompt)
-        is_debug = _looks_like_debug_prompt(prompt)
-        is_explicit = _looks_like_explicit_recall_prompt(prompt)
-        first_substantive = is_substantive and not state.get("first_substantive_done")
-        new_entities = entities.difference(known_entities)
-        topic_shift = (
-            not first_substantive
-            and not is_debug
-            and not is_explicit
-            and bool(new_entities)
-        )
+        offline = not self._client.router.reads_allowed()
+        if offline:
+            if self._client.mirror is None and self._warm is None:
+                _debug("circuit %s for %s; skipping ambient recall", self._client.breaker.state, self._endpoint)
+                return None
+            _debug("circuit %s for %s; answering ambient recall locally", self._client.breaker.state, self._endpoint)
+        else:
+            self._maybe_replay_spool()
 
-        recall_plan: List[Tuple[str, Dict[str, Any], int]] = []
-        if first_substantive:
-            recall_plan.append(
-                (
-                    "Preferences",
-                    {
-                        "tags": ["preference"],
-                        "limit": PREFERENCE_RECALL_LIMIT,
-                        "sort": "updated_desc",
-                        "format": "detailed",
-                    },
-                    PREFERENCE_RECALL_LIMIT,
-                )
+        session_key = session_id or "default"
+        state = self._session_state.get_or_create(session_key)
+
+        with metrics.timer("automem_classify_seconds"):
+            classification = classify_prompt(prompt)
+        entities = classification.entities
+        is_substantive = classification.substantive
+        is_debug = classification.debug
+        is_explicit = classification.explicit
+        # The session's entity/first-turn bookkeeping runs under its lock so
+        # concurrent turns for one session cannot both claim the
+        # first-substantive recall; network waits happen outside the lock.
+        with state.lock:
+            state.turns += 1
+            first_substantive = is_substantive and not state.first_substantive_done
+            new_entities = state.unseen(entities)
+            topic_shift = (
+                not first_substantive
+                and not is_debug
+                and not is_explicit
+                and bool(new_entities)
             )
-            context_args: Dict[str, Any] = {
-                "query": prompt[:500],
-                "time_query": f"last {CONTEXT_RECALL_WINDOW_DAYS} days",
-                "limit": CONTEXT_RECALL_LIMIT,
-                "format": "detailed",
-            }
-            project_tags = _project_tags_for_task_context(prompt, is_explicit=is_explicit)
-            if project_tags:
-                context_args["tags"] = project_tags
-            recall_plan.append(("Task context", context_args, CONTEXT_RECALL_LIMIT))
-            state["first_substantive_done"] = True
-        elif is_explicit or topic_shift:
-            recall_plan.append(
-                (
-                    "Task context",
-                    {
-                        "query": prompt[:500],
-                        "time_query": f"last {CONTEXT_RECALL_WINDOW_DAYS} days",
-                        "limit": CONTEXT_RECALL_LIMIT,
-                        "format": "detailed",
-                    },
-                    CONTEXT_RECALL_LIMIT,
+
+            recall_plan: List[Tuple[str, Dict[str, Any], int]] = []
+            if first_substantive:
+                recall_plan.append(("Preferences", _preference_recall_args(), PREFERENCE_RECALL_LIMIT))
+                context_args: Dict[str, Any] = {
+                    "query": prompt[:500],
+                    "time_query": f"last {CONTEXT_RECALL_WINDOW_DAYS} days",
+                    "limit": CONTEXT_RECALL_LIMIT,
+                    "format": "detailed",
+                }
+                project_tags = _project_tags_for_task_context(prompt, is_explicit=is_explicit)
+                if project_tags:
+                    context_args["tags"] = project_tags
+                recall_plan.append(("Task context", context_args, CONTEXT_RECALL_LIMIT))
+                # A local-only answer still leaves the remote recall owed.
+                state.first_substantive_done = not offline
+            elif is_explicit or topic_shift:
+                recall_plan.append(
+                    (
+                        "Task context",
+                        {
+                            "query": prompt[:500],
+                            "time_query": f"last {CONTEXT_RECALL_WINDOW_DAYS} days",
+                            "limit": CONTEXT_RECALL_LIMIT,
+                            "format": "detailed",
+                        },
+                        CONTEXT_RECALL_LIMIT,
+                    )
                 )
-            )
 
-        if is_debug:
-            # No tag gate: bugfix/solution tagging is incomplete and a hard
-            # gate hides cross-corpus fixes.
-            recall_plan.append(
-                (
-                    "Debug context",
-                    {
-                        "query": prompt[:500],
-                        "limit": DEBUG_RECALL_LIMIT,
-                        "format": "detailed",
-                    },
-                    DEBUG_RECALL_LIMIT,
+            if is_debug:
+                # No tag gate: bugfix/solution tagging is incomplete and a hard
+                # gate hides cross-corpus fixes.
+                recall_plan.append(
+                    (
+                        "Debug context",
+                        {
+                            "query": prompt[:500],
+                            "limit": DEBUG_RECALL_LIMIT,
+                            "format": "detailed",
+                        },
+                        DEBUG_RECALL_LIMIT,
+                    )
                 )
-            )
 
-        known_entities.update(entities)
-        if not recall_plan:
-            return ""
+            state.remember(entities)
+            if not recall_plan:
+                return None
+            if _recall_projection_enabled():
+                for _, args, _ in recall_plan:
+                    args["fields"] = self._ambient_fields()
+            speculation, state.speculation = state.speculation, None
+
+        match_entities = new_entities or entities
+        speculative: Optional[Tuple[int, Future]] = None
+        for index, (label, _, _) in enumerate(recall_plan):
+            if (
+                speculation is not None
+                and label == "Task context"
+                and not first_substantive
+                and match_entities
+                and match_entities <= speculation[0]
+            ):
+                _debug("prefetch consumed speculative task-context recall for session=%s", session_key)
+                metrics.inc("automem_recall_total", section=_section_label(label), outcome="speculative")
+                speculative = (index, speculation[1])
+                speculation = None
+                break
+        if speculation is not None:
+            speculation[1].cancel()
+            _debug("prefetch discarded speculative recall for session=%s", session_key)
+        if offline:
+            recall_plan = [section for section in recall_plan if section[0] in LOCAL_MIRROR_SECTIONS]
+            if not recall_plan:
+                return None
+            if speculative is not None:
+                speculative[1].cancel()
+                speculative = None
+        warm_generation = self._warm.generation if self._warm is not None else 0
+        warm, fallback = self._warm_answers(recall_plan) if first_substantive else ({}, {})
+        return _PrefetchPlan(
+            session_key=session_key,
+            sections=recall_plan,
+            speculative=speculative,
+            first_substantive=first_substantive,
+            topic_shift=topic_shift,
+            is_debug=is_debug,
+            is_explicit=is_explicit,
+            warm=warm,
+            fallback=fallback,
+            warm_generation=warm_generation,
+            offline=offline,
+        )
 
+    def _render_prefetch(self, plan: _PrefetchPlan, outcomes: List[Any], budget: Optional[float]) -> str:
+        """Format each section's response (or failure) in plan order."""
         sections: List[str] = []
         seen: Set[str] = set()
-        for label, args, limit in recall_plan:
-            try:
-                response = self._client.recall(args)
-            except Exception as exc:
-                _debug("prefetch %s recall failed: %s", label.lower(), exc)
-                continue
-            section = _format_recall_section(label, response, seen, limit)
+        dropped: List[str] = []
+        state = self._session_state.get(plan.session_key)
+        context = _ContextBudget(state, _repeat_window_turns(), _context_budget_chars())
+        for index, ((label, args, limit), outcome) in enumerate(zip(plan.sections, outcomes)):
+            answered = outcome is not _DROPPED and outcome is not _OFFLINE and not isinstance(outcome, BaseException)
+            if answered and label == "Preferences" and index not in plan.warm and self._warm is not None:
+                self._warm.put("preferences", args, outcome, plan.warm_generation)
+            if outcome is _DROPPED:
+                dropped.append(label)
+                metrics.inc("automem_recall_total", section=_section_label(label), outcome="dropped")
+            elif isinstance(outcome, BaseException):
+                _debug("prefetch %s recall failed: %s", label.lower(), outcome)
+            local = self._local_recall(label, args)
+            if not answered and index in plan.fallback:
+                metrics.inc("automem_recall_total", section=_section_label(label), outcome="warm_start")
+                outcome, answered = plan.fallback[index], True
+            if not answered:
+                if not local:
+                    continue
+                # Fall back to the memories this process has already seen.
+                metrics.inc("automem_recall_total", section=_section_label(label), outcome="local")
+                outcome = {"results": local}
+            elif local:
+                # Remote results rank first; the mirror only fills the gaps.
+                outcome = {"results": _extract_recall_items(outcome) + local}
+            with metrics.timer("automem_format_seconds"):
+                section = _format_recall_section(label, outcome, seen, limit, context)
             if section:
                 sections.append(section)
+        if state is not None and context.injected:
+            with state.lock:
+                state.mark_injected(context.injected)
+
+        if dropped:
+            logger.warning(
+                "[automem] prefetch budget of %sms exceeded; dropped section(s): %s",
+                int((budget or 0) * 1000),
+                ", ".join(dropped),
+            )
 
         if not sections:
             _debug("prefetch returned no displayable recall sections")
@@ -460,14 +1538,151 @@ class AutoMemMemoryProvider(MemoryProvider):
         _debug(
             "prefetch returned %s section(s) for session=%s first_substantive=%s topic shift=%s debug=%s explicit=%s",
             len(sections),
-            session_key,
-            first_substantive,
-            topic_shift,
-            is_debug,
-            is_explicit,
+            plan.session_key,
+            plan.first_substantive,
+            plan.topic_shift,
+            plan.is_debug,
+            plan.is_explicit,
         )
         return "AutoMem recall:\n" + "\n\n".join(sections)
 
+    def _warm_targets(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """(section label, warm-start key, recall args) of the stable recalls for this working directory."""
+        targets = [("Preferences", "preferences", _preference_recall_args())]
+        project_tags = _default_project_tags()
+        if project_tags:
+            targets.append(("Task context", "project:" + ",".join(project_tags), _project_context_args(project_tags)))
+        if _recall_projection_enabled():
+            for _, _, args in targets:
+                args["fields"] = self._ambient_fields()
+        return targets
+
+    def _warm_answers(
+        self, recall_plan: List[Tuple[str, Dict[str, Any], int]]
+    ) -> Tuple[Dict[int, Any], Dict[int, Any]]:
+        """Warm-start answers and fallbacks for a first turn, both keyed by plan index.
+
+        Preferences are the same recall every time and are answered from the
+        saved copy. The saved project context is not specific to the prompt,
+        so the Task context recall is still sent; the copy is only a fallback
+        for it, and only when that recall is scoped to the same project tags.
+        """
+        if self._warm is None:
+            return {}, {}
+        targets = {label: (key, args) for label, key, args in self._warm_targets()}
+        answers: Dict[int, Any] = {}
+        fallback: Dict[int, Any] = {}
+        for index, (label, args, _) in enumerate(recall_plan):
+            target = targets.get(label)
+            if target is None or args.get("tags") != target[1]["tags"]:
+                continue
+            response = self._warm.get(*target)
+            if response is None:
+                continue
+            if label == "Preferences":
+                answers[index] = response
+                metrics.inc("automem_recall_total", section=_section_label(label), outcome="warm_start")
+            else:
+                fallback[index] = response
+        return answers, fallback
+
+    def _stale_warm_keys(self, op: str, args: Dict[str, Any]) -> List[str]:
+        """Warm-start keys of this working directory that a write may have made stale.
+
+        A store or update tagged for neither recall leaves the saved copies
+        alone; an update that does not say which tags it touches may affect
+        both. Associations do not change either recall.
+        """
+        if self._warm is None or op == "associate":
+            return []
+        tags = args.get("tags") if isinstance(args.get("tags"), list) else None
+        if tags is None and op == "store":
+            return []
+        stale = []
+        for _, key, target_args in self._warm_targets():
+            if tags is None or set(tags) & set(target_args["tags"]):
+                stale.append(key)
+        return stale
+
+    def _refresh_warm_start(self, keys: Optional[Sequence[str]] = None) -> None:
+        """Re-fetch the saved recalls (only ``keys`` when given) in the background."""
+        warm, client = self._warm, self._client
+        if warm is None or client is None or not client.router.reads_allowed():
+            return
+        for _, key, args in self._warm_targets():
+            if keys is not None and key not in keys:
+                continue
+            generation = warm.generation
+            try:
+                response = client.recall(args, max_items=_ambient_decode_cap(args))
+            except Exception as exc:
+                _debug("warm-start refresh of %s failed: %s", key, exc)
+                return
+            warm.put(key, args, response, generation)
+
+    def _ambient_fields(self) -> str:
+        if self._client is not None and self._client.mirror is not None:
+            return MIRROR_RECALL_FIELDS
+        return AMBIENT_RECALL_FIELDS
+
+    def _local_recall(self, label: str, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        mirror = self._client.mirror if self._client is not None else None
+        if mirror is None or label not in LOCAL_MIRROR_SECTIONS:
+            return []
+        tags = args.get("tags") if isinstance(args.get("tags"), list) else None
+        since = time.time() - CONTEXT_RECALL_WINDOW_DAYS * 86400 if args.get("time_query") else None
+        try:
+            with metrics.timer("automem_local_recall_seconds"):
+                return mirror.search(str(args.get("query") or ""), tags, _ambient_decode_cap(args), since)
+        except sqlite3.Error as exc:
+            _debug("local mirror search failed: %s", exc)
+            return []
+
+    def _batch_recall_ready(self) -> bool:
+        return _recall_batch_enabled() and self._client is not None and self._client.supports_recall_batch
+
+    def _timed_recall(self, label: str, args: Dict[str, Any], timeout: Optional[float]) -> Any:
+        section = _section_label(label)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = self._client.recall(args, timeout, max_items=_ambient_decode_cap(args))
+            outcome = "ok"
+            return response
+        finally:
+            metrics.observe("automem_recall_seconds", time.perf_counter() - started, section=section)
+            metrics.inc("automem_recall_total", section=section, outcome=outcome)
+
+    def _batched_recall(
+        self,
+        sections: List[Tuple[str, Dict[str, Any]]],
+        futures: List[Future],
+        timeout: Optional[float],
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            responses = self._client.recall_batch([args for _, args in sections], timeout)
+        except Exception as exc:
+            for (label, _), future in zip(sections, futures):
+                metrics.inc("automem_recall_total", section=_section_label(label), outcome="error")
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(exc)
+            return
+        finally:
+            metrics.observe("automem_recall_batch_seconds", time.perf_counter() - started)
+        metrics.inc("automem_recall_batch_total")
+        for (label, _), future, response in zip(sections, futures, responses):
+            metrics.inc("automem_recall_total", section=_section_label(label), outcome="ok")
+            # A section dropped at the prefetch deadline has been cancelled.
+            if future.set_running_or_notify_cancel():
+                future.set_result(response)
+
+    def _probe_capabilities(self) -> None:
+        try:
+            self._client.health()
+        except Exception as exc:
+            _debug("capability probe failed: %s", exc)
+
     def sync_turn(
         self,
         user_content: str,
@@ -476,40 +1691,70 @@ class AutoMemMemoryProvider(MemoryProvider):
         session_id: str = "",
         messages: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
+        # After the response, off the prefetch critical path.
+        self._flush_metrics()
+        if self._active and self._speculative_recall and self._auto_recall and self._client:
+            self._speculate_next_recall(user_content, assistant_content, session_id or "default")
         if not self._active or not self._auto_capture or not self._write_enabled or not self._client:
             return
         clean_user = _clean_text(user_content)
         clean_assistant = _clean_text(assistant_content)
         if len(clean_user) < 20 or len(clean_assistant) < 20:
             return
+        capture = {
+            "content": f"[role: user]\n{clean_user}\n\n[role: assistant]\n{clean_assistant}",
+            "tags": ["hermes", "conversation-turn"],
+            "metadata": {"source": "hermes_provider", "session_id": session_id},
+        }
+        if not self._client.breaker.allow():
+            if self._spool_captures([capture]):
+                metrics.inc("automem_capture_total", outcome="spooled")
+                _debug("circuit %s for %s; spooled auto-capture", self._client.breaker.state, self._endpoint)
+            else:
+                metrics.inc("automem_capture_total", outcome="dropped")
+                _debug("circuit %s for %s; skipping auto-capture", self._client.breaker.state, self._endpoint)
+            return
 
-        def _run() -> None:
-            try:
-                self._client.store(
-                    {
-                        "content": f"[role: user]\n{clean_user}\n\n[role: assistant]\n{clean_assistant}",
-                        "tags": ["hermes", "conversation-turn"],
-                        "metadata": {"source": "hermes_provider", "session_id": session_id},
-                    }
-                )
-                _debug("auto-captured turn for session=%s", session_id)
-            except Exception as exc:
-                _debug("auto-capture failed: %s", exc)
-                return
-
-        if self._sync_thread and self._sync_thread.is_alive():
-            self._sync_thread.join(timeout=2.0)
-            if self._sync_thread.is_alive():
-                # Previous write is still in flight after the join budget; skip
-                # this turn rather than spawning a second thread and letting
-                # daemon threads accumulate under sustained back-pressure.
-                _debug(
-                    "previous auto-capture still in flight; skipping turn for session=%s",
-                    session_id,
-                )
-                return
-        self._sync_thread = threading.Thread(target=_run, daemon=True, name="automem-sync")
-        self._sync_thread.start()
+        queued = self._write_queue is not None and self._write_queue.put(capture)
+        if not queued:
+            metrics.inc("automem_capture_total", outcome="dropped")
+            _debug("auto-capture queue full; dropped turn for session=%s", session_id)
+            return
+        metrics.inc("automem_capture_total", outcome="queued")
+        _debug("auto-capture queued turn for session=%s", session_id)
+
+    def _speculate_next_recall(self, user_content: str, assistant_content: str, session_key: str) -> None:
+        """Pre-warm the Task context recall the next turn is likely to need.
+
+        Entities the finished turn introduced (typically from the assistant's
+        reply) are what make the next prompt a topic shift. Recalling them now
+        moves that round-trip off the next turn's critical path; prefetch
+        consumes the result only when the new prompt's entities are covered.
+        """
+        state = self._session_state.get(session_key)
+        if not state or not state.first_substantive_done or not self._client.router.reads_allowed():
+            return
+        entities = extract_prompt_entities(f"{user_content}\n{assistant_content}")
+        with state.lock:
+            candidates = state.unseen(entities)
+        if not candidates:
+            return
+        args = {
+            "query": " ".join(sorted(candidates))[:500],
+            "time_query": f"last {CONTEXT_RECALL_WINDOW_DAYS} days",
+            "limit": CONTEXT_RECALL_LIMIT,
+            "format": "detailed",
+        }
+        if _recall_projection_enabled():
+            args["fields"] = self._ambient_fields()
+        future = _shared_recall_executor().submit(
+            self._client.recall, args, None, _ambient_decode_cap(args)
+        )
+        with state.lock:
+            previous, state.speculation = state.speculation, (frozenset(candidates), future)
+        if previous is not None:
+            previous[1].cancel()
+        _debug("speculative recall started for session=%s entities=%s", session_key, len(candidates))
 
     def get_tool_schemas(self) -> List[Dict[str, Any]]:
         if not _provider_tools_enabled():
@@ -583,29 +1828,186 @@ class AutoMemMemoryProvider(MemoryProvider):
         ]
 
     def handle_tool_call(self, tool_name: str, args: Dict[str, Any], **kwargs) -> str:
+        started = time.perf_counter()
+        try:
+            return self._handle_tool_call(tool_name, args)
+        finally:
+            metrics.observe("automem_tool_call_seconds", time.perf_counter() - started, tool=tool_name)
+
+    def _handle_tool_call(self, tool_name: str, args: Dict[str, Any]) -> str:
         if not self._client:
             return tool_error("AutoMem provider is not initialized")
         try:
             if tool_name == "automem_recall_memory":
                 return json.dumps(self._client.recall(args))
-            if tool_name == "automem_store_memory":
-                return json.dumps(self._client.store(args))
-            if tool_name == "automem_associate_memories":
-                return json.dumps(self._client.associate(args))
-            if tool_name == "automem_update_memory":
-                return json.dumps(self._client.update(args))
+            if tool_name in _SPOOLABLE_TOOLS:
+                return json.dumps(self._write_or_spool(_SPOOLABLE_TOOLS[tool_name], args))
             if tool_name == "automem_check_database_health":
                 return json.dumps(self._client.health())
         except urllib.error.HTTPError as exc:
+            metrics.inc("automem_tool_call_errors_total", tool=tool_name)
             return tool_error(f"AutoMem HTTP {exc.code}: {exc.reason}")
         except Exception as exc:
+            metrics.inc("automem_tool_call_errors_total", tool=tool_name)
             return tool_error(f"AutoMem tool failed: {exc}")
         return tool_error(f"Unknown AutoMem tool: {tool_name}")
 
+    def _write_or_spool(self, op: str, args: Dict[str, Any]) -> Any:
+        if op == "update" and not str(args.get("memory_id") or "").strip():
+            raise ValueError("memory_id is required")
+        stale = self._stale_warm_keys(op, args)
+        try:
+            response = self._send_or_spool(op, args)
+        finally:
+            if stale:
+                # The saved copy may no longer be complete. Invalidating once
+                # the write has landed also drops a refresh that raced it.
+                self._warm.invalidate(stale)
+        if stale and not (isinstance(response, dict) and response.get("status") == "spooled"):
+            # Re-fetch now so the next process does not start cold.
+            _shared_recall_executor().submit(self._refresh_warm_start, stale)
+        return response
+
+    def _send_or_spool(self, op: str, args: Dict[str, Any]) -> Any:
+        if self._spool is not None and not self._client.breaker.allow():
+            return self._spool_write(op, args)
+        if self._spool is not None and self._spool.pending():
+            # Sending live would overtake older spooled writes, and a
+            # later replay would then apply a stale update over this one.
+            response = self._spool_write(op, args, behind_backlog=True)
+            self._maybe_replay_spool()
+            return response
+        try:
+            return _send_write(self._client, op, args)
+        except urllib.error.HTTPError as exc:
+            if self._spool is None or exc.code < 500:
+                raise
+            return self._spool_write(op, args)
+        except (OSError, http.client.HTTPException):
+            if self._spool is None:
+                raise
+            return self._spool_write(op, args)
+
+    def _spool_write(self, op: str, args: Dict[str, Any], behind_backlog: bool = False) -> Dict[str, Any]:
+        key = self._spool.append(op, args) if self._spool is not None else None
+        if key is None:
+            raise RuntimeError("AutoMem is unreachable and the local write spool is full")
+        pending = self._spool.pending()
+        if behind_backlog:
+            _debug("spooled %s behind %s earlier write(s) for %s", op, pending - 1, self._endpoint)
+            message = (
+                "Earlier writes are still waiting in the local spool; this write was queued "
+                "behind them and will be sent in order."
+            )
+        else:
+            _debug("spooled %s while %s is unreachable (pending=%s)", op, self._endpoint, pending)
+            message = (
+                "AutoMem is unreachable; the write was saved to the local spool and will be "
+                "replayed in order once the backend is healthy."
+            )
+        return {"status": "spooled", "idempotency_key": key, "message": message}
+
+    def _spool_captures(self, captures: List[Dict[str, Any]], keys: Optional[List[str]] = None) -> bool:
+        if self._spool is None:
+            return False
+        keys = keys or [None] * len(captures)
+        return all(self._spool.append("store", capture, key) is not None for capture, key in zip(captures, keys))
+
+    def _maybe_replay_spool(self) -> None:
+        if self._spool is None or not self._spool.pending() or self._client is None:
+            return
+        if self._client.breaker.state != "closed":
+            return
+        with self._replay_lock:
+            if self._replay_thread is not None and self._replay_thread.is_alive():
+                return
+            self._replay_thread = threading.Thread(target=self._replay_spool, daemon=True, name="automem-spool-replay")
+            self._replay_thread.start()
+
+    def _replay_spool(self) -> None:
+        client, spool = self._client, self._spool
+        if client is None or spool is None:
+            return
+
+        def _send(op: str, payload: Dict[str, Any], key: str) -> None:
+            try:
+                _send_write(client, op, payload, idempotency_key=key)
+            except urllib.error.HTTPError as exc:
+                # The backend answered and refused this entry; retrying it on
+                # every replay would block everything queued behind it.
+                if exc.code < 500 and exc.code not in {408, 429}:
+                    raise ReplayRejected(f"HTTP {exc.code}") from exc
+                raise
+            except ValueError as exc:
+                raise ReplayRejected(str(exc)) from exc
+
+        try:
+            replayed, rejected = spool.replay(_send)
+        except Exception as exc:
+            _debug("spool replay failed: %s", exc)
+            return
+        _debug("spool replayed=%s rejected=%s pending=%s", replayed, rejected, spool.pending())
+
+    def _metrics_gauges(self) -> Dict[str, float]:
+        gauges: Dict[str, float] = {"automem_sessions": len(self._session_state)}
+        if self._client is not None:
+            gauges["automem_breaker_open"] = 0 if self._client.breaker.state == "closed" else 1
+            if self._replicas:
+                rows = self._client.router.snapshot()
+                gauges["automem_endpoints_healthy"] = sum(1 for row in rows if row["healthy"])
+            if self._client.cache is not None:
+                for key, value in self._client.cache.stats().items():
+                    gauges[f"automem_recall_cache_{key}"] = value
+        if self._write_queue is not None:
+            gauges["automem_capture_queue_depth"] = self._write_queue.depth()
+        if self._spool is not None:
+            gauges["automem_spool_pending"] = self._spool.pending()
+        if self._client is not None and self._client.mirror is not None:
+            gauges["automem_local_mirror_entries"] = len(self._client.mirror)
+        if self._warm is not None:
+            gauges["automem_warm_start_entries"] = len(self._warm)
+        if self._shared is not None:
+            gauges["automem_client_refs"] = self._shared.refs
+        return gauges
+
+    def _flush_metrics(self, force: bool = False) -> None:
+        """Write this process's metrics snapshot for `hermes automem stats` (and Prometheus)."""
+        if self._metrics_dir is None:
+            return
+        if not force and not metrics.flush_due(DEFAULT_FLUSH_INTERVAL):
+            return
+        try:
+            write_snapshot(self._metrics_dir, metrics.snapshot(self._metrics_gauges()), _prometheus_file() or None)
+        except Exception as exc:
+            _debug("metrics snapshot write failed: %s", exc)
+
     def shutdown(self) -> None:
-        if self._sync_thread and self._sync_thread.is_alive():
-            self._sync_thread.join(timeout=5.0)
-        self._sync_thread = None
+        if self._write_queue is not None:
+            drained = self._write_queue.close(timeout=5.0)
+            stats = self._write_queue.stats()
+            _debug(
+                "auto-capture queue drained=%s sent=%s failed=%s dropped=%s coalesced=%s",
+                drained,
+                stats["sent"],
+                stats["failed"],
+                stats["dropped"],
+                stats["coalesced"],
+            )
+            self._write_queue = None
+        if self._replay_thread is not None and self._replay_thread.is_alive():
+            self._replay_thread.join(timeout=2.0)
+        self._replay_thread = None
+        if self._spool is not None:
+            if self._spool.pending():
+                _debug("write spool keeps %s pending write(s) for the next session", self._spool.pending())
+            self._spool.close()
+            self._spool = None
+        self._flush_metrics(force=True)
+        if self._shared is not None:
+            shared, self._shared = self._shared, None
+            self._warm = None
+            # The last provider using this client saves and closes its state.
+            _release_client(shared)
         _debug("shutdown complete")
 
 
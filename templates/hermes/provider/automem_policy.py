@@ -4,6 +4,7 @@ Generated by scripts/sync-memory-policy.ts. Do not edit by hand.
 """
 
 import re
+from typing import FrozenSet, NamedTuple
 
 DEFAULT_RECALL_LIMIT = 5
 PREFERENCE_RECALL_LIMIT = 5
@@ -19,6 +20,90 @@ DEBUG_PROMPT_PATTERN = re.compile(r"""(error|exception|traceback|stack trace|sta
 EXPLICIT_RECALL_PROMPT_PATTERN = re.compile(r"""(what do (you|we) (have|know) about|what do you remember about|tell me about|who is|who's|do you remember|remember when|recall|search memory|check memory|look in memory|have we spoken about|what do you have on|do we like|how do we feel about|what do we think (of|about))""", re.IGNORECASE)
 ENTITY_PATTERN = re.compile(r"""\b(?:[A-Z][A-Za-z0-9_-]{2,}|[a-z0-9]+(?:-[a-z0-9]+)+)\b""")
 
+# Debug and explicit-recall keywords combined into one alternation, matched
+# without re.IGNORECASE against str.lower() of the prompt. That is equivalent
+# to the case-insensitive patterns above; the combined search finds the first
+# keyword of either kind and classify_prompt() looks for the other from there.
+PROMPT_SIGNAL_PATTERN = re.compile(r"""error|exception|traceback|stack trace|stacktrace|failing|fails|failed|failure|bug|regression|crash|broken|debug|investigat|not work|doesn't work|does not work|cannot|can't|fix|what do (you|we) (have|know) about|what do you remember about|tell me about|who is|who's|do you remember|remember when|recall|search memory|check memory|look in memory|have we spoken about|what do you have on|do we like|how do we feel about|what do we think (of|about)""")
+_DEBUG_SIGNAL_PATTERN = re.compile(r"""error|exception|traceback|stack trace|stacktrace|failing|fails|failed|failure|bug|regression|crash|broken|debug|investigat|not work|doesn't work|does not work|cannot|can't|fix""")
+_EXPLICIT_SIGNAL_PATTERN = re.compile(r"""what do (you|we) (have|know) about|what do you remember about|tell me about|who is|who's|do you remember|remember when|recall|search memory|check memory|look in memory|have we spoken about|what do you have on|do we like|how do we feel about|what do we think (of|about)""")
+_ASCII_CASE_FOLD_PATTERN = re.compile(r"""[\u0130\u0131\u017f\u212a]""")
+
+
+class PromptClassification(NamedTuple):
+    casual: bool
+    debug: bool
+    explicit: bool
+    substantive: bool
+    word_count: int
+    entities: FrozenSet[str]
+
+
+def extract_prompt_entities(text: str) -> FrozenSet[str]:
+    entities = set()
+    for match in ENTITY_PATTERN.finditer(text or ""):
+        token = match.group(0).strip("-_")
+        normalized = token.lower()
+        if len(token) >= 3 and normalized not in ENTITY_STOPWORDS:
+            entities.add(normalized)
+    return frozenset(entities)
+
+
+def classify_prompt(prompt: str) -> PromptClassification:
+    """Classify a prompt for ambient recall in fewer passes than the per-pattern checks.
+
+    Gives exactly the results of running CASUAL_OPENING_PATTERN on the
+    whitespace-normalized prompt, DEBUG_PROMPT_PATTERN and
+    EXPLICIT_RECALL_PROMPT_PATTERN on the raw prompt, and ENTITY_PATTERN for
+    entities. The prompt is split once; keywords take one combined search plus
+    at most one search for the other kind from the first match, and entities
+    keep their own case-sensitive scan.
+    """
+    text = prompt or ""
+    words = text.split()
+    word_count = len(words)
+    # The casual opener is anchored and at most three words long, so the first
+    # three words decide it exactly as the whole normalized prompt would.
+    casual = CASUAL_OPENING_PATTERN.search(" ".join(words[:3])) is not None
+    # Outside ASCII, str.lower() matches re.IGNORECASE for these keywords
+    # except on the few characters _ASCII_CASE_FOLD_PATTERN finds.
+    if text.isascii() or _ASCII_CASE_FOLD_PATTERN.search(text) is None:
+        lowered = text.lower()
+        match = PROMPT_SIGNAL_PATTERN.search(lowered)
+        if match is None:
+            debug = explicit = False
+        else:
+            # Nothing of either kind starts before the first match, so the
+            # other kind only needs searching from there on.
+            start = match.start()
+            debug = _DEBUG_SIGNAL_PATTERN.match(lowered, start) is not None
+            if debug:
+                explicit = _EXPLICIT_SIGNAL_PATTERN.search(lowered, start) is not None
+            else:
+                explicit = True
+                debug = _DEBUG_SIGNAL_PATTERN.search(lowered, start) is not None
+    else:
+        # Case folding differs from str.lower() here; keep the exact patterns.
+        debug = DEBUG_PROMPT_PATTERN.search(text) is not None
+        explicit = EXPLICIT_RECALL_PROMPT_PATTERN.search(text) is not None
+    if casual and word_count <= 4:
+        substantive = False
+    elif word_count >= 3 or "?" in text or debug:
+        substantive = True
+    else:
+        # A keyword split by a whitespace run ("stack\ntrace") only matches
+        # once the prompt is normalized.
+        substantive = word_count > 0 and DEBUG_PROMPT_PATTERN.search(" ".join(words)) is not None
+    return PromptClassification(
+        casual=casual,
+        debug=debug,
+        explicit=explicit,
+        substantive=substantive,
+        word_count=word_count,
+        entities=extract_prompt_entities(text),
+    )
+
+
 PREFETCH_POLICY_HINTS = {
     "preference_sort": "updated_desc",
     "task_time_query": f"last {CONTEXT_RECALL_WINDOW_DAYS} days",
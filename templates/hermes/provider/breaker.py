@@ -0,0 +1,154 @@
+"""Per-endpoint circuit breaker for the AutoMem Hermes provider.
+
+When AutoMem is down every ambient recall and auto-capture would otherwise pay
+the full connect timeout. The breaker opens after consecutive failures so the
+provider can skip that work instantly, then probes /health in the background
+until the endpoint recovers.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        value = float(os.environ.get(name, "").strip() or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self.probe: Optional[Callable[[], Any]] = None
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._last_error = ""
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True when ambient work may call the endpoint.
+
+        An open breaker moves to half-open once the reset timeout elapses and
+        starts a single background /health probe; callers keep being refused
+        until that probe (or any explicit call) succeeds.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+            start_probe = self._state == HALF_OPEN and not self._probing and self.probe is not None
+            if start_probe:
+                self._probing = True
+        if start_probe:
+            threading.Thread(target=self._run_probe, daemon=True, name="automem-breaker-probe").start()
+        return False
+
+    def adopt_probe(self, probe: Callable[[], Any]) -> bool:
+        """Install ``probe`` unless another caller already owns this breaker's probe."""
+        with self._lock:
+            if self.probe is not None:
+                return False
+            self.probe = probe
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._last_error = ""
+
+    def record_failure(self, error: Any = None) -> None:
+        with self._lock:
+            self._failures += 1
+            if isinstance(error, BaseException):
+                self._last_error = f"{type(error).__name__}: {error}"
+            elif error is not None:
+                self._last_error = str(error)
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_in": retry_in,
+                "last_error": self._last_error,
+            }
+
+    def _run_probe(self) -> None:
+        try:
+            # The probe goes through the client, which records the outcome on
+            # this breaker; a failure re-opens it for another reset period.
+            self.probe()  # type: ignore[misc]
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(endpoint: str) -> CircuitBreaker:
+    """Return the process-wide breaker for an endpoint, creating it on first use."""
+    key = endpoint.rstrip("/")
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=int(
+                    _env_number("AUTOMEM_HERMES_BREAKER_THRESHOLD", DEFAULT_FAILURE_THRESHOLD)
+                ),
+                reset_timeout=_env_number("AUTOMEM_HERMES_BREAKER_RESET_MS", DEFAULT_RESET_TIMEOUT * 1000)
+                / 1000.0,
+            )
+            _breakers[key] = breaker
+        return breaker
+
+
+def describe(snapshot: Dict[str, Any]) -> str:
+    state = snapshot.get("state", CLOSED)
+    failures = snapshot.get("consecutive_failures", 0)
+    threshold = snapshot.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD)
+    text = f"{state} ({failures} consecutive failure(s), opens at {threshold}"
+    if state == OPEN:
+        text += f", probing /health in {snapshot.get('retry_in', 0.0):.0f}s"
+    text += ")"
+    if snapshot.get("last_error") and state != CLOSED:
+        text += f" last error: {snapshot['last_error']}"
+    return text
@@ -0,0 +1,297 @@
+"""Paginated streaming export of memories from AutoMem.
+
+`hermes automem export` walks the corpus through GET /recall in ascending
+timestamp order, one page at a time, and writes each memory as a JSON line
+that `hermes automem import` can read back. /recall takes a time bound but
+no id cursor, so each page starts at the timestamp of the last memory
+written (``start``) and skips the memories already written at exactly that
+timestamp with an ``offset``. Only the current page and that tie set are
+held in memory, so a corpus of any size streams in constant memory, and the
+offset stays within one timestamp rather than growing with the export.
+
+Offsets into a tie are only safe while the server returns tied memories in
+the same order and none is stored among them mid-export. Every page at a
+tie therefore re-reads the last memory written there; if it has moved, the
+tie is read again from its start, skipping what was already written. A tie
+that keeps moving stops the export rather than risk skipping memories.
+Memories without a timestamp cannot be placed on the cursor; they are
+written when they turn up and counted as ``untimed``.
+
+The cursor after each written page is saved as a small JSON watermark, so
+an incremental export starts where the previous one stopped and only fetches
+memories created since. Memories edited after they were exported keep their
+original timestamp; a full export picks those edits up.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_PAGE_SIZE = 100
+# Highest limit AutoMem accepts on /recall.
+MAX_PAGE_SIZE = 200
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 8.0
+WATERMARK_VERSION = 1
+# Times a tie may be re-read from its start before the export gives up.
+MAX_TIE_RESTARTS = 3
+
+# Lower bound for a full export; AutoMem needs a start to page by time.
+_EPOCH = "1970-01-01T00:00:00+00:00"
+
+# fetch(query params) -> parsed /recall response.
+Fetcher = Callable[[Dict[str, Any]], Any]
+# write(memories) is called once per page with the memories to keep.
+Writer = Callable[[List[Dict[str, Any]]], None]
+
+
+class ExportRejected(Exception):
+    """Raised by an export fetcher when the server refused the request outright."""
+
+
+class ExportFailed(Exception):
+    """The export stopped early; ``stats`` holds the counters up to that point."""
+
+    def __init__(self, message: str, stats: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.stats = stats or {}
+
+
+def watermark_path_for(directory: str, endpoint: str, tags: Iterable[str]) -> str:
+    """Default watermark location for exports of ``tags`` from ``endpoint``."""
+    scope = json.dumps([endpoint.rstrip("/"), sorted(set(tags))])
+    digest = hashlib.sha256(scope.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"export-{digest}.json")
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _memories(response: Any) -> List[Dict[str, Any]]:
+    results = response.get("results") if isinstance(response, dict) else None
+    memories = []
+    for item in results if isinstance(results, list) else []:
+        if not isinstance(item, dict):
+            continue
+        memory = item.get("memory") if isinstance(item.get("memory"), dict) else item
+        memory_id = memory.get("id") or item.get("id")
+        if memory_id:
+            memories.append(dict(memory, id=memory_id))
+    return memories
+
+
+class Exporter:
+    def __init__(
+        self,
+        fetch: Fetcher,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        watermark_path: Optional[str] = None,
+    ):
+        self._fetch = fetch
+        # One slot of every page at a tie re-reads the last memory written.
+        self.page_size = max(2, min(int(page_size), MAX_PAGE_SIZE))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.watermark_path = watermark_path
+        self._stats: Dict[str, Any] = {}
+
+    def run(
+        self,
+        write: Writer,
+        tags: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        incremental: bool = False,
+        on_page: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Export memories created between ``since`` and ``until`` and return the counters.
+
+        With ``incremental``, the export starts from the saved watermark
+        instead of ``since`` when one exists. The watermark is saved after
+        every page ``write`` accepted. Raises ExportFailed when a page still
+        fails after max_attempts, when the server does not honour the cursor
+        or keeps reordering a tie, or on KeyboardInterrupt, and ValueError
+        for an unparseable bound.
+        """
+        for name, value in (("since", since), ("until", until)):
+            if value and _timestamp(value) is None:
+                raise ValueError(f"{name} must be an ISO 8601 timestamp, got {value!r}")
+        tags = list(tags or [])
+        state = self._load_watermark(tags) if incremental else None
+        cursor = str(state["timestamp"]) if state else since or _EPOCH
+        # Ids written at `cursor`, in write order (a dict keeps it), and the
+        # ids at `cursor` this pass has read, in server order.
+        written: Dict[str, None] = dict.fromkeys(state.get("ids") or []) if state else {}
+        tied = list(written)
+        untimed: set = set()
+        # Untimed memories the server lists ahead of every timed one; they
+        # count towards the offset too.
+        leading = 0
+        restarts = 0
+        floor = _timestamp(since) if since else None
+        ceiling = _timestamp(until) if until else None
+        self._stats = {
+            "resumed_from": cursor if state else None,
+            "pages": 0,
+            "exported": 0,
+            "untimed": 0,
+            "tie_restarts": 0,
+            "retries": 0,
+            "fetch_seconds": 0.0,
+            "watermark": cursor,
+        }
+        started = time.monotonic()
+        try:
+            while True:
+                params: Dict[str, Any] = {
+                    "start": cursor,
+                    "sort": "time_asc",
+                    "limit": self.page_size,
+                    "format": "json",
+                }
+                if tied:
+                    params["offset"] = leading + len(tied) - 1
+                if until:
+                    params["end"] = until
+                if tags:
+                    params["tags"] = tags
+                page = _memories(self._get(params))
+                self._stats["pages"] += 1
+                cursor_at = _timestamp(cursor)
+                if tied:
+                    anchor = page[0] if page else {}
+                    if anchor.get("id") != tied[-1] or _timestamp(anchor.get("timestamp")) != cursor_at:
+                        # The tie moved under the offset: read it again from its start.
+                        restarts += 1
+                        self._stats["tie_restarts"] += 1
+                        if restarts > MAX_TIE_RESTARTS:
+                            raise ExportFailed(
+                                f"memories at {cursor} keep changing order between pages; "
+                                "retry with a --page-size larger than the number of memories sharing it"
+                            )
+                        tied = []
+                        continue
+                    rows = page[1:]
+                else:
+                    rows = page
+                    leading = next((i for i, memory in enumerate(page) if _timestamp(memory.get("timestamp")) is not None), 0)
+                kept: List[Dict[str, Any]] = []
+                progressed = False
+                for memory in rows:
+                    at = _timestamp(memory.get("timestamp"))
+                    if at is None:
+                        # No cursor position to record; write it once.
+                        if memory["id"] not in untimed:
+                            untimed.add(memory["id"])
+                            self._stats["untimed"] += 1
+                            kept.append(memory)
+                        continue
+                    if cursor_at is not None and at < cursor_at:
+                        # The server ignored `start`; paging would never end.
+                        raise ExportFailed(f"server returned memories older than the cursor {cursor}")
+                    if at != cursor_at:
+                        cursor, cursor_at, written, tied, restarts = memory["timestamp"], at, {}, [], 0
+                    progressed = True
+                    tied.append(memory["id"])
+                    if memory["id"] in written:
+                        continue
+                    written[memory["id"]] = None
+                    if (floor is None or at >= floor) and (ceiling is None or at <= ceiling):
+                        kept.append(memory)
+                if kept:
+                    write(kept)
+                    self._stats["exported"] += len(kept)
+                self._stats["watermark"] = cursor
+                self._save_watermark(tags, cursor, written)
+                if on_page is not None:
+                    on_page(self._snapshot(started))
+                if len(page) < self.page_size:
+                    break
+                if not progressed:
+                    raise ExportFailed(f"pagination stalled at {cursor}; the server ignored offset")
+        except KeyboardInterrupt as exc:
+            raise ExportFailed("interrupted", self._snapshot(started)) from exc
+        except ExportFailed as exc:
+            exc.stats = self._snapshot(started)
+            raise
+        except Exception as exc:
+            raise ExportFailed(f"page {self._stats['pages'] + 1} failed: {exc}", self._snapshot(started)) from exc
+        return self._snapshot(started)
+
+    def _get(self, params: Dict[str, Any]) -> Any:
+        for attempt in range(1, self.max_attempts + 1):
+            started = time.monotonic()
+            try:
+                response = self._fetch(params)
+            except ExportRejected:
+                raise
+            except Exception:
+                if attempt == self.max_attempts:
+                    raise
+                self._stats["retries"] += 1
+                delay = min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1)))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                continue
+            self._stats["fetch_seconds"] += time.monotonic() - started
+            return response
+        raise AssertionError("unreachable")
+
+    def _snapshot(self, started: float) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["elapsed_seconds"] = time.monotonic() - started
+        return stats
+
+    def _load_watermark(self, tags: List[str]) -> Optional[Dict[str, Any]]:
+        if not self.watermark_path:
+            return None
+        try:
+            with open(self.watermark_path, "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(state, dict)
+            or state.get("version") != WATERMARK_VERSION
+            or state.get("tags") != sorted(set(tags))
+            or _timestamp(state.get("timestamp")) is None
+        ):
+            return None
+        return state
+
+    def _save_watermark(self, tags: List[str], cursor: str, seen: Iterable[str]) -> None:
+        if not self.watermark_path:
+            return
+        state = {
+            "version": WATERMARK_VERSION,
+            "tags": sorted(set(tags)),
+            "timestamp": cursor,
+            "ids": list(seen),
+            "updated_at": time.time(),
+        }
+        directory = os.path.dirname(self.watermark_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.watermark_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, self.watermark_path)
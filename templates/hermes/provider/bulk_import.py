@@ -0,0 +1,367 @@
+"""Streaming bulk import of memories into AutoMem.
+
+`hermes automem import` feeds a JSONL file through BulkImporter: lines are
+read one at a time and handed to a fixed pool of workers, at most a bounded
+window of them in flight, with an optional rate limit and jittered retries.
+A small JSON checkpoint records the byte offset below which every line is
+done, so an interrupted import resumes there instead of starting over. Each
+write carries an idempotency key derived from its line, so lines that were
+in flight when an import stopped are not duplicated when they are re-sent.
+
+A line is either a memory ({"content": ..., "tags": [...], ...}) or an
+association ({"memory1_id": ..., "memory2_id": ..., "type": ...,
+"strength": ...}). Associations may refer to memories earlier in the file by
+their "id" field; if the server assigned a different id, the association is
+rewritten to use it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 8.0
+CHECKPOINT_VERSION = 1
+
+_CHECKPOINT_INTERVAL = 1.0
+_HEAD_DIGEST_BYTES = 65536
+
+# send(op, payload, idempotency_key) -> server response; op is "store" or "associate".
+Sender = Callable[[str, Dict[str, Any], str], Any]
+
+
+class ImportRejected(Exception):
+    """Raised by an import sender when the server permanently rejected an entry."""
+
+
+class ImportAborted(Exception):
+    """The import stopped early; ``stats`` holds the counters up to that point."""
+
+    def __init__(self, message: str, stats: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.stats = stats or {}
+
+
+class RateLimiter:
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def checkpoint_path_for(directory: str, source: str) -> str:
+    """Default checkpoint location for an import of ``source``."""
+    digest = hashlib.sha256(os.path.abspath(source).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"import-{digest}.json")
+
+
+def _head_digest(source: str) -> str:
+    with open(source, "rb") as handle:
+        return hashlib.sha256(handle.read(_HEAD_DIGEST_BYTES)).hexdigest()
+
+
+def _idempotency_key(line: bytes) -> str:
+    return "import-" + hashlib.sha256(line).hexdigest()[:32]
+
+
+def _stored_id(response: Any) -> Optional[str]:
+    memory_id = response.get("memory_id") if isinstance(response, dict) else None
+    return str(memory_id) if memory_id else None
+
+
+class BulkImporter:
+    def __init__(
+        self,
+        send: Sender,
+        checkpoint_path: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: float = 0.0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        rejects_path: Optional[str] = None,
+    ):
+        self._send = send
+        self.checkpoint_path = checkpoint_path
+        self.rejects_path = rejects_path or os.path.splitext(checkpoint_path)[0] + ".rejected.jsonl"
+        self.concurrency = max(1, int(concurrency))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._limiter = RateLimiter(rate)
+        self._lock = threading.Lock()
+        # Bounds lines read but not finished, so memory use does not grow
+        # with the size of the file.
+        self._window = threading.BoundedSemaphore(self.concurrency * 2)
+        self._ends: Dict[int, int] = {}
+        self._done: Set[int] = set()
+        self._line = 0
+        self._offset = 0
+        # Source "id" -> server memory_id, only where the two differ.
+        self._ids: Dict[str, str] = {}
+        # Source "id" -> store still in flight; resolves to the server id.
+        self._pending: Dict[str, "Future[str]"] = {}
+        self._abort: Optional[BaseException] = None
+        self._stats: Dict[str, Any] = {}
+
+    def run(
+        self,
+        source: str,
+        restart: bool = False,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Import ``source`` and return the run's counters.
+
+        Resumes from the checkpoint unless ``restart`` is set or the file no
+        longer matches it. Raises ImportAborted, after saving the checkpoint,
+        when a write still fails after max_attempts or on KeyboardInterrupt.
+        """
+        head = _head_digest(source)
+        state = None if restart else self._load_checkpoint(source, head)
+        self._line = int(state["line"]) if state else 0
+        self._offset = int(state["offset"]) if state else 0
+        self._ids = dict(state.get("ids") or {}) if state else {}
+        if state is None and os.path.exists(self.rejects_path):
+            # A fresh run starts a fresh list of rejected lines.
+            os.remove(self.rejects_path)
+        self._stats = {
+            "resumed_at_line": self._line,
+            "read": 0,
+            "stored": 0,
+            "associated": 0,
+            "skipped": 0,
+            "rejected": 0,
+            "retries": 0,
+            "write_seconds": 0.0,
+            "max_write_seconds": 0.0,
+        }
+        started = time.monotonic()
+        last_checkpoint = started
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="automem-import")
+        try:
+            with open(source, "rb") as handle:
+                handle.seek(self._offset)
+                line_no, offset = self._line, self._offset
+                for raw in handle:
+                    if self._abort is not None:
+                        break
+                    line_no += 1
+                    offset += len(raw)
+                    self._window.acquire()
+                    with self._lock:
+                        self._ends[line_no] = offset
+                        self._stats["read"] += 1
+                    self._dispatch(executor, line_no, raw.strip())
+                    if time.monotonic() - last_checkpoint >= _CHECKPOINT_INTERVAL:
+                        last_checkpoint = time.monotonic()
+                        self._save_checkpoint(source, head)
+                        if on_progress is not None:
+                            on_progress(self._snapshot(started))
+            executor.shutdown(wait=True)
+        except KeyboardInterrupt as exc:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._save_checkpoint(source, head)
+            raise ImportAborted("interrupted", self._snapshot(started)) from exc
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._save_checkpoint(source, head)
+            raise
+        self._save_checkpoint(source, head)
+        if self._abort is not None:
+            message = f"line {self._line + 1} failed: {self._abort}"
+            raise ImportAborted(message, self._snapshot(started)) from self._abort
+        return self._snapshot(started)
+
+    def _dispatch(self, executor: ThreadPoolExecutor, line_no: int, line: bytes) -> None:
+        if not line:
+            with self._lock:
+                self._stats["skipped"] += 1
+            self._finish(line_no)
+            return
+        try:
+            entry = json.loads(line)
+            if not isinstance(entry, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as exc:
+            self._reject(line_no, line.decode("utf-8", "replace"), exc)
+            self._finish(line_no)
+            return
+
+        key = _idempotency_key(line)
+        if "memory1_id" in entry or "memory2_id" in entry:
+            future = executor.submit(self._associate, line_no, entry, key)
+        else:
+            source_id = str(entry.get("id") or "")
+            # Registered under the lock _store takes to unregister it, so a
+            # fast store cannot finish before it is registered.
+            with self._lock:
+                future = executor.submit(self._store, line_no, entry, key)
+                if source_id:
+                    self._pending[source_id] = future
+        future.add_done_callback(lambda _: self._finish_if_ok(line_no, future))
+
+    def _store(self, line_no: int, entry: Dict[str, Any], key: str) -> Optional[str]:
+        source_id = str(entry.get("id") or "")
+        memory_id: Optional[str] = None
+        try:
+            if not str(entry.get("content") or "").strip():
+                raise ImportRejected("content is required")
+            memory_id = _stored_id(self._write("store", entry, key)) or source_id
+        except ImportRejected as exc:
+            self._reject(line_no, entry, exc)
+        finally:
+            with self._lock:
+                if memory_id is not None:
+                    self._stats["stored"] += 1
+                if source_id:
+                    if memory_id and memory_id != source_id:
+                        self._ids[source_id] = memory_id
+                    self._pending.pop(source_id, None)
+        return memory_id
+
+    def _associate(self, line_no: int, entry: Dict[str, Any], key: str) -> None:
+        args = dict(entry)
+        try:
+            for field in ("memory1_id", "memory2_id"):
+                args[field] = self._resolve(str(entry.get(field) or ""))
+            self._write("associate", args, key)
+        except ImportRejected as exc:
+            self._reject(line_no, entry, exc)
+            return
+        with self._lock:
+            self._stats["associated"] += 1
+
+    def _resolve(self, source_id: str) -> str:
+        with self._lock:
+            pending = self._pending.get(source_id)
+            resolved = self._ids.get(source_id, source_id)
+        if pending is None:
+            return resolved
+        # The store was submitted earlier, so a worker already holds it; this
+        # cannot wait on work queued behind itself.
+        try:
+            memory_id = pending.result()
+        except Exception as exc:
+            # The store failed transiently; the import is stopping and both
+            # lines will be sent again on resume.
+            raise ImportAborted(f"memory {source_id!r} could not be stored") from exc
+        if memory_id is None:
+            raise ImportRejected(f"memory {source_id!r} was not imported")
+        return memory_id
+
+    def _write(self, op: str, payload: Dict[str, Any], key: str) -> Any:
+        for attempt in range(1, self.max_attempts + 1):
+            if self._abort is not None:
+                raise ImportAborted("import stopping")
+            self._limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = self._send(op, payload, key)
+            except ImportRejected:
+                raise
+            except Exception:
+                if attempt == self.max_attempts:
+                    raise
+                with self._lock:
+                    self._stats["retries"] += 1
+                delay = min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1)))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                continue
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._stats["write_seconds"] += elapsed
+                self._stats["max_write_seconds"] = max(self._stats["max_write_seconds"], elapsed)
+            return response
+        raise AssertionError("unreachable")
+
+    def _finish_if_ok(self, line_no: int, future: Future) -> None:
+        exc = future.exception() if not future.cancelled() else None
+        if future.cancelled() or exc is not None:
+            # Left below the checkpoint so a resumed import sends it again.
+            with self._lock:
+                if self._abort is None and exc is not None and not isinstance(exc, ImportAborted):
+                    self._abort = exc
+            self._window.release()
+            return
+        self._finish(line_no)
+
+    def _finish(self, line_no: int) -> None:
+        with self._lock:
+            self._done.add(line_no)
+            # Advance the checkpoint over the contiguous run of finished lines.
+            while self._line + 1 in self._done:
+                self._line += 1
+                self._done.discard(self._line)
+                self._offset = self._ends.pop(self._line)
+        self._window.release()
+
+    def _reject(self, line_no: int, entry: Any, exc: BaseException) -> None:
+        record = json.dumps({"line": line_no, "error": str(exc), "entry": entry}, ensure_ascii=False)
+        with self._lock:
+            self._stats["rejected"] += 1
+            directory = os.path.dirname(self.rejects_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.rejects_path, "a", encoding="utf-8") as handle:
+                handle.write(record + "\n")
+
+    def _snapshot(self, started: float) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["line"] = self._line
+        stats["elapsed_seconds"] = time.monotonic() - started
+        return stats
+
+    def _load_checkpoint(self, source: str, head: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(state, dict)
+            or state.get("version") != CHECKPOINT_VERSION
+            or state.get("source") != os.path.abspath(source)
+            or state.get("head") != head
+            or int(state.get("offset") or 0) > os.path.getsize(source)
+        ):
+            return None
+        return state
+
+    def _save_checkpoint(self, source: str, head: str) -> None:
+        with self._lock:
+            state = {
+                "version": CHECKPOINT_VERSION,
+                "source": os.path.abspath(source),
+                "head": head,
+                "line": self._line,
+                "offset": self._offset,
+                "ids": dict(self._ids),
+                "updated_at": time.time(),
+            }
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -2,16 +2,67 @@
 
 from __future__ import annotations
 
+import http.client
 import json
 import os
 import sys
+import tempfile
+import threading
+import time
+import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from hermes_constants import get_hermes_home
 
+if __package__:
+    from .breaker import breaker_for, describe as describe_breaker
+    from .bulk_import import (
+        DEFAULT_CONCURRENCY,
+        DEFAULT_MAX_ATTEMPTS,
+        BulkImporter,
+        ImportAborted,
+        ImportRejected,
+        checkpoint_path_for,
+    )
+    from .bulk_export import (
+        DEFAULT_PAGE_SIZE,
+        MAX_PAGE_SIZE,
+        Exporter,
+        ExportFailed,
+        ExportRejected,
+        watermark_path_for,
+    )
+    from .metrics import load_snapshot, load_snapshots, merge_snapshots, render_prometheus
+    from .mirror import LocalMirror, mirror_path_for
+    from .routing import EndpointRouter, parse_endpoints
+    from .transport import ACCEPT_ENCODING, PoolExhausted, raise_for_status, shared_pool
+else:
+    from breaker import breaker_for, describe as describe_breaker
+    from bulk_import import (
+        DEFAULT_CONCURRENCY,
+        DEFAULT_MAX_ATTEMPTS,
+        BulkImporter,
+        ImportAborted,
+        ImportRejected,
+        checkpoint_path_for,
+    )
+    from bulk_export import (
+        DEFAULT_PAGE_SIZE,
+        MAX_PAGE_SIZE,
+        Exporter,
+        ExportFailed,
+        ExportRejected,
+        watermark_path_for,
+    )
+    from metrics import load_snapshot, load_snapshots, merge_snapshots, render_prometheus
+    from mirror import LocalMirror, mirror_path_for
+    from routing import EndpointRouter, parse_endpoints
+    from transport import ACCEPT_ENCODING, PoolExhausted, raise_for_status, shared_pool
+
 
 DEFAULT_ENDPOINT = "http://127.0.0.1:8001"
 DEFAULT_TIMEOUT = 8.0
@@ -21,21 +72,35 @@ def _truthy(value: str) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
+def _endpoints() -> List[str]:
+    value = os.environ.get("AUTOMEM_API_URL") or os.environ.get("AUTOMEM_ENDPOINT") or DEFAULT_ENDPOINT
+    return parse_endpoints(value) or [DEFAULT_ENDPOINT]
+
+
 def _endpoint() -> str:
-    return (
-        os.environ.get("AUTOMEM_API_URL")
-        or os.environ.get("AUTOMEM_ENDPOINT")
-        or DEFAULT_ENDPOINT
-    ).rstrip("/")
+    return _endpoints()[0]
 
 
 def _api_key() -> str:
     return os.environ.get("AUTOMEM_API_KEY") or os.environ.get("AUTOMEM_API_TOKEN") or ""
 
 
+def _env_flag(name: str, default: bool) -> bool:
+    """An on/off environment flag; unset or blank means ``default``."""
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    if default:
+        return value not in {"0", "false", "no", "n", "off"}
+    return _truthy(value)
+
+
 def _provider_tools_enabled() -> bool:
-    value = os.environ.get("AUTOMEM_HERMES_PROVIDER_TOOLS", "true")
-    return value.strip().lower() not in {"0", "false", "no", "n", "off"}
+    return _env_flag("AUTOMEM_HERMES_PROVIDER_TOOLS", True)
+
+
+def _compression_enabled() -> bool:
+    return _env_flag("AUTOMEM_HERMES_COMPRESSION", True)
 
 
 def _active_provider() -> str:
@@ -47,21 +112,45 @@ def _active_provider() -> str:
         return ""
 
 
-def _request(method: str, path: str) -> Dict[str, Any]:
+def _headers() -> Dict[str, str]:
     headers = {"Content-Type": "application/json"}
     key = _api_key()
     if key:
         headers["Authorization"] = f"Bearer {key}"
-    request = urllib.request.Request(
-        f"{_endpoint()}/{path.lstrip('/')}",
-        method=method,
-        headers=headers,
-    )
-    with urllib.request.urlopen(request, timeout=DEFAULT_TIMEOUT) as response:
-        raw = response.read().decode("utf-8")
+    if _compression_enabled():
+        headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return headers
+
+
+def _request(method: str, path: str, endpoint: str = "") -> Dict[str, Any]:
+    endpoint = endpoint or _endpoint()
+    url = f"{endpoint}/{path.lstrip('/')}"
+    breaker = breaker_for(endpoint)
+    try:
+        response = shared_pool().request(method, url, headers=_headers(), timeout=DEFAULT_TIMEOUT)
+    except PoolExhausted:
+        raise
+    except (OSError, http.client.HTTPException) as exc:
+        breaker.record_failure(exc)
+        raise
+    if response.status >= 500:
+        breaker.record_failure(f"HTTP {response.status}")
+    else:
+        breaker.record_success()
+    raise_for_status(url, response)
+    raw = response.body.decode("utf-8")
     return json.loads(raw) if raw else {}
 
 
+def _redirected_endpoint(endpoint: str) -> Optional[str]:
+    """The base URL ``endpoint`` redirects reads to, or None when it answers directly."""
+    url = f"{endpoint}/health"
+    response = shared_pool().request("GET", url, headers=_headers(), timeout=DEFAULT_TIMEOUT)
+    if not response.url or response.url == url:
+        return None
+    return response.url.rpartition("/health")[0] or response.url
+
+
 def _recall_has_results(payload: Dict[str, Any]) -> bool:
     results = payload.get("results")
     if isinstance(results, list):
@@ -79,7 +168,10 @@ def cmd_status(args) -> int:
     print(f"  Hermes home:       {home}")
     print(f"  memory.provider:   {active or '(none)'}")
     print(f"  plugin directory:  {home / 'plugins' / 'automem'}")
-    print(f"  endpoint:          {_endpoint()}")
+    endpoints = _endpoints()
+    print(f"  endpoint:          {endpoints[0]}")
+    for replica in endpoints[1:]:
+        print(f"  read replica:      {replica}")
     print(f"  API key:           {'set' if _api_key() else 'not set'}")
     print(f"  provider tools:    {'enabled' if _provider_tools_enabled() else 'disabled'}")
     print(
@@ -87,6 +179,7 @@ def cmd_status(args) -> int:
         f"{'enabled' if _truthy(os.environ.get('AUTOMEM_HERMES_AUTO_CAPTURE', '')) else 'disabled'}"
     )
     print(f"  debug logging:     {'enabled' if _truthy(os.environ.get('AUTOMEM_HERMES_DEBUG', '')) else 'disabled'}")
+    print(f"  circuit breaker:   {describe_breaker(breaker_for(_endpoint()).snapshot())}")
     print()
     if active != "automem":
         print("  AutoMem is installed but not the active memory provider.")
@@ -96,29 +189,58 @@ def cmd_status(args) -> int:
     return 0
 
 
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms"
+
+
 def cmd_doctor(args) -> int:
     status_code = cmd_status(args)
     print("AutoMem diagnostics")
     ok = status_code == 0
+    endpoints = _endpoints()
+    router = EndpointRouter(endpoints)
+    query = urllib.parse.urlencode({"query": "automem hermes diagnostic recall", "limit": 1, "format": "detailed"})
 
-    try:
-        health = _request("GET", "health")
-        state = health.get("status") or health.get("message") or "ok"
-        print(f"  health:            ok ({state})")
-    except Exception as exc:
-        ok = False
-        print(f"  health:            failed ({type(exc).__name__}: {exc})")
+    for endpoint in endpoints:
+        if len(endpoints) > 1:
+            role = "primary, reads and writes" if endpoint == endpoints[0] else "replica, reads"
+            print(f"  {endpoint} ({role})")
 
-    try:
-        query = urllib.parse.urlencode(
-            {"query": "automem hermes diagnostic recall", "limit": 1, "format": "detailed"}
-        )
-        recall = _request("GET", f"recall?{query}")
-        print(f"  recall prefetch:   {'ok' if _recall_has_results(recall) else 'no results'}")
-    except Exception as exc:
-        ok = False
-        print(f"  recall prefetch:   failed ({type(exc).__name__}: {exc})")
+        started = time.perf_counter()
+        try:
+            health = _request("GET", "health", endpoint)
+            state = health.get("status") or health.get("message") or "ok"
+            print(f"  health:            ok ({state}, {_ms(time.perf_counter() - started)})")
+            moved = _redirected_endpoint(endpoint)
+            if moved:
+                # Reads follow same-host redirects, but writes are never
+                # redirected and fail with the 3xx.
+                ok = False
+                print(f"  redirect:          {endpoint} redirects to {moved}; writes will fail until")
+                print(f"                     AUTOMEM_API_URL is set to {moved}")
+        except Exception as exc:
+            ok = False
+            print(f"  health:            failed ({type(exc).__name__}: {exc})")
 
+        started = time.perf_counter()
+        try:
+            recall = _request("GET", f"recall?{query}", endpoint)
+            elapsed = time.perf_counter() - started
+            router.observe(endpoint, elapsed)
+            print(f"  recall prefetch:   {'ok' if _recall_has_results(recall) else 'no results'} ({_ms(elapsed)})")
+        except Exception as exc:
+            ok = False
+            router.failed(endpoint)
+            print(f"  recall prefetch:   failed ({type(exc).__name__}: {exc})")
+
+        # Reflects the health and recall probes above: doctor drives the same
+        # breaker the provider consults before ambient recall and auto-capture.
+        print(f"  circuit breaker:   {describe_breaker(breaker_for(endpoint).snapshot())}")
+
+    if len(endpoints) > 1:
+        # One recall per endpoint is a rough sample; the provider keeps a
+        # moving average over its own reads.
+        print(f"  read routing:      {' > '.join(router.read_order())}")
     print()
     print("Recall context is injected into the model payload before turns; Hermes does not print it in the terminal UI by default.")
     print("If recall is missing in a session, rerun with AUTOMEM_HERMES_DEBUG=true and inspect Hermes logs.")
@@ -206,7 +328,7 @@ def cmd_debug_recall(args) -> int:
             print(_fence(raw_context))
         return 0
     finally:
-        # Tear down the provider's background sync thread so the CLI exits
+        # Drain the provider's auto-capture write queue so the CLI exits
         # promptly instead of lingering on a daemon thread.
         shutdown = getattr(provider, "shutdown", None)
         if callable(shutdown):
@@ -216,6 +338,551 @@ def cmd_debug_recall(args) -> int:
                 pass
 
 
+# Prompt shapes ambient recall sees in practice. Casual turns should cost no
+# recalls at all, explicit and debug turns add their extra sections, and topic
+# shifts introduce entities the session has not seen yet.
+BENCH_CORPUS: Dict[str, List[str]] = {
+    "casual": [
+        "thanks!",
+        "ok, sounds good",
+        "hi there",
+        "cool, go ahead",
+    ],
+    "explicit": [
+        "What do you remember about how we deploy the API to Railway?",
+        "Do you remember which embedding model we settled on for Qdrant?",
+        "Recall what we decided about the retry policy for the webhook worker.",
+        "What did we say last week about the FalkorDB backup schedule?",
+    ],
+    "topic-shift": [
+        "Let's switch to the Billing service and plan the Stripe migration.",
+        "Moving on to the Android client: the Onboarding screen needs a redesign.",
+        "Next up is the Terraform module for the Staging cluster.",
+        "Can we look at the Grafana dashboards for the Ingest pipeline now?",
+    ],
+    "debug": [
+        "The tests are failing with TypeError: cannot read properties of undefined in the parser.",
+        "Getting a 502 from the gateway after the deploy, stack trace attached below.",
+        "Why does the worker crash with ConnectionResetError during the nightly import?",
+        "Build is broken: ModuleNotFoundError for the session_state module in CI.",
+    ],
+}
+BENCH_KINDS = ("casual", "explicit", "topic-shift", "debug")
+
+
+def _load_bench_corpus(path: str) -> Dict[str, List[str]]:
+    """Read a JSONL corpus of {"kind": ..., "prompt": ...} lines."""
+    corpus: Dict[str, List[str]] = {}
+    with open(path, "r", encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+                kind = str(item["kind"])
+                prompt = str(item["prompt"])
+            except (ValueError, KeyError, TypeError) as exc:
+                raise SystemExit(f"{path}:{line_no}: expected {{\"kind\", \"prompt\"}} JSON ({exc})")
+            corpus.setdefault(kind, []).append(prompt)
+    if not corpus:
+        raise SystemExit(f"{path}: corpus is empty")
+    return corpus
+
+
+def _bench_script(corpus: Dict[str, List[str]], session: int, turns: int) -> List[Tuple[str, str]]:
+    """Turns for one simulated session, cycling through the corpus kinds."""
+    kinds = [kind for kind in BENCH_KINDS if corpus.get(kind)]
+    kinds += [kind for kind in corpus if kind not in kinds and corpus[kind]]
+    script = []
+    for turn in range(turns):
+        kind = kinds[turn % len(kinds)]
+        prompts = corpus[kind]
+        script.append((kind, prompts[(session + turn // len(kinds)) % len(prompts)]))
+    return script
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(min(rank, len(ordered))) - 1]
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+        "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 2),
+    }
+
+
+@contextmanager
+def _patched_env(values: Dict[str, Optional[str]]) -> Iterator[None]:
+    """Set (or, for None, unset) environment variables for the duration of the block."""
+    saved = {name: os.environ.get(name) for name in values}
+    try:
+        for name, value in values.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _start_fake_backend(latency_ms: float):
+    """Start the fake backend in-process; it is a development tool and only exists in a checkout."""
+    if __package__:
+        from .fake_backend import start_fake_backend
+    else:
+        from fake_backend import start_fake_backend
+    return start_fake_backend(latency_ms=latency_ms)
+
+
+def cmd_bench(args) -> int:
+    sessions = max(1, int(getattr(args, "sessions", 8) or 8))
+    turns = max(1, int(getattr(args, "turns", 8) or 8))
+    concurrency = max(1, int(getattr(args, "concurrency", 4) or 4))
+    corpus_path = getattr(args, "corpus", None)
+    corpus = _load_bench_corpus(corpus_path) if corpus_path else BENCH_CORPUS
+    # The bench must not leave its data in the user's metrics, warm-start
+    # cache, spool or mirror: the provider runs against a throwaway
+    # HERMES_HOME and without the Prometheus textfile.
+    overrides: Dict[str, Optional[str]] = {"AUTOMEM_HERMES_PROMETHEUS_FILE": None}
+    if getattr(args, "no_cache", False):
+        # Read by initialize(); every turn then pays for its recalls.
+        overrides["AUTOMEM_HERMES_RECALL_CACHE"] = "false"
+    if getattr(args, "no_projection", False):
+        # Read per turn; ambient recall then asks for full memories.
+        overrides["AUTOMEM_HERMES_RECALL_PROJECTION"] = "false"
+    fake = None
+    if getattr(args, "fake_backend", False):
+        try:
+            fake = _start_fake_backend(getattr(args, "fake_latency_ms", 0.0) or 0.0)
+        except ImportError:
+            print(
+                "--fake-backend needs fake_backend.py, which is not installed with the plugin. "
+                "Run `npm run fake:automem` in an AutoMem checkout and point AUTOMEM_API_URL at it instead.",
+                file=sys.stderr,
+            )
+            return 2
+        overrides["AUTOMEM_API_URL"] = fake.url
+    try:
+        with tempfile.TemporaryDirectory(prefix="automem-bench-") as home, _patched_env(overrides):
+            return _run_bench(args, corpus, sessions, turns, concurrency, home)
+    finally:
+        if fake is not None:
+            fake.stop()
+
+
+def _run_bench(
+    args, corpus: Dict[str, List[str]], sessions: int, turns: int, concurrency: int, hermes_home: str
+) -> int:
+    provider = _load_provider()
+    try:
+        try:
+            provider.initialize("automem-bench", agent_context="primary", hermes_home=hermes_home)
+        except Exception as exc:
+            print(f"Provider initialization failed: {type(exc).__name__}: {exc}", file=sys.stderr)
+            return 1
+
+        lock = threading.Lock()
+        latencies: Dict[str, List[float]] = {}
+        empty_turns = 0
+        context_chars = 0
+        failures: List[str] = []
+
+        def run_session(session: int) -> None:
+            nonlocal empty_turns, context_chars
+            session_id = f"automem-bench-{session}"
+            for kind, prompt in _bench_script(corpus, session, turns):
+                started = time.perf_counter()
+                try:
+                    context = provider.prefetch(prompt, session_id=session_id)
+                except Exception as exc:
+                    with lock:
+                        failures.append(f"{type(exc).__name__}: {exc}")
+                    continue
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.setdefault(kind, []).append(elapsed)
+                    context_chars += len(context or "")
+                    if not (context or "").strip():
+                        empty_turns += 1
+
+        pool = shared_pool()
+        before = pool.stats()
+        provider_metrics = _provider_metrics(provider)
+        undecoded_before = _counter_total(provider_metrics, "automem_recall_undecoded_bytes_total")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="automem-bench") as executor:
+            for future in [executor.submit(run_session, session) for session in range(sessions)]:
+                future.result()
+        wall = time.perf_counter() - started
+        after = pool.stats()
+        undecoded = _counter_total(provider_metrics, "automem_recall_undecoded_bytes_total") - undecoded_before
+    finally:
+        shutdown = getattr(provider, "shutdown", None)
+        if callable(shutdown):
+            try:
+                shutdown()
+            except Exception:
+                pass
+
+    all_samples = [sample for samples in latencies.values() for sample in samples]
+    completed = len(all_samples)
+    requests = after["requests"] - before["requests"]
+    report: Dict[str, Any] = {
+        "endpoint": _endpoint(),
+        "sessions": sessions,
+        "turns_per_session": turns,
+        "concurrency": concurrency,
+        "turns": completed,
+        "failed_turns": len(failures),
+        "empty_turns": empty_turns,
+        "wall_seconds": round(wall, 3),
+        "turns_per_second": round(completed / wall, 2) if wall else 0.0,
+        "requests": requests,
+        "requests_per_second": round(requests / wall, 2) if wall else 0.0,
+        "recalls_per_turn": round(requests / completed, 3) if completed else 0.0,
+        "bytes_sent": after["bytes_sent"] - before["bytes_sent"],
+        "bytes_received": after["bytes_received"] - before["bytes_received"],
+        "bytes_received_per_turn": round((after["bytes_received"] - before["bytes_received"]) / completed)
+        if completed
+        else 0,
+        "bytes_undecoded": int(undecoded),
+        "context_chars_per_turn": round(context_chars / completed) if completed else 0,
+        "projection": _env_flag("AUTOMEM_HERMES_RECALL_PROJECTION", True),
+        "connections_opened": after["connections_opened"] - before["connections_opened"],
+        "latency": _latency_summary(all_samples),
+        "latency_by_kind": {kind: _latency_summary(samples) for kind, samples in sorted(latencies.items())},
+    }
+    cache = getattr(getattr(provider, "_client", None), "cache", None)
+    if cache is not None:
+        report["recall_cache"] = cache.stats()
+
+    if getattr(args, "json", False):
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        latency = report["latency"]
+        print("\nAutoMem prefetch benchmark")
+        print(f"  endpoint:          {report['endpoint']}")
+        print(f"  sessions x turns:  {sessions} x {turns} at concurrency {concurrency}")
+        print(f"  turns:             {completed} ok, {len(failures)} failed, {empty_turns} without context")
+        print(f"  wall time:         {report['wall_seconds']:.3f}s ({report['turns_per_second']:.2f} turns/s)")
+        print(
+            f"  latency:           p50 {latency['p50_ms']:.1f}ms  p95 {latency['p95_ms']:.1f}ms  "
+            f"p99 {latency['p99_ms']:.1f}ms  max {latency['max_ms']:.1f}ms"
+        )
+        for kind, summary in report["latency_by_kind"].items():
+            print(
+                f"    {kind:<16} p50 {summary['p50_ms']:.1f}ms  p95 {summary['p95_ms']:.1f}ms  "
+                f"p99 {summary['p99_ms']:.1f}ms  ({summary['count']} turns)"
+            )
+        print(f"  recalls per turn:  {report['recalls_per_turn']:.2f} ({requests} requests, {report['requests_per_second']:.2f} req/s)")
+        print(f"  bytes:             {report['bytes_sent']} sent, {report['bytes_received']} received")
+        print(
+            f"  bytes per turn:    {report['bytes_received_per_turn']} received "
+            f"(projection {'on' if report['projection'] else 'off'}, {report['bytes_undecoded']} left undecoded)"
+        )
+        print(f"  injected context:  {report['context_chars_per_turn']} chars per turn")
+        if "recall_cache" in report:
+            stats = report["recall_cache"]
+            print(f"  recall cache:      {stats['hits']} hits, {stats['misses']} misses")
+        print()
+    return 1 if failures else 0
+
+
+def _provider_metrics(provider: Any) -> Any:
+    # Hermes may load the provider under its own module name, so read the
+    # registry the provider actually records into.
+    module = sys.modules.get(type(provider).__module__)
+    return getattr(module, "metrics", None)
+
+
+def _counter_total(registry: Any, name: str) -> float:
+    if registry is None:
+        return 0.0
+    return sum(counter["value"] for counter in registry.snapshot()["counters"] if counter["name"] == name)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    return ",".join(f"{key}={value}" for key, value in sorted(labels.items()))
+
+
+def cmd_stats(args) -> int:
+    path = getattr(args, "file", None)
+    if path:
+        try:
+            snapshot = load_snapshot(path)
+        except (OSError, ValueError) as exc:
+            print(f"Could not read metrics snapshot {path}: {type(exc).__name__}: {exc}", file=sys.stderr)
+            return 1
+        pids = [snapshot.get("pid", "?")]
+    else:
+        path = str(Path(get_hermes_home()) / "plugins" / "automem")
+        snapshots = load_snapshots(path)
+        if not snapshots:
+            print(
+                f"No metrics snapshots in {path}. Each provider process writes one after turns "
+                "(at most every 15s) and at shutdown.",
+                file=sys.stderr,
+            )
+            return 1
+        snapshot = merge_snapshots(snapshots)
+        pids = snapshot["pids"]
+
+    if getattr(args, "json", False):
+        print(json.dumps(snapshot, indent=2, sort_keys=True))
+        return 0
+    if getattr(args, "prometheus", False):
+        sys.stdout.write(render_prometheus(snapshot))
+        return 0
+
+    age = max(0.0, time.time() - float(snapshot.get("generated_at") or 0))
+    print("\nAutoMem provider stats")
+    print(f"  snapshot:          {path}")
+    print(f"  written:           {age:.0f}s ago; {len(pids)} process(es): pid {', '.join(str(pid) for pid in pids)}")
+    histograms = snapshot.get("histograms") or []
+    if histograms:
+        print("\n  latency (ms)                                  count      p50      p95      p99      max")
+        for histogram in histograms:
+            name = histogram["name"].replace("automem_", "").replace("_seconds", "")
+            labels = _format_labels(histogram.get("labels") or {})
+            label = f"{name}{{{labels}}}" if labels else name
+            print(
+                f"    {label:<42} {histogram['count']:>7} "
+                f"{histogram['p50'] * 1000:>8.2f} {histogram['p95'] * 1000:>8.2f} "
+                f"{histogram['p99'] * 1000:>8.2f} {histogram['max'] * 1000:>8.2f}"
+            )
+    for title, rows in (("counters", snapshot.get("counters") or []), ("gauges", snapshot.get("gauges") or [])):
+        if not rows:
+            continue
+        print(f"\n  {title}")
+        for row in rows:
+            labels = _format_labels(row.get("labels") or {})
+            label = f"{row['name']}{{{labels}}}" if labels else row["name"]
+            print(f"    {label:<58} {row['value']:>10g}")
+    print()
+    print("p50/p95/p99 are histogram bucket upper bounds, capped at the slowest observation.")
+    print()
+    return 0
+
+
+def _load_client():
+    """Return an AutoMemClient for the configured endpoint, without a recall cache."""
+    try:
+        from . import AutoMemClient
+    except Exception as exc:  # pragma: no cover - defensive
+        raise SystemExit(f"Could not load the AutoMem client: {type(exc).__name__}: {exc}")
+    return AutoMemClient(_endpoint(), _api_key())
+
+
+def cmd_import(args) -> int:
+    source = getattr(args, "file", "")
+    if not source or not os.path.isfile(source):
+        print(f"No such file: {source}", file=sys.stderr)
+        return 2
+    checkpoint = getattr(args, "checkpoint", None) or checkpoint_path_for(
+        str(Path(get_hermes_home()) / "plugins" / "automem"), source
+    )
+    client = _load_client()
+
+    def send(op: str, payload: Dict[str, Any], key: str) -> Any:
+        try:
+            if op == "associate":
+                return client.associate(payload, idempotency_key=key)
+            return client.store(payload, idempotency_key=key)
+        except urllib.error.HTTPError as exc:
+            # The backend answered and refused this entry; retrying will not help.
+            if exc.code < 500 and exc.code not in {408, 429}:
+                raise ImportRejected(f"HTTP {exc.code}: {exc.reason}") from exc
+            raise
+
+    importer = BulkImporter(
+        send,
+        checkpoint,
+        concurrency=getattr(args, "concurrency", DEFAULT_CONCURRENCY) or DEFAULT_CONCURRENCY,
+        rate=float(getattr(args, "rate", 0.0) or 0.0),
+        max_attempts=getattr(args, "max_attempts", DEFAULT_MAX_ATTEMPTS) or DEFAULT_MAX_ATTEMPTS,
+        rejects_path=getattr(args, "rejects", None),
+    )
+    as_json = getattr(args, "json", False)
+
+    def progress(stats: Dict[str, Any]) -> None:
+        if not as_json:
+            rate = stats["read"] / stats["elapsed_seconds"] if stats["elapsed_seconds"] else 0.0
+            print(f"  ... line {stats['line']} ({rate:.0f} lines/s)", file=sys.stderr)
+
+    code = 0
+    error = ""
+    try:
+        stats = importer.run(source, restart=getattr(args, "restart", False), on_progress=progress)
+    except ImportAborted as exc:
+        error = str(exc)
+        stats = exc.stats
+        code = 130 if isinstance(exc.__cause__, KeyboardInterrupt) else 1
+    if stats["rejected"] and not code:
+        code = 1
+
+    writes = stats["stored"] + stats["associated"]
+    report: Dict[str, Any] = {
+        "source": os.path.abspath(source),
+        "endpoint": _endpoint(),
+        "checkpoint": checkpoint,
+        "rejects": importer.rejects_path if stats["rejected"] else None,
+        "error": error or None,
+        **{key: value for key, value in stats.items() if key not in {"write_seconds", "max_write_seconds"}},
+        "lines_per_second": round(stats["read"] / stats["elapsed_seconds"], 2) if stats["elapsed_seconds"] else 0.0,
+        "mean_write_ms": round(stats["write_seconds"] / writes * 1000, 2) if writes else 0.0,
+        "max_write_ms": round(stats["max_write_seconds"] * 1000, 2),
+    }
+    if as_json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+        return code
+    print("\nAutoMem import")
+    print(f"  source:            {report['source']}")
+    print(f"  endpoint:          {report['endpoint']}")
+    print(f"  checkpoint:        {checkpoint}")
+    if report["resumed_at_line"]:
+        print(f"  resumed after:     line {report['resumed_at_line']}")
+    print(f"  lines read:        {report['read']} ({report['skipped']} blank)")
+    print(f"  stored:            {report['stored']} memories, {report['associated']} associations")
+    print(f"  retries:           {report['retries']}")
+    print(f"  rejected:          {report['rejected']}" + (f" (see {report['rejects']})" if report["rejects"] else ""))
+    print(f"  elapsed:           {report['elapsed_seconds']:.2f}s ({report['lines_per_second']:.1f} lines/s)")
+    print(f"  write latency:     mean {report['mean_write_ms']:.1f}ms  max {report['max_write_ms']:.1f}ms")
+    if error:
+        print(f"\n  Import stopped ({error}). Rerun the same command to resume after line {report['line']}.")
+    print()
+    return code
+
+
+def _load_mirror():
+    """Return the provider's local mirror, opened the way the provider opens it."""
+    try:
+        from . import _local_mirror_max_entries
+    except Exception as exc:  # pragma: no cover - defensive
+        raise SystemExit(f"Could not load the AutoMem provider: {type(exc).__name__}: {exc}")
+    directory = Path(get_hermes_home()) / "plugins" / "automem"
+    return LocalMirror(mirror_path_for(str(directory), _endpoint(), _api_key()), _local_mirror_max_entries())
+
+
+def cmd_export(args) -> int:
+    output = getattr(args, "output", None) or "-"
+    tags = [tag for tag in getattr(args, "tag", None) or [] if tag]
+    incremental = getattr(args, "incremental", False)
+    watermark = getattr(args, "watermark", None) or watermark_path_for(
+        str(Path(get_hermes_home()) / "plugins" / "automem"), _endpoint(), tags
+    )
+
+    def fetch(params: Dict[str, Any]) -> Any:
+        try:
+            return _request("GET", "recall?" + urllib.parse.urlencode(params, doseq=True))
+        except urllib.error.HTTPError as exc:
+            if exc.code < 500 and exc.code not in {408, 429}:
+                raise ExportRejected(f"HTTP {exc.code}: {exc.reason}") from exc
+            raise
+
+    try:
+        mirror = _load_mirror() if getattr(args, "refresh_mirror", False) else None
+    except Exception as exc:
+        # Most often a Python built against SQLite without FTS5.
+        print(f"Local mirror unavailable: {type(exc).__name__}: {exc}", file=sys.stderr)
+        return 1
+    to_stdout = output == "-"
+    # An incremental export to a file extends the previous export.
+    handle = sys.stdout if to_stdout else open(output, "a" if incremental else "w", encoding="utf-8")
+
+    def write(memories: List[Dict[str, Any]]) -> None:
+        handle.write("".join(json.dumps(memory, ensure_ascii=False) + "\n" for memory in memories))
+        # Flushed before the watermark moves past these memories.
+        handle.flush()
+        if mirror is not None:
+            mirror.upsert(memories)
+
+    as_json = getattr(args, "json", False)
+    report_file = sys.stderr if to_stdout else sys.stdout
+
+    def progress(stats: Dict[str, Any]) -> None:
+        if not as_json:
+            print(f"  ... page {stats['pages']}: {stats['exported']} memories through {stats['watermark']}", file=sys.stderr)
+
+    exporter = Exporter(fetch, page_size=getattr(args, "page_size", DEFAULT_PAGE_SIZE) or DEFAULT_PAGE_SIZE, watermark_path=watermark)
+    code = 0
+    error = ""
+    try:
+        stats = exporter.run(
+            write,
+            tags=tags,
+            since=getattr(args, "since", None),
+            until=getattr(args, "until", None),
+            incremental=incremental,
+            on_page=progress,
+        )
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    except ExportFailed as exc:
+        error = str(exc)
+        stats = exc.stats
+        code = 130 if isinstance(exc.__cause__, KeyboardInterrupt) else 1
+    finally:
+        if not to_stdout:
+            handle.close()
+        if mirror is not None:
+            mirror.close()
+
+    report: Dict[str, Any] = {
+        "output": output if to_stdout else os.path.abspath(output),
+        "endpoint": _endpoint(),
+        "tags": tags,
+        "watermark_file": watermark,
+        "mirror_entries": len(mirror) if mirror is not None else None,
+        "error": error or None,
+        **{key: value for key, value in stats.items() if key != "fetch_seconds"},
+        "memories_per_second": round(stats["exported"] / stats["elapsed_seconds"], 2) if stats["elapsed_seconds"] else 0.0,
+        "mean_page_ms": round(stats["fetch_seconds"] / stats["pages"] * 1000, 2) if stats["pages"] else 0.0,
+    }
+    if as_json:
+        print(json.dumps(report, indent=2, sort_keys=True), file=report_file)
+        return code
+    print("\nAutoMem export", file=report_file)
+    print(f"  output:            {report['output']}", file=report_file)
+    print(f"  endpoint:          {report['endpoint']}", file=report_file)
+    print(f"  tags:              {', '.join(tags) if tags else '(all)'}", file=report_file)
+    if report["resumed_from"]:
+        print(f"  resumed from:      {report['resumed_from']}", file=report_file)
+    print(f"  exported:          {report['exported']} memories in {report['pages']} pages", file=report_file)
+    if report["untimed"]:
+        print(f"  untimed:           {report['untimed']} without a timestamp (written, not on the watermark)", file=report_file)
+    if report["tie_restarts"]:
+        print(f"  tie re-reads:      {report['tie_restarts']}", file=report_file)
+    if report["mirror_entries"] is not None:
+        print(f"  local mirror:      {report['mirror_entries']} entries", file=report_file)
+    print(f"  watermark:         {report['watermark']} ({watermark})", file=report_file)
+    print(f"  retries:           {report['retries']}", file=report_file)
+    print(
+        f"  elapsed:           {report['elapsed_seconds']:.2f}s ({report['memories_per_second']:.1f} memories/s,"
+        f" mean page {report['mean_page_ms']:.1f}ms)",
+        file=report_file,
+    )
+    if error:
+        print(f"\n  Export stopped ({error}). Rerun with --incremental to continue from the watermark.", file=report_file)
+    print(file=report_file)
+    return code
+
+
 def automem_command(args) -> None:
     command = getattr(args, "automem_command", None) or "status"
     if command == "status":
@@ -224,6 +891,14 @@ def automem_command(args) -> None:
         code = cmd_doctor(args)
     elif command == "debug-recall":
         code = cmd_debug_recall(args)
+    elif command == "bench":
+        code = cmd_bench(args)
+    elif command == "stats":
+        code = cmd_stats(args)
+    elif command == "import":
+        code = cmd_import(args)
+    elif command == "export":
+        code = cmd_export(args)
     else:
         print(f"Unknown AutoMem command: {command}", file=sys.stderr)
         code = 2
@@ -256,4 +931,136 @@ def register_cli(subparser) -> None:
         default="debug-recall",
         help="Session id used for recall state (default: debug-recall)",
     )
+    stats = subs.add_parser(
+        "stats",
+        help="Show the provider's hot-path latency histograms and counters",
+        description=(
+            "Sum the metrics snapshots provider processes wrote to "
+            "$HERMES_HOME/plugins/automem/ in the last 24 hours: classification, "
+            "recall sections, JSON decode, formatting, auto-capture acks and tool calls."
+        ),
+    )
+    stats.add_argument("--file", help="Read this snapshot instead of the default path")
+    stats_format = stats.add_mutually_exclusive_group()
+    stats_format.add_argument("--json", action="store_true", help="Print the raw snapshot as JSON")
+    stats_format.add_argument(
+        "--prometheus",
+        action="store_true",
+        help="Print the snapshot in Prometheus text format",
+    )
+    bench = subs.add_parser(
+        "bench",
+        help="Measure ambient recall latency and throughput against the endpoint",
+        description=(
+            "Drive the provider's real prefetch() over a prompt corpus (casual, "
+            "explicit, topic-shift and debug turns) from several concurrent "
+            "sessions, then report p50/p95/p99 latency, recalls per turn, bytes "
+            "transferred and requests per second."
+        ),
+    )
+    bench.add_argument("--sessions", type=int, default=8, help="Simulated sessions (default: 8)")
+    bench.add_argument("--turns", type=int, default=8, help="Turns per session (default: 8)")
+    bench.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Sessions driven at the same time (default: 4)",
+    )
+    bench.add_argument(
+        "--corpus",
+        help='JSONL file of {"kind": ..., "prompt": ...} lines replacing the built-in corpus',
+    )
+    bench.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Disable the in-process recall cache so every turn reaches the backend",
+    )
+    bench.add_argument(
+        "--no-projection",
+        dest="no_projection",
+        action="store_true",
+        help="Request full memories for ambient recall, as a baseline for the bytes-per-turn saving",
+    )
+    bench.add_argument(
+        "--fake-backend",
+        dest="fake_backend",
+        action="store_true",
+        help="Run against a seeded in-process AutoMem stand-in instead of the configured endpoint (checkout only)",
+    )
+    bench.add_argument(
+        "--fake-latency-ms",
+        dest="fake_latency_ms",
+        type=float,
+        default=10.0,
+        help="Latency the stand-in adds to every request (default: 10)",
+    )
+    bench.add_argument("--json", action="store_true", help="Print the report as JSON")
+    importer = subs.add_parser(
+        "import",
+        help="Stream memories and associations from a JSONL file into AutoMem",
+        description=(
+            "Read FILE one line at a time and store each memory (or create each "
+            "association) through a bounded pool of concurrent writers with "
+            "retries. Progress is checkpointed, so rerunning the same command "
+            "after an interruption resumes where it stopped."
+        ),
+    )
+    importer.add_argument(
+        "file",
+        help='JSONL file of memories ({"content": ...}) and associations ({"memory1_id": ...})',
+    )
+    importer.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Writes in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    importer.add_argument("--rate", type=float, default=0.0, help="Maximum writes per second (default: unlimited)")
+    importer.add_argument(
+        "--max-attempts",
+        dest="max_attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help=f"Attempts per write before the import stops (default: {DEFAULT_MAX_ATTEMPTS})",
+    )
+    importer.add_argument("--checkpoint", help="Checkpoint file (default: under $HERMES_HOME/plugins/automem)")
+    importer.add_argument("--rejects", help="Where to write rejected lines (default: next to the checkpoint)")
+    importer.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    importer.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    exporter = subs.add_parser(
+        "export",
+        help="Stream memories from AutoMem to a JSONL file",
+        description=(
+            "Page through the corpus (or the memories carrying any --tag) in "
+            "creation order and write one memory per line, in the format "
+            "`hermes automem import` reads. The position reached is saved as a "
+            "watermark, so --incremental fetches only memories created since "
+            "the last export."
+        ),
+    )
+    exporter.add_argument("output", nargs="?", default="-", help="JSONL file to write (default: stdout)")
+    exporter.add_argument("--tag", action="append", help="Only export memories with this tag (repeatable; any-of)")
+    exporter.add_argument("--since", help="Only export memories created at or after this ISO timestamp")
+    exporter.add_argument("--until", help="Only export memories created at or before this ISO timestamp")
+    exporter.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Start from the saved watermark and append to OUTPUT instead of overwriting it",
+    )
+    exporter.add_argument("--watermark", help="Watermark file (default: under $HERMES_HOME/plugins/automem)")
+    exporter.add_argument(
+        "--page-size",
+        dest="page_size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Memories per request, at most {MAX_PAGE_SIZE} (default: {DEFAULT_PAGE_SIZE})",
+    )
+    exporter.add_argument(
+        "--refresh-mirror",
+        dest="refresh_mirror",
+        action="store_true",
+        help="Also copy exported memories into the provider's local recall mirror",
+    )
+    exporter.add_argument("--json", action="store_true", help="Print the summary as JSON")
     subparser.set_defaults(func=automem_command)
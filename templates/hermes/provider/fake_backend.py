@@ -0,0 +1,581 @@
+"""Local AutoMem stand-in for offline tests and benchmarks.
+
+Serves the subset of the AutoMem HTTP API the Hermes provider uses (/health,
+/recall, including time windows, ``time_query`` phrases such as "last 90
+days", recency and chronological ordering and paging, /recall/batch,
+/memory, /memory/batch, PATCH /memory/{id} and /associate) from an in-memory
+corpus, with response shapes the provider's recall parser accepts.
+Latency, jitter, error rate, per-result payload size and link bandwidth are
+configurable and driven by a seeded RNG, so cache, pooling, compression and
+concurrency changes can be measured without a live backend:
+
+    python3 fake_backend.py --port 8001 --memories 500 --latency-ms 20 --jitter-ms 5
+    hermes automem bench --fake-backend
+
+It is a development tool: it ships in the repository, not in the installed
+plugin, and ``bench --fake-backend`` only works from a checkout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_PORT = 8001
+DEFAULT_MEMORIES = 200
+MAX_BATCH_SIZE = 500
+# Responses smaller than this are sent uncompressed even when gzip is accepted.
+COMPRESS_MIN_BYTES = 256
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_TIME_QUERY_PATTERN = re.compile(r"(?:last|past)\s+(?:(\d+)\s+)?(minute|hour|day|week|month|year)s?")
+_TIME_QUERY_UNITS = {
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+
+# Seed material: every generated memory pairs a project with a fact template,
+# and some carry the tags the provider's preference and debug sections query.
+_PROJECTS = ("automem", "billing-service", "android-client", "ingest-pipeline", "staging-cluster", "webhook-worker")
+_FACTS = (
+    ("{project} deploys to Railway from the main branch after CI passes.", ["deployment"]),
+    ("{project} uses Qdrant for vectors and FalkorDB for the graph.", ["architecture"]),
+    ("Fixed a ConnectionResetError in {project} by retrying idempotent requests.", ["bugfix"]),
+    ("{project} retries webhooks with exponential backoff capped at five minutes.", ["decision"]),
+    ("User prefers small reviewed PRs and conventional commit messages for {project}.", ["preference"]),
+    ("Tests for {project} run with vitest; the e2e matrix runs nightly.", ["testing"]),
+    ("{project} backups run at 03:00 UTC and are kept for 14 days.", ["operations"]),
+    ("User prefers concise answers with code references when working on {project}.", ["preference"]),
+)
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return (parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def _updated_at(record: Dict[str, Any]) -> float:
+    return _parse_time(record.get("updated_at") or record["timestamp"]) or 0.0
+
+
+def _time_query_window(value: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """(start, end) epoch seconds for a time_query phrase; unrecognized phrases do not filter."""
+    phrase = " ".join((value or "").lower().split())
+    now = datetime.now(timezone.utc)
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if phrase == "today":
+        return midnight.timestamp(), None
+    if phrase == "yesterday":
+        return (midnight - timedelta(days=1)).timestamp(), midnight.timestamp()
+    match = _TIME_QUERY_PATTERN.fullmatch(phrase)
+    if match is None:
+        return None, None
+    return now.timestamp() - int(match.group(1) or 1) * _TIME_QUERY_UNITS[match.group(2)], None
+
+
+class FakeAutoMem:
+    """Thread-safe in-memory corpus plus the fault-injection knobs."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        payload_bytes: int = 0,
+        seed: int = 0,
+        api_key: str = "",
+        recall_batch: bool = True,
+        compression: bool = True,
+        bandwidth_kbps: float = 0.0,
+    ):
+        self.latency_ms = max(0.0, float(latency_ms))
+        self.jitter_ms = max(0.0, float(jitter_ms))
+        self.error_rate = min(1.0, max(0.0, float(error_rate)))
+        self.payload_bytes = max(0, int(payload_bytes))
+        self.api_key = api_key
+        self.recall_batch = recall_batch
+        self.compression = compression
+        # Simulated link speed in kilobits per second, applied per connection
+        # to request and response bodies; 0 means unlimited.
+        self.bandwidth_kbps = max(0.0, float(bandwidth_kbps))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._memories: Dict[str, Dict[str, Any]] = {}
+        self._associations: List[Dict[str, Any]] = []
+        self._counts: Dict[str, int] = {}
+
+    def seed(self, count: int = DEFAULT_MEMORIES, seed: int = 0) -> None:
+        """Add ``count`` deterministic memories spread across a few projects.
+
+        Timestamps are one minute apart and end at the start of the current
+        UTC day, so windowed recalls ("last 90 days") see them as live data.
+        """
+        rng = random.Random(seed)
+        count = max(0, int(count))
+        base = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(minutes=count)
+        for index in range(count):
+            project = _PROJECTS[index % len(_PROJECTS)]
+            template, tags = _FACTS[(index // len(_PROJECTS)) % len(_FACTS)]
+            self.add(
+                {
+                    "id": f"mem-seed-{index:06d}",
+                    "content": f"{template.format(project=project)} (note {index})",
+                    "tags": [project, *tags],
+                    "importance": round(rng.uniform(0.3, 1.0), 2),
+                    "type": "Preference" if "preference" in tags else "Context",
+                    "timestamp": (base + timedelta(minutes=index)).isoformat(),
+                }
+            )
+
+    def load(self, path: str) -> int:
+        """Add memories from a JSONL file of AutoMem memory objects."""
+        loaded = 0
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    self.add(json.loads(line))
+                    loaded += 1
+        return loaded
+
+    def add(self, memory: Dict[str, Any]) -> str:
+        content = str(memory.get("content") or "").strip()
+        if not content:
+            raise ValueError("content is required")
+        memory_id = str(memory.get("id") or uuid.uuid4())
+        tags = memory.get("tags") if isinstance(memory.get("tags"), list) else []
+        record = {
+            "id": memory_id,
+            "content": content,
+            "tags": [str(tag) for tag in tags],
+            "importance": float(memory.get("importance", 0.5)),
+            "type": str(memory.get("type") or "Context"),
+            "metadata": dict(memory.get("metadata") or {}),
+            "timestamp": str(memory.get("timestamp") or _now()),
+        }
+        if memory.get("updated_at"):
+            record["updated_at"] = str(memory["updated_at"])
+        record["_tokens"] = set(_tokens(content))
+        with self._lock:
+            self._memories[memory_id] = record
+        return memory_id
+
+    def update(self, memory_id: str, updates: Dict[str, Any]) -> bool:
+        with self._lock:
+            record = self._memories.get(memory_id)
+            if record is None:
+                return False
+            for key in ("content", "tags", "importance", "type", "metadata"):
+                if key in updates:
+                    record[key] = updates[key]
+            record["_tokens"] = set(_tokens(str(record["content"])))
+            record["updated_at"] = _now()
+        return True
+
+    def associate(self, association: Dict[str, Any]) -> None:
+        with self._lock:
+            self._associations.append(dict(association))
+
+    def recall(
+        self,
+        query: str,
+        tags: List[str],
+        limit: int,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sort: str = "score",
+        offset: int = 0,
+        time_query: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        terms = set(_tokens(query))
+        wanted = set(tags)
+        low, high = _parse_time(start), _parse_time(end)
+        if low is None and high is None and time_query:
+            low, high = _time_query_window(time_query)
+        with self._lock:
+            candidates = list(self._memories.values())
+        scored: List[Tuple[float, str, Dict[str, Any]]] = []
+        for record in candidates:
+            if wanted and not wanted.intersection(record["tags"]):
+                continue
+            if low is not None or high is not None:
+                at = _parse_time(record["timestamp"])
+                if at is None or (low is not None and at < low) or (high is not None and at > high):
+                    continue
+            overlap = len(terms & record["_tokens"]) / len(terms) if terms else 0.0
+            if terms and overlap == 0.0:
+                continue
+            score = round(overlap + 0.1 * record["importance"], 4)
+            scored.append((score, record["timestamp"], record))
+        if sort in {"time_asc", "time_desc"}:
+            # Ties are broken by id so offsets into a timestamp are stable.
+            scored.sort(
+                key=lambda entry: (_parse_time(entry[2]["timestamp"]) or 0.0, entry[2]["id"]),
+                reverse=sort == "time_desc",
+            )
+        elif sort == "updated_desc":
+            # Never-updated memories count from their creation time.
+            scored.sort(key=lambda entry: (_updated_at(entry[2]), entry[2]["id"]), reverse=True)
+        else:
+            scored.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+        page = scored[max(0, offset) : max(0, offset) + limit]
+        return [self._result(record, score, bool(terms)) for score, _, record in page]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memories)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(self._counts)
+            counts["memories"] = len(self._memories)
+            counts["associations"] = len(self._associations)
+        return counts
+
+    def count(self, route: str) -> None:
+        with self._lock:
+            self._counts[route] = self._counts.get(route, 0) + 1
+
+    def transfer(self, size: int) -> None:
+        """Sleep for the time `size` bytes take on the simulated link."""
+        if self.bandwidth_kbps and size:
+            time.sleep(size * 8 / (self.bandwidth_kbps * 1000))
+
+    def draw(self) -> Tuple[float, bool]:
+        """Return (delay seconds, inject failure) for one request."""
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        return max(0.0, self.latency_ms + jitter) / 1000.0, fail
+
+    def _result(self, record: Dict[str, Any], score: float, keyword: bool) -> Dict[str, Any]:
+        memory = {key: value for key, value in record.items() if not key.startswith("_")}
+        if self.payload_bytes:
+            memory["metadata"] = dict(memory["metadata"], padding="x" * self.payload_bytes)
+        return {
+            "id": record["id"],
+            "match_type": "keyword" if keyword else "tag",
+            "final_score": score,
+            "score_components": {"keyword": score} if keyword else {},
+            "memory": memory,
+        }
+
+
+def _project(result: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Keep only the requested memory fields, as the provider's projection asks."""
+    memory = result["memory"]
+    return {"id": result["id"], "memory": {field: memory[field] for field in fields if field in memory}}
+
+
+def _route_name(method: str, path: str) -> str:
+    if path.startswith("/memory/") and path != "/memory/batch":
+        path = "/memory/{id}"
+    return f"{method} {path}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FakeAutoMem/1.0"
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY, Nagle
+    # plus delayed ACKs adds ~40ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    @property
+    def backend(self) -> FakeAutoMem:
+        return self.server.backend  # type: ignore[attr-defined]
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PATCH(self) -> None:
+        self._dispatch("PATCH")
+
+    def _dispatch(self, method: str) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        backend = self.backend
+        backend.count(_route_name(method, path))
+        backend.transfer(len(raw))
+
+        if backend.api_key and self.headers.get("Authorization") != f"Bearer {backend.api_key}":
+            self._send(401, {"detail": "Invalid or missing API key"})
+            return
+        delay, fail = backend.draw()
+        if delay:
+            time.sleep(delay)
+        # /health stays truthful so breaker probes see the configured error
+        # rate only through real traffic.
+        if fail and path != "/health":
+            self._send(503, {"detail": "Injected failure from fake AutoMem"})
+            return
+        encoding = (self.headers.get("Content-Encoding") or "identity").strip().lower()
+        if encoding != "identity":
+            if not backend.compression or encoding not in {"gzip", "deflate"}:
+                self._send(415, {"detail": f"Unsupported Content-Encoding: {encoding}"})
+                return
+            try:
+                raw = gzip.decompress(raw) if encoding == "gzip" else zlib.decompress(raw)
+            except (OSError, EOFError, zlib.error):
+                self._send(400, {"detail": f"Request body is not valid {encoding}"})
+                return
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            self._send(400, {"detail": "Request body must be JSON"})
+            return
+
+        if method == "GET" and path == "/health":
+            self._send(
+                200,
+                {
+                    "status": "healthy",
+                    "falkordb": "ok",
+                    "qdrant": "ok",
+                    "memory_count": len(backend),
+                    "capabilities": ["recall_batch"] if backend.recall_batch else [],
+                    "timestamp": _now(),
+                },
+            )
+        elif method == "GET" and path == "/recall":
+            self._recall(urllib.parse.parse_qs(url.query))
+        elif method == "POST" and path == "/recall/batch" and backend.recall_batch:
+            self._recall_batch(body)
+        elif method == "POST" and path == "/memory":
+            self._store(body)
+        elif method == "POST" and path == "/memory/batch":
+            self._store_batch(body)
+        elif method == "PATCH" and path.startswith("/memory/"):
+            memory_id = urllib.parse.unquote(path[len("/memory/") :])
+            if backend.update(memory_id, body if isinstance(body, dict) else {}):
+                self._send(200, {"status": "success", "memory_id": memory_id, "message": "Memory updated successfully"})
+            else:
+                self._send(404, {"detail": f"Memory not found: {memory_id}"})
+        elif method == "POST" and path == "/associate":
+            missing = [key for key in ("memory1_id", "memory2_id", "type") if not body.get(key)]
+            if missing:
+                self._send(400, {"detail": f"Missing fields: {', '.join(missing)}"})
+                return
+            backend.associate(body)
+            self._send(200, {"status": "success", "message": "Association created successfully"})
+        else:
+            self._send(404, {"detail": f"Unhandled fake AutoMem route: {method} {path}"})
+
+    def _recall(self, params: Dict[str, List[str]]) -> None:
+        self._send(200, self._recall_response(params))
+
+    def _recall_batch(self, body: Dict[str, Any]) -> None:
+        queries = body.get("queries") if isinstance(body, dict) else None
+        if not isinstance(queries, list) or not queries or len(queries) > MAX_BATCH_SIZE:
+            self._send(400, {"detail": f"queries must be a list of 1-{MAX_BATCH_SIZE} items"})
+            return
+        results = []
+        for query in queries:
+            if not isinstance(query, dict):
+                self._send(400, {"detail": "each query must be an object"})
+                return
+            params = {
+                key: [str(item) for item in value] if isinstance(value, list) else [str(value)]
+                for key, value in query.items()
+            }
+            results.append(self._recall_response(params))
+        self._send(200, {"status": "success", "results": results, "count": len(results)})
+
+    def _recall_response(self, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        query = (params.get("query") or [""])[0]
+        tags = [tag for value in params.get("tags", []) for tag in value.split(",") if tag]
+        try:
+            limit = max(1, min(int((params.get("limit") or ["5"])[0]), 200))
+            offset = max(0, int((params.get("offset") or ["0"])[0]))
+        except ValueError:
+            limit, offset = 5, 0
+        results = self.backend.recall(
+            query,
+            tags,
+            limit,
+            start=(params.get("start") or [None])[0],
+            end=(params.get("end") or [None])[0],
+            sort=(params.get("sort") or ["score"])[0],
+            offset=offset,
+            time_query=(params.get("time_query") or [None])[0],
+        )
+        fields = [field for value in params.get("fields", []) for field in value.split(",") if field]
+        if fields:
+            results = [_project(result, fields) for result in results]
+        return {"status": "success", "query": query, "results": results, "count": len(results)}
+
+    def _store(self, body: Dict[str, Any]) -> None:
+        try:
+            memory_id = self.backend.add(body)
+        except (ValueError, TypeError) as exc:
+            self._send(400, {"detail": str(exc)})
+            return
+        self._send(201, {"status": "success", "memory_id": memory_id, "message": "Memory stored successfully"})
+
+    def _store_batch(self, body: Dict[str, Any]) -> None:
+        memories = body.get("memories") if isinstance(body, dict) else None
+        if not isinstance(memories, list) or not memories or len(memories) > MAX_BATCH_SIZE:
+            self._send(400, {"detail": f"memories must be a list of 1-{MAX_BATCH_SIZE} items"})
+            return
+        try:
+            ids = [self.backend.add(memory) for memory in memories]
+        except (ValueError, TypeError) as exc:
+            self._send(400, {"detail": str(exc)})
+            return
+        self._send(201, {"status": "success", "memory_ids": ids, "count": len(ids)})
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self.backend.compression:
+            # RFC 7694: tells clients they may gzip request bodies.
+            self.send_header("Accept-Encoding", "gzip, deflate")
+            accepted = (self.headers.get("Accept-Encoding") or "").lower()
+            if len(data) >= COMPRESS_MIN_BYTES and "gzip" in accepted:
+                data = gzip.compress(data, compresslevel=6)
+                self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.backend.transfer(len(data))
+        self.wfile.write(data)
+
+
+class FakeAutoMemServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, backend: FakeAutoMem, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.backend = backend
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeAutoMemServer":
+        """Serve from a daemon thread and return self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True, name="fake-automem")
+        self._thread.start()
+        return self
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients abandoning a request at their deadline is routine here.
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+
+def start_fake_backend(
+    memories: int = DEFAULT_MEMORIES,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    seed: int = 0,
+    **options: Any,
+) -> FakeAutoMemServer:
+    """Start a seeded fake backend on a background thread (port 0 picks a free port)."""
+    backend = FakeAutoMem(seed=seed, **options)
+    backend.seed(memories, seed=seed)
+    return FakeAutoMemServer(backend, host, port).start()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a local AutoMem stand-in for tests and benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--memories", type=int, default=DEFAULT_MEMORIES, help="Seeded memories (default: 200)")
+    parser.add_argument("--corpus", help="JSONL file of memories to load in addition to the seeded ones")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="Padding added to every recall result")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the corpus and injected faults")
+    parser.add_argument("--api-key", default="", help="Require this bearer token")
+    parser.add_argument(
+        "--no-recall-batch",
+        action="store_true",
+        help="Answer POST /recall/batch with 404 and drop it from /health capabilities",
+    )
+    parser.add_argument(
+        "--no-compression",
+        action="store_true",
+        help="Never gzip responses and answer compressed request bodies with 415",
+    )
+    parser.add_argument(
+        "--bandwidth-kbps",
+        type=float,
+        default=0.0,
+        help="Simulated link speed for request and response bodies (default: unlimited)",
+    )
+    args = parser.parse_args(argv)
+
+    backend = FakeAutoMem(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        payload_bytes=args.payload_bytes,
+        seed=args.seed,
+        api_key=args.api_key,
+        recall_batch=not args.no_recall_batch,
+        compression=not args.no_compression,
+        bandwidth_kbps=args.bandwidth_kbps,
+    )
+    backend.seed(args.memories, seed=args.seed)
+    if args.corpus:
+        backend.load(args.corpus)
+    server = FakeAutoMemServer(backend, args.host, args.port)
+    print(f"fake AutoMem serving {len(backend)} memories at {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
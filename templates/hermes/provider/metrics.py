@@ -0,0 +1,327 @@
+"""Always-on hot-path metrics for the AutoMem Hermes provider.
+
+Counters and fixed-bucket latency histograms are cheap enough to record on
+every turn: one lock acquisition and a bisect per observation, no per-sample
+storage. Each provider process periodically writes its own JSON snapshot next
+to the spool, so a cron one-shot exiting never replaces the gateway's numbers;
+`hermes automem stats` and the optional Prometheus textfile (for
+node_exporter's textfile collector) sum the recent snapshots of all processes.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SNAPSHOT_PREFIX = "metrics-"
+DEFAULT_FLUSH_INTERVAL = 15.0
+# Snapshots older than this belong to processes long gone; they are left out
+# of the aggregate and deleted by the next flush.
+DEFAULT_SNAPSHOT_RETENTION = 86400.0
+# Upper bounds in seconds; anything slower lands in the implicit +Inf bucket.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> _Key:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+class Histogram:
+    __slots__ = ("bounds", "buckets", "count", "sum", "max")
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at the max seen)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        buckets = data["buckets"]
+        histogram = cls(tuple(float(bound) for bound, _ in buckets[:-1]))
+        histogram.buckets = [int(count) for _, count in buckets]
+        histogram.count = int(data["count"])
+        histogram.sum = float(data["sum"])
+        histogram.max = float(data["max"])
+        return histogram
+
+    def merge(self, other: "Histogram") -> None:
+        if other.bounds != self.bounds:
+            raise ValueError("histogram bucket bounds differ")
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": [[bound, count] for bound, count in zip(self.bounds, self.buckets)]
+            + [["+Inf", self.buckets[-1]]],
+        }
+
+
+class Metrics:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, float] = {}
+        self._histograms: Dict[_Key, Histogram] = {}
+        self._last_flush = 0.0
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def flush_due(self, interval: float) -> bool:
+        """Claim the next periodic flush; True for at most one caller per interval."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_flush < interval:
+                return False
+            self._last_flush = now
+            return True
+
+    def snapshot(self, gauges: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                dict(histogram.to_dict(), name=name, labels=dict(labels))
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+        return {
+            "generated_at": time.time(),
+            "pid": os.getpid(),
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": [{"name": name, "labels": {}, "value": value} for name, value in sorted((gauges or {}).items())],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._last_flush = 0.0
+
+
+# Process-wide: every provider instance and session records into one registry.
+metrics = Metrics()
+
+
+def _labels_text(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = sorted(labels.items())
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{label}="{_escape(value)}"' for label, value in pairs) + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(snapshot: Dict[str, Any]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines: List[str] = []
+    typed = set()
+
+    def declare(name: str, kind: str) -> None:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for counter in snapshot.get("counters", []):
+        declare(counter["name"], "counter")
+        lines.append(f"{counter['name']}{_labels_text(counter['labels'])} {counter['value']}")
+    for gauge in snapshot.get("gauges", []):
+        declare(gauge["name"], "gauge")
+        lines.append(f"{gauge['name']}{_labels_text(gauge['labels'])} {gauge['value']}")
+    for histogram in snapshot.get("histograms", []):
+        name, labels = histogram["name"], histogram["labels"]
+        declare(name, "histogram")
+        cumulative = 0
+        for bound, count in histogram["buckets"]:
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels_text(labels, ('le', str(bound)))} {cumulative}")
+        lines.append(f"{name}_sum{_labels_text(labels)} {histogram['sum']}")
+        lines.append(f"{name}_count{_labels_text(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_atomic(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp, path)
+
+
+def snapshot_path(directory: str, pid: Optional[int] = None) -> str:
+    return os.path.join(directory, f"{SNAPSHOT_PREFIX}{pid or os.getpid()}.json")
+
+
+def write_snapshot(directory: str, snapshot: Dict[str, Any], prometheus_path: Optional[str] = None) -> None:
+    """Write this process's snapshot, drop expired ones, and refresh the Prometheus file if set.
+
+    Only the Prometheus file needs the other processes' snapshots, so they
+    are read back only when ``prometheus_path`` is set.
+    """
+    write_atomic(snapshot_path(directory), json.dumps(snapshot))
+    prune_snapshots(directory)
+    if prometheus_path:
+        write_atomic(prometheus_path, render_prometheus(merge_snapshots(load_snapshots(directory))))
+
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _snapshot_ages(directory: str) -> List[Tuple[str, float]]:
+    """(path, mtime) of every snapshot file, from a stat rather than a parse."""
+    try:
+        names = [name for name in os.listdir(directory) if name.startswith(SNAPSHOT_PREFIX) and name.endswith(".json")]
+    except FileNotFoundError:
+        return []
+    ages = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            ages.append((path, os.stat(path).st_mtime))
+        except OSError:
+            # Already pruned by another process.
+            continue
+    return ages
+
+
+def prune_snapshots(directory: str, max_age: float = DEFAULT_SNAPSHOT_RETENTION) -> None:
+    """Delete snapshots not rewritten within ``max_age`` seconds."""
+    cutoff = time.time() - max_age
+    for path, mtime in _snapshot_ages(directory):
+        if mtime < cutoff:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_snapshots(directory: str, max_age: float = DEFAULT_SNAPSHOT_RETENTION) -> List[Dict[str, Any]]:
+    """Snapshots written within ``max_age`` seconds, newest first."""
+    cutoff = time.time() - max_age
+    snapshots = []
+    for path, mtime in _snapshot_ages(directory):
+        if mtime < cutoff:
+            continue
+        try:
+            snapshots.append(load_snapshot(path))
+        except (OSError, ValueError):
+            # Half-written by another process, or already pruned by one.
+            continue
+    snapshots.sort(key=lambda snapshot: snapshot.get("generated_at") or 0, reverse=True)
+    return snapshots
+
+
+def merge_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum counters and histograms across processes; gauges stay per process, labelled by pid."""
+    counters: Dict[_Key, float] = {}
+    histograms: Dict[_Key, Histogram] = {}
+    gauges = []
+    for snapshot in snapshots:
+        for counter in snapshot.get("counters", []):
+            key = _key(counter["name"], counter["labels"])
+            counters[key] = counters.get(key, 0) + counter["value"]
+        for data in snapshot.get("histograms", []):
+            key = _key(data["name"], data["labels"])
+            histogram = Histogram.from_dict(data)
+            if key not in histograms:
+                histograms[key] = histogram
+                continue
+            try:
+                histograms[key].merge(histogram)
+            except ValueError:
+                # Written by a provider version with other buckets; the newest wins.
+                continue
+        for gauge in snapshot.get("gauges", []):
+            gauges.append(dict(gauge, labels=dict(gauge["labels"], pid=str(snapshot.get("pid", "?")))))
+    return {
+        "generated_at": max((snapshot.get("generated_at") or 0 for snapshot in snapshots), default=0),
+        "pids": [snapshot.get("pid") for snapshot in snapshots],
+        "counters": [
+            {"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(counters.items())
+        ],
+        "histograms": [
+            dict(histogram.to_dict(), name=name, labels=dict(labels))
+            for (name, labels), histogram in sorted(histograms.items())
+        ],
+        "gauges": sorted(gauges, key=lambda gauge: (gauge["name"], sorted(gauge["labels"].items()))),
+    }
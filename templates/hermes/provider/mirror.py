@@ -0,0 +1,255 @@
+"""Local lexical mirror of memories the provider has already seen.
+
+Every recall response and successful store is copied into a small SQLite FTS5
+index under $HERMES_HOME/plugins/automem/, keyed by memory id with its tags
+and updated_at, one index per endpoint and API key so switching tenants never
+surfaces another tenant's memories. When the backend is slow or the circuit
+breaker is open, prefetch answers Preferences and Task context from this index
+in well under a millisecond instead of returning nothing. The index is a cache, not a replica:
+it holds at most ``max_entries`` memories and prunes the least recently used.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 10_000
+# Prune a little below the cap so a full mirror is not pruned on every write.
+_PRUNE_HEADROOM = 0.9
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS memories (
+        rowid INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        content TEXT NOT NULL,
+        tags TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        last_used REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS memories_last_used ON memories (last_used)",
+    "CREATE INDEX IF NOT EXISTS memories_updated_at ON memories (updated_at)",
+    """
+    CREATE TABLE IF NOT EXISTS memory_tags (
+        tag TEXT NOT NULL,
+        memory_rowid INTEGER NOT NULL REFERENCES memories (rowid) ON DELETE CASCADE,
+        PRIMARY KEY (tag, memory_rowid)
+    ) WITHOUT ROWID
+    """,
+    # External-content FTS table: the text lives once, in `memories`.
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(content, content='memories', content_rowid='rowid')",
+    """
+    CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+        INSERT INTO memories_fts (rowid, content) VALUES (new.rowid, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+        INSERT INTO memories_fts (memories_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF content ON memories BEGIN
+        INSERT INTO memories_fts (memories_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+        INSERT INTO memories_fts (rowid, content) VALUES (new.rowid, new.content);
+    END
+    """,
+)
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def mirror_path_for(directory: str, endpoint: str, api_key: str = "") -> str:
+    """Mirror location for memories recalled from ``endpoint`` with ``api_key``."""
+    key = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    digest = hashlib.sha256(json.dumps([endpoint.rstrip("/"), key]).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"mirror-{digest}.sqlite3")
+
+
+def _match_expression(query: str) -> str:
+    # Quote every token so FTS5 operators and punctuation in prompts are inert.
+    tokens = dict.fromkeys(token.lower() for token in _TOKEN_PATTERN.findall(query or ""))
+    return " OR ".join(f'"{token}"' for token in list(tokens)[:64])
+
+
+class LocalMirror:
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Open (or create) the mirror; raises sqlite3.Error when FTS5 is unavailable."""
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        (self._count,) = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    def upsert(self, memories: Iterable[Dict[str, Any]]) -> int:
+        """Insert or refresh memories given as {id, content, tags, updated_at} dicts.
+
+        A memory already mirrored with a newer updated_at is left alone. One
+        without updated_at ranks as the oldest, so an undated copy never
+        outranks dated ones in recency order. Returns how many rows were written.
+        """
+        now = time.time()
+        rows: List[Tuple[str, str, List[str], float]] = []
+        for memory in memories:
+            memory_id = str(memory.get("id") or "").strip()
+            content = str(memory.get("content") or "").strip()
+            if not memory_id or not content:
+                continue
+            tags = memory.get("tags")
+            tag_list = [str(tag) for tag in tags] if isinstance(tags, list) else []
+            updated_at = _timestamp(memory.get("updated_at"))
+            rows.append((memory_id, content, tag_list, updated_at if updated_at is not None else 0.0))
+        if not rows:
+            return 0
+        written = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for memory_id, content, tag_list, updated_at in rows:
+                    existing = self._conn.execute(
+                        "SELECT rowid, updated_at FROM memories WHERE id = ?", (memory_id,)
+                    ).fetchone()
+                    if existing is None:
+                        cursor = self._conn.execute(
+                            "INSERT INTO memories (id, content, tags, updated_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                            (memory_id, content, json.dumps(tag_list), updated_at, now),
+                        )
+                        rowid = cursor.lastrowid
+                        self._count += 1
+                    elif existing[1] > updated_at:
+                        self._conn.execute("UPDATE memories SET last_used = ? WHERE rowid = ?", (now, existing[0]))
+                        continue
+                    else:
+                        rowid = existing[0]
+                        self._conn.execute(
+                            "UPDATE memories SET content = ?, tags = ?, updated_at = ?, last_used = ? WHERE rowid = ?",
+                            (content, json.dumps(tag_list), updated_at, now, rowid),
+                        )
+                        self._conn.execute("DELETE FROM memory_tags WHERE memory_rowid = ?", (rowid,))
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO memory_tags (tag, memory_rowid) VALUES (?, ?)",
+                        [(tag, rowid) for tag in tag_list],
+                    )
+                    written += 1
+                if self._count > self.max_entries:
+                    self._prune()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                (self._count,) = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()
+                raise
+        return written
+
+    def discard(self, memory_id: str) -> None:
+        """Forget one memory, e.g. after it was updated remotely."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM memories WHERE id = ?", (memory_id,))
+            self._count -= max(0, cursor.rowcount)
+
+    def search(
+        self,
+        query: str = "",
+        tags: Optional[List[str]] = None,
+        limit: int = 5,
+        since: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` mirrored memories as recall-shaped results.
+
+        With a query, matches are ranked by BM25 over the content; without
+        one, the most recently updated memories carrying any of ``tags`` come
+        first. Returned rows count as used for LRU pruning.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if tags:
+            placeholders = ",".join("?" for _ in tags)
+            clauses.append(f"m.rowid IN (SELECT memory_rowid FROM memory_tags WHERE tag IN ({placeholders}))")
+            params.extend(str(tag) for tag in tags)
+        if since is not None:
+            clauses.append("m.updated_at >= ?")
+            params.append(since)
+        match = _match_expression(query)
+        if query and not match:
+            return []
+        where = "".join(f" AND {clause}" for clause in clauses)
+        if match:
+            sql = (
+                "SELECT m.rowid, m.id, m.content, m.tags, m.updated_at FROM memories_fts"
+                " JOIN memories AS m ON m.rowid = memories_fts.rowid"
+                f" WHERE memories_fts MATCH ?{where} ORDER BY bm25(memories_fts) LIMIT ?"
+            )
+            params = [match, *params, max(1, int(limit))]
+        else:
+            sql = (
+                "SELECT m.rowid, m.id, m.content, m.tags, m.updated_at FROM memories AS m"
+                f" WHERE 1{where} ORDER BY m.updated_at DESC LIMIT ?"
+            )
+            params.append(max(1, int(limit)))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE memories SET last_used = ? WHERE rowid = ?",
+                    [(time.time(), row[0]) for row in rows],
+                )
+        return [
+            {
+                "id": memory_id,
+                "match_type": "local",
+                "memory": {
+                    "id": memory_id,
+                    "content": content,
+                    "tags": json.loads(tags_json),
+                    "updated_at": datetime.fromtimestamp(updated_at, timezone.utc).isoformat(),
+                },
+            }
+            for _, memory_id, content, tags_json, updated_at in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _prune(self) -> None:
+        target = int(self.max_entries * _PRUNE_HEADROOM)
+        excess = self._count - target
+        if excess <= 0:
+            return
+        cursor = self._conn.execute(
+            "DELETE FROM memories WHERE rowid IN (SELECT rowid FROM memories ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self._count -= max(0, cursor.rowcount)
@@ -0,0 +1,116 @@
+"""Bounded in-process recall cache for the AutoMem Hermes provider.
+
+The same recalls recur constantly (the preference query at the start of every
+session, repeated explicit recalls), so AutoMemClient keeps recent responses
+keyed on the normalized query parameters. Entries expire by per-kind TTL, are
+evicted LRU-first by entry count and total bytes, and every write through the
+client drops the whole cache so the provider never serves data older than its
+own store/update/associate calls.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+# Preferences change rarely and are re-queried on every first turn; semantic
+# task-context recalls are tied to the prompt and go stale sooner.
+KIND_TTLS: Dict[str, float] = {
+    "preference": 300.0,
+    "context": 60.0,
+    "query": 30.0,
+}
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: float
+
+
+class RecallCache:
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttls = dict(ttls or KIND_TTLS)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every invalidation; see put()."""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, size: int, kind: str, generation: int) -> None:
+        """Store a response fetched while the cache was at ``generation``.
+
+        A write that lands while the recall was in flight bumps the generation,
+        and the now-possibly-stale response is discarded instead of cached.
+        """
+        ttl = self.ttls.get(kind, 0.0)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(value, size, time.monotonic() + ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
@@ -0,0 +1,111 @@
+"""Incremental decoding of AutoMem recall responses.
+
+Ambient recall renders only the first few displayable results of a response,
+but json.loads() materialises every result, including embeddings and rich
+metadata the provider throws away. decode_recall_response() walks the top-level
+object with the stdlib scanner, decodes the "results" array one item at a time
+and stops once enough distinct displayable items have been collected, leaving
+the rest of the body undecoded.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def _skip(raw: str, index: int) -> int:
+    return _WHITESPACE.match(raw, index).end()  # type: ignore[union-attr]
+
+
+def decode_recall_response(
+    raw: str,
+    max_items: int,
+    item_key: Callable[[Any], Optional[str]],
+) -> Tuple[Any, int]:
+    """Decode a recall body, stopping after max_items distinct displayable results.
+
+    item_key returns a de-duplication key for a displayable result and None for
+    one the provider would skip. Returns the payload and how many characters
+    of raw were decoded; the payload keeps every top-level key that preceded
+    the cut. Anything that is not a JSON object with a "results" array is
+    decoded in full, and malformed input raises json.JSONDecodeError exactly as
+    json.loads() would.
+    """
+    try:
+        return _decode_object(raw, max_items, item_key)
+    except (ValueError, IndexError, TypeError):
+        pass
+    return (json.loads(raw) if raw.strip() else {}), len(raw)
+
+
+def _decode_object(
+    raw: str,
+    max_items: int,
+    item_key: Callable[[Any], Optional[str]],
+) -> Tuple[Any, int]:
+    index = _skip(raw, 0)
+    if not raw.startswith("{", index):
+        raise ValueError("not an object")
+    payload: Dict[str, Any] = {}
+    index = _skip(raw, index + 1)
+    if raw.startswith("}", index):
+        index += 1
+    else:
+        while True:
+            key, index = _decoder.raw_decode(raw, index)
+            if not isinstance(key, str):
+                raise ValueError("object key must be a string")
+            index = _skip(raw, index)
+            if raw[index] != ":":
+                raise ValueError("expected ':'")
+            index = _skip(raw, index + 1)
+            if key == "results" and raw.startswith("[", index):
+                items, index, complete = _decode_items(raw, index, max_items, item_key)
+                payload[key] = items
+                if not complete:
+                    return payload, index
+            else:
+                payload[key], index = _decoder.raw_decode(raw, index)
+            index = _skip(raw, index)
+            if raw[index] == ",":
+                index = _skip(raw, index + 1)
+                continue
+            if raw[index] != "}":
+                raise ValueError("expected ',' or '}'")
+            index += 1
+            break
+    if _skip(raw, index) != len(raw):
+        raise ValueError("extra data")
+    return payload, len(raw)
+
+
+def _decode_items(
+    raw: str,
+    index: int,
+    max_items: int,
+    item_key: Callable[[Any], Optional[str]],
+) -> Tuple[List[Any], int, bool]:
+    items: List[Any] = []
+    keys = set()
+    index = _skip(raw, index + 1)
+    if raw.startswith("]", index):
+        return items, index + 1, True
+    while True:
+        item, index = _decoder.raw_decode(raw, index)
+        items.append(item)
+        key = item_key(item)
+        if key is not None:
+            keys.add(key)
+        index = _skip(raw, index)
+        if raw[index] == "]":
+            return items, index + 1, True
+        if raw[index] != ",":
+            raise ValueError("expected ',' or ']'")
+        if len(keys) >= max_items:
+            return items, index, False
+        index = _skip(raw, index + 1)
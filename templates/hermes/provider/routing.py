@@ -0,0 +1,125 @@
+"""Latency-aware read routing across AutoMem replicas.
+
+AUTOMEM_API_URL may list several endpoints, separated by commas or spaces.
+The first is the primary: every write goes there, so writes keep one order
+and idempotency keys are never split across replicas. Reads go to the
+endpoint with the lowest exponentially weighted moving average (EWMA)
+latency among those whose circuit breaker is closed, and fail over to the
+next one on transport errors and 5xx responses.
+
+An endpoint that has not answered a read for ``stale_after`` seconds is
+treated as unmeasured and tried first once, so a replica that was slow, or
+just recovered, is measured again instead of being avoided for good.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+if __package__:
+    from .breaker import CLOSED, breaker_for
+else:
+    from breaker import CLOSED, breaker_for
+
+# Weight of the newest sample; ~0.3 follows a latency shift within a few reads.
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_STALE_AFTER = 30.0
+# Latency charged to an endpoint whose read failed, before the breaker opens.
+FAILURE_PENALTY_SECONDS = 1.0
+
+_SEPARATOR = re.compile(r"[\s,]+")
+
+
+def parse_endpoints(value: str) -> List[str]:
+    """Split an AUTOMEM_API_URL value into distinct endpoints, primary first."""
+    endpoints = [part.rstrip("/") for part in _SEPARATOR.split(value or "") if part.strip()]
+    return list(dict.fromkeys(endpoint for endpoint in endpoints if endpoint))
+
+
+class _Stats:
+    __slots__ = ("ewma", "last_sample", "reads", "failures")
+
+    def __init__(self) -> None:
+        self.ewma: Optional[float] = None
+        self.last_sample = 0.0
+        self.reads = 0
+        self.failures = 0
+
+
+class EndpointRouter:
+    def __init__(
+        self,
+        endpoints: Sequence[str],
+        alpha: float = DEFAULT_EWMA_ALPHA,
+        stale_after: float = DEFAULT_STALE_AFTER,
+    ):
+        if not endpoints:
+            raise ValueError("at least one endpoint is required")
+        self.endpoints = [endpoint.rstrip("/") for endpoint in endpoints]
+        self.primary = self.endpoints[0]
+        self.alpha = alpha
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _Stats] = {endpoint: _Stats() for endpoint in self.endpoints}
+
+    def read_order(self) -> List[str]:
+        """Endpoints to try for a read, best first.
+
+        Endpoints whose breaker refuses ambient work go last, so an explicit
+        read still reaches them when every breaker is open.
+        """
+        if len(self.endpoints) == 1:
+            return list(self.endpoints)
+        allowed = {endpoint: breaker_for(endpoint).allow() for endpoint in self.endpoints}
+        now = time.monotonic()
+        with self._lock:
+            ranks = {}
+            for position, endpoint in enumerate(self.endpoints):
+                stats = self._stats[endpoint]
+                fresh = stats.ewma is not None and now - stats.last_sample < self.stale_after
+                # Unmeasured and stale endpoints sort first so they get measured;
+                # ties keep the configured order, primary first.
+                ranks[endpoint] = (not allowed[endpoint], stats.ewma if fresh else -1.0, position)
+        return sorted(self.endpoints, key=ranks.__getitem__)
+
+    def reads_allowed(self) -> bool:
+        """True when at least one endpoint's breaker allows ambient reads."""
+        return any(breaker_for(endpoint).allow() for endpoint in self.endpoints)
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                return
+            stats.ewma = seconds if stats.ewma is None else self.alpha * seconds + (1 - self.alpha) * stats.ewma
+            stats.last_sample = time.monotonic()
+            stats.reads += 1
+
+    def failed(self, endpoint: str) -> None:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                return
+            stats.failures += 1
+            stats.ewma = max(FAILURE_PENALTY_SECONDS, 2 * (stats.ewma or 0.0))
+            stats.last_sample = time.monotonic()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [
+                {
+                    "endpoint": endpoint,
+                    "primary": endpoint == self.primary,
+                    "ewma_ms": round(stats.ewma * 1000, 2) if stats.ewma is not None else None,
+                    "reads": stats.reads,
+                    "failures": stats.failures,
+                }
+                for endpoint, stats in self._stats.items()
+            ]
+        for row in rows:
+            row["breaker"] = breaker_for(row["endpoint"]).snapshot()
+            row["healthy"] = row["breaker"]["state"] == CLOSED
+        return rows
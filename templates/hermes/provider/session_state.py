@@ -0,0 +1,130 @@
+"""Bounded per-session state for the AutoMem Hermes provider.
+
+A long-lived Hermes gateway can serve thousands of sessions through one
+provider instance. Session state is therefore kept in an LRU table with an
+idle TTL, each entry is a compact __slots__ object, and the entities a
+session has seen and the memories already injected into it are capped
+most-recent-first windows rather than unbounded sets.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set
+
+DEFAULT_MAX_SESSIONS = 2048
+DEFAULT_IDLE_TTL = 6 * 60 * 60.0
+DEFAULT_MAX_ENTITIES = 64
+DEFAULT_MAX_INJECTED = 256
+
+
+class SessionState:
+    __slots__ = (
+        "first_substantive_done",
+        "speculation",
+        "last_seen",
+        "turns",
+        "lock",
+        "_entities",
+        "_max_entities",
+        "_injected",
+    )
+
+    def __init__(self, max_entities: int = DEFAULT_MAX_ENTITIES):
+        # Guards this session's fields; the table lock only guards membership.
+        self.lock = threading.Lock()
+        self.first_substantive_done = False
+        self.speculation: Optional[Any] = None
+        self.last_seen = time.monotonic()
+        # Prompts planned for this session; injection history is in these turns.
+        self.turns = 0
+        # dict keys as an insertion-ordered set: the oldest entity is first,
+        # so trimming the window is a pop from the front.
+        self._entities: Dict[str, None] = {}
+        self._max_entities = max_entities
+        # Memory key -> turn it was last injected, oldest first.
+        self._injected: Dict[str, int] = {}
+
+    @property
+    def entities(self) -> Set[str]:
+        return set(self._entities)
+
+    def unseen(self, entities: Iterable[str]) -> Set[str]:
+        return {entity for entity in entities if entity not in self._entities}
+
+    def remember(self, entities: Iterable[str]) -> None:
+        window = self._entities
+        for entity in entities:
+            window.pop(entity, None)
+            window[entity] = None
+        while len(window) > self._max_entities:
+            del window[next(iter(window))]
+
+    def injected_turn(self, key: str) -> Optional[int]:
+        """The turn a memory was last injected into this session, if it was."""
+        return self._injected.get(key)
+
+    def mark_injected(self, keys: Iterable[str]) -> None:
+        injected = self._injected
+        for key in keys:
+            injected.pop(key, None)
+            injected[key] = self.turns
+        while len(injected) > DEFAULT_MAX_INJECTED:
+            del injected[next(iter(injected))]
+
+
+class SessionTable:
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        max_entities: int = DEFAULT_MAX_ENTITIES,
+    ):
+        self.max_sessions = max(1, int(max_sessions))
+        self.idle_ttl = idle_ttl
+        self.max_entities = max(1, int(max_entities))
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is not None:
+                self._touch(session_id, state)
+            return state
+
+    def get_or_create(self, session_id: str) -> SessionState:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = SessionState(self.max_entities)
+                self._sessions[session_id] = state
+            self._touch(session_id, state)
+            self._evict()
+            return state
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def _touch(self, session_id: str, state: SessionState) -> None:
+        state.last_seen = time.monotonic()
+        self._sessions.move_to_end(session_id)
+
+    def _evict(self) -> None:
+        # Entries are ordered by last access, so both the size cap and the idle
+        # TTL only ever need to look at the front of the table.
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and oldest.last_seen >= cutoff:
+                break
+            del self._sessions[oldest_id]
+            self.evictions += 1
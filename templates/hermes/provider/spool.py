@@ -0,0 +1,183 @@
+"""Durable on-disk spool for AutoMem writes made while the backend is down.
+
+Writes that cannot reach AutoMem (explicit store/update/associate tool calls
+and auto-captured turns) are appended to a small SQLite file under
+$HERMES_HOME/plugins/automem/ and acknowledged immediately. Once the endpoint
+is healthy again they are replayed in order, each with a stable idempotency
+key, and the file is compacted after the backlog is gone. Rows are streamed
+in pages, so a spool of tens of thousands of entries is never loaded into
+memory at once.
+
+Several provider instances and processes may share the file. The backlog is
+counted from the table (the seq range, since rows only ever leave from the
+head), and a replay first takes a lease in the same file so only one replayer
+sends at a time and rows keep their order. Each endpoint and API key gets its
+own file, so pointing the provider at another backend never replays this
+one's writes there.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 50_000
+_REPLAY_PAGE_SIZE = 100
+# A replayer renews its lease before every row; one that stopped renewing
+# (a crashed process) is taken over once the lease runs out.
+REPLAY_LEASE_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS replay_lease (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def spool_path_for(directory: str, endpoint: str, api_key: str = "") -> str:
+    """Spool location for writes meant for ``endpoint`` with ``api_key``."""
+    key = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    digest = hashlib.sha256(json.dumps([endpoint.rstrip("/"), key]).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"spool-{digest}.sqlite3")
+
+
+class ReplayRejected(Exception):
+    """Raised by a replay sender when the server permanently rejected an entry."""
+
+
+class WriteSpool:
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._owner = str(uuid.uuid4())
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def append(self, op: str, payload: Dict[str, Any], idempotency_key: Optional[str] = None) -> Optional[str]:
+        """Persist one write and return its idempotency key, or None when full.
+
+        A write that may already have reached the server passes the key it was
+        sent with, so replaying it cannot store it twice.
+        """
+        key = idempotency_key or str(uuid.uuid4())
+        with self._lock:
+            if self._count() >= self.max_entries:
+                return None
+            self._conn.execute(
+                "INSERT INTO spool (op, idempotency_key, payload, created_at) VALUES (?, ?, ?, ?)",
+                (op, key, json.dumps(payload), time.time()),
+            )
+        return key
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def replay(self, send: Callable[[str, Dict[str, Any], str], Any]) -> Tuple[int, int]:
+        """Send spooled writes oldest-first until one fails.
+
+        ``send(op, payload, idempotency_key)`` raising ReplayRejected drops that
+        entry (the server will never accept it); any other exception stops the
+        replay with the entry still spooled. Returns (replayed, rejected); both
+        are 0 when another instance or process holds the replay lease.
+        """
+        replayed = rejected = 0
+        if not self._renew_lease():
+            return replayed, rejected
+        try:
+            replayed, rejected = self._replay_leased(send)
+        finally:
+            self._release_lease()
+        self.compact()
+        return replayed, rejected
+
+    def _replay_leased(self, send: Callable[[str, Dict[str, Any], str], Any]) -> Tuple[int, int]:
+        replayed = rejected = 0
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, op, idempotency_key, payload FROM spool WHERE seq > ? ORDER BY seq LIMIT ?",
+                    (last_seq, _REPLAY_PAGE_SIZE),
+                ).fetchall()
+            if not rows:
+                break
+            for seq, op, key, payload in rows:
+                last_seq = seq
+                if not self._renew_lease():
+                    # Another replayer took over after this one stalled.
+                    return replayed, rejected
+                try:
+                    send(op, json.loads(payload), key)
+                    replayed += 1
+                except ReplayRejected:
+                    rejected += 1
+                except Exception:
+                    return replayed, rejected
+                self._delete(seq)
+        return replayed, rejected
+
+    def compact(self) -> None:
+        with self._lock:
+            if self._count() == 0:
+                # Reclaim the pages freed by replayed rows and restart sequence
+                # numbering so an emptied spool goes back to its minimal size.
+                self._conn.execute("DELETE FROM sqlite_sequence WHERE name = 'spool'")
+                self._conn.execute("VACUUM")
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _count(self) -> int:
+        # Rows are appended with increasing seq and only deleted oldest-first,
+        # so the seq range is the row count; each bound is one index lookup.
+        low, high = self._conn.execute(
+            "SELECT (SELECT MIN(seq) FROM spool), (SELECT MAX(seq) FROM spool)"
+        ).fetchone()
+        return 0 if low is None else high - low + 1
+
+    def _renew_lease(self) -> bool:
+        """Take or extend the replay lease; False while another replayer holds it."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT owner, expires_at FROM replay_lease WHERE id = 1").fetchone()
+                if row is not None and row[0] != self._owner and row[1] > now:
+                    return False
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO replay_lease (id, owner, expires_at) VALUES (1, ?, ?)",
+                    (self._owner, now + REPLAY_LEASE_SECONDS),
+                )
+                return True
+            finally:
+                self._conn.execute("COMMIT")
+
+    def _release_lease(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM replay_lease WHERE id = 1 AND owner = ?", (self._owner,))
+
+    def _delete(self, seq: int) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM spool WHERE seq = ?", (seq,))
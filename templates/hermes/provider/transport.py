@@ -0,0 +1,386 @@
+"""Pooled HTTP/1.1 keep-alive transport for the AutoMem Hermes provider.
+
+urllib opens a fresh TCP connection (and TLS handshake for remote endpoints)
+per request. Ambient recall issues several requests per turn, so the provider
+and the CLI share one pool that keeps a bounded number of idle connections per
+endpoint and reuses them across calls.
+
+Responses sent with a gzip or deflate Content-Encoding are decoded here, so
+callers always see the identity body; gzip_body() is the matching helper for
+compressing request bodies.
+
+Like urllib, the pool honours HTTP_PROXY, HTTPS_PROXY and NO_PROXY: plain
+HTTP goes through the proxy with an absolute request target, HTTPS through a
+CONNECT tunnel. GET and HEAD requests follow redirects that stay on the same
+host (including an http -> https upgrade), as urlopen did for a hosted
+endpoint behind a scheme or trailing-slash redirect. Other redirects, and any
+redirect of a write, surface as an HTTPError from raise_for_status(): the
+Authorization header must not leave the configured host, and a redirected
+write could be replayed as a GET.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import http.client
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 16
+DEFAULT_IDLE_TIMEOUT = 30.0
+ACCEPT_ENCODING = "gzip, deflate"
+# Below this, gzip's ~20-byte framing and the CPU cost outweigh the saving.
+DEFAULT_COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
+
+# Errors that mean a reused keep-alive socket was closed by the server (or a
+# proxy), usually while idle. The server may still have received the request,
+# so only retry_safe() requests are sent again on a fresh connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+REDIRECT_METHODS = frozenset({"GET", "HEAD"})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+MAX_REDIRECTS = 5
+
+_PoolKey = Tuple[str, str, int]
+
+
+class TransportResponse(NamedTuple):
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    body: bytes
+    # The URL that answered, after any redirects followed.
+    url: str = ""
+
+
+class PoolExhausted(TimeoutError):
+    """No connection to the endpoint came free in time.
+
+    This is local back-pressure, not evidence the endpoint is down, so
+    callers keep it out of circuit-breaker accounting.
+    """
+
+
+class Proxy(NamedTuple):
+    host: str
+    port: int
+    authorization: Optional[str]
+
+
+def retry_safe(method: str) -> bool:
+    """Whether a request that died on a reused connection may be sent again.
+
+    Only idempotent methods are. A POST may have been applied before the
+    connection dropped, and nothing guarantees the server de-duplicates its
+    Idempotency-Key, so it is left to the caller (the write spool) to retry.
+    """
+    return method.upper() in IDEMPOTENT_METHODS
+
+
+def same_host_redirect(url: str, location: str) -> Optional[str]:
+    """The absolute redirect target if it stays on ``url``'s host without a downgrade, else None."""
+    target = urllib.parse.urljoin(url, location)
+    source, parsed = urllib.parse.urlsplit(url), urllib.parse.urlsplit(target)
+    if parsed.scheme not in {"http", "https"} or parsed.hostname != source.hostname:
+        return None
+    if source.scheme == "https" and parsed.scheme != "https":
+        return None
+    return target
+
+
+def proxy_for(scheme: str, host: str) -> Optional[Proxy]:
+    """The proxy urllib would use for ``scheme`` requests to ``host``, from *_PROXY and NO_PROXY."""
+    url = urllib.request.getproxies().get(scheme)
+    if not url or urllib.request.proxy_bypass(host):
+        return None
+    parsed = urllib.parse.urlsplit(url if "://" in url else f"http://{url}")
+    if (parsed.scheme or "http").lower() != "http":
+        raise urllib.error.URLError(f"unsupported proxy scheme: {parsed.scheme}")
+    authorization = None
+    if parsed.username is not None:
+        credentials = f"{urllib.parse.unquote(parsed.username)}:{urllib.parse.unquote(parsed.password or '')}"
+        authorization = "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return Proxy(parsed.hostname or "127.0.0.1", parsed.port or 80, authorization)
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        max_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.max_per_host = max(1, int(max_per_host))
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: Dict[_PoolKey, List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._slots: Dict[_PoolKey, threading.BoundedSemaphore] = {}
+        self._proxies: Dict[_PoolKey, Optional[Proxy]] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._counters = {
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+            "bytes_decoded": 0,
+        }
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 8.0,
+    ) -> TransportResponse:
+        response = self._request(method, url, body, headers, timeout)
+        hops = 0
+        while (
+            response.status in REDIRECT_STATUSES
+            and method.upper() in REDIRECT_METHODS
+            and response.headers.get("location")
+            and hops < MAX_REDIRECTS
+        ):
+            target = same_host_redirect(response.url, response.headers["location"])
+            if target is None:
+                break
+            hops += 1
+            response = self._request(method, target, body, headers, timeout)
+        return response
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Optional[Dict[str, str]],
+        timeout: float,
+    ) -> TransportResponse:
+        parsed = urllib.parse.urlsplit(url)
+        scheme = (parsed.scheme or "http").lower()
+        if scheme not in {"http", "https"}:
+            raise urllib.error.URLError(f"unsupported URL scheme: {scheme}")
+        host = parsed.hostname or "127.0.0.1"
+        port = parsed.port or (443 if scheme == "https" else 80)
+        key: _PoolKey = (scheme, host, port)
+        target = parsed.path or "/"
+        if parsed.query:
+            target = f"{target}?{parsed.query}"
+        headers = dict(headers or {})
+        proxy = self._proxy(key)
+        if proxy is not None and scheme == "http":
+            target = f"http://{parsed.netloc.rpartition('@')[2]}{target}"
+            if proxy.authorization:
+                headers["Proxy-Authorization"] = proxy.authorization
+
+        slot = self._slot(key)
+        if not slot.acquire(timeout=timeout):
+            raise PoolExhausted(f"no free AutoMem connection for {host}:{port} within {timeout}s")
+        try:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                return self._send(key, conn, method, url, target, body, headers)
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused or not retry_safe(method):
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+            conn = self._connect(key, timeout)
+            try:
+                return self._send(key, conn, method, url, target, body, headers)
+            except BaseException:
+                conn.close()
+                raise
+        finally:
+            slot.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [conn for entries in self._idle.values() for conn, _ in entries]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._idle.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Cumulative request, connection and body-byte counters."""
+        with self._lock:
+            counters = dict(self._counters)
+            counters["idle_connections"] = sum(len(entries) for entries in self._idle.values())
+        return counters
+
+    def _proxy(self, key: _PoolKey) -> Optional[Proxy]:
+        with self._lock:
+            if key in self._proxies:
+                return self._proxies[key]
+        proxy = proxy_for(key[0], key[1])
+        with self._lock:
+            self._proxies[key] = proxy
+        return proxy
+
+    def _slot(self, key: _PoolKey) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._slots[key] = slot
+            return slot
+
+    def _checkout(self, key: _PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        cutoff = time.monotonic() - self.idle_timeout
+        expired: List[http.client.HTTPConnection] = []
+        conn: Optional[http.client.HTTPConnection] = None
+        with self._lock:
+            idle = self._idle.get(key) or []
+            while idle:
+                candidate, used = idle.pop()
+                if used < cutoff:
+                    expired.append(candidate)
+                    continue
+                conn = candidate
+                break
+        for stale in expired:
+            stale.close()
+        if conn is None:
+            return self._connect(key, timeout), False
+        self._count("connections_reused")
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.timeout = timeout
+        return conn, True
+
+    def _connect(self, key: _PoolKey, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        proxy = self._proxy(key)
+        self._count("connections_opened")
+        if proxy is not None and scheme == "http":
+            return http.client.HTTPConnection(proxy.host, proxy.port, timeout=timeout)
+        if scheme == "https":
+            with self._lock:
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+            if proxy is None:
+                return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+            conn = http.client.HTTPSConnection(proxy.host, proxy.port, timeout=timeout, context=self._ssl_context)
+            tunnel_headers = {"Proxy-Authorization": proxy.authorization} if proxy.authorization else None
+            conn.set_tunnel(host, port, headers=tunnel_headers)
+            return conn
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _send(
+        self,
+        key: _PoolKey,
+        conn: http.client.HTTPConnection,
+        method: str,
+        url: str,
+        target: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> TransportResponse:
+        conn.request(method, target, body=body, headers=headers)
+        response = conn.getresponse()
+        payload = response.read()
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        decoded = decode_content(response_headers.pop("content-encoding", ""), payload)
+        self._checkin(key, conn, keep=not response.will_close)
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["bytes_sent"] += len(body or b"")
+            self._counters["bytes_received"] += len(payload)
+            self._counters["bytes_decoded"] += len(decoded)
+        return TransportResponse(
+            status=response.status,
+            reason=response.reason,
+            headers=response_headers,
+            body=decoded,
+            url=url,
+        )
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _checkin(self, key: _PoolKey, conn: http.client.HTTPConnection, keep: bool) -> None:
+        if keep:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_per_host:
+                    idle.append((conn, time.monotonic()))
+                    return
+        conn.close()
+
+
+_shared_pool: Optional[ConnectionPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool() -> ConnectionPool:
+    """Return the process-wide pool used by the provider and the CLI."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ConnectionPool()
+        return _shared_pool
+
+
+def decode_content(encoding: str, payload: bytes) -> bytes:
+    # Codings are listed in the order they were applied, so undo them in reverse.
+    for coding in reversed([part.strip().lower() for part in encoding.split(",") if part.strip()]):
+        try:
+            if coding in {"gzip", "x-gzip"}:
+                payload = gzip.decompress(payload)
+            elif coding == "deflate":
+                # RFC 9110 deflate is zlib-wrapped, but some servers send raw
+                # deflate streams; accept both.
+                try:
+                    payload = zlib.decompress(payload)
+                except zlib.error:
+                    payload = zlib.decompress(payload, -zlib.MAX_WBITS)
+            elif coding != "identity":
+                raise http.client.HTTPException(f"unsupported Content-Encoding: {coding}")
+        except (OSError, EOFError, zlib.error) as exc:
+            raise http.client.HTTPException(f"could not decode {coding} response: {exc}") from exc
+    return payload
+
+
+def gzip_body(data: bytes, min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES) -> Optional[bytes]:
+    """Return data gzip-compressed, or None when it is too small to be worth it."""
+    if len(data) < max(0, min_bytes):
+        return None
+    compressed = gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+    return compressed if len(compressed) < len(data) else None
+
+
+def accepts_gzip_requests(headers: Dict[str, str]) -> bool:
+    """Whether a response advertises gzip request bodies (RFC 7694 Accept-Encoding)."""
+    codings = headers.get("accept-encoding", "")
+    return any(part.split(";")[0].strip().lower() == "gzip" for part in codings.split(","))
+
+
+def raise_for_status(url: str, response: TransportResponse) -> None:
+    # Surface HTTP failures as urllib's HTTPError so callers that already
+    # handle urlopen errors (tool-call error messages, CLI diagnostics) keep
+    # reporting the status code and reason unchanged. A 3xx left here is one
+    # the pool would not follow, reported the way urllib reports such a one.
+    if response.status >= 300:
+        raise urllib.error.HTTPError(url, response.status, response.reason, None, None)
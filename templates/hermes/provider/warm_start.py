@@ -0,0 +1,161 @@
+"""On-disk warm-start cache for the provider's stable recalls.
+
+Preferences and the current project's recent context are the same for every
+new Hermes process in a working directory, yet each process starts with an
+empty recall cache and its first substantive turn pays cold network recalls
+for them. For CLI one-shots and cron runs that is every turn. The provider
+saves those responses to a small JSON file on shutdown and reloads them in
+initialize. The first turn renders Preferences from disk while a background
+refresh fetches them again; the saved project context only stands in for a
+Task context recall that fails or misses the prefetch budget.
+
+The file is tied to a format version, the endpoint and a digest of the API
+key. Entries are only served for identical recall arguments and while
+younger than ``max_age``. A write through the provider invalidates the
+entries it may have changed and re-fetches them in the background, and a
+refresh that returns the same payload leaves the file untouched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+WARM_START_FILENAME = "warm_start.json"
+WARM_START_VERSION = 1
+DEFAULT_MAX_AGE_SECONDS = 7 * 86400
+# Project entries from other working directories kept in the file.
+DEFAULT_MAX_ENTRIES = 32
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class WarmStartCache:
+    def __init__(
+        self,
+        path: str,
+        endpoint: str,
+        api_key: str = "",
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.max_age = max_age
+        self.max_entries = max(1, int(max_entries))
+        self._scope = {"endpoint": endpoint.rstrip("/"), "key": _digest(api_key)}
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._generation = 0
+        self._dirty = False
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every invalidation; see put()."""
+        with self._lock:
+            return self._generation
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def load(self) -> int:
+        """Read the file; returns how many entries are usable. A missing or foreign file loads nothing."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return 0
+        if (
+            not isinstance(state, dict)
+            or state.get("version") != WARM_START_VERSION
+            or state.get("scope") != self._scope
+            or not isinstance(state.get("entries"), dict)
+        ):
+            return 0
+        now = time.time()
+        entries = {
+            key: entry
+            for key, entry in state["entries"].items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get("fetched_at"), (int, float))
+            and now - entry["fetched_at"] <= self.max_age
+            and "args" in entry
+            and "response" in entry
+        }
+        with self._lock:
+            self._entries = entries
+        return len(entries)
+
+    def get(self, key: str, args: Dict[str, Any]) -> Optional[Any]:
+        """Return the saved response for ``key`` if it was fetched with the same ``args`` and is fresh."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry["args"] != args or time.time() - entry["fetched_at"] > self.max_age:
+            return None
+        return entry["response"]
+
+    def put(self, key: str, args: Dict[str, Any], response: Any, generation: int) -> None:
+        """Record a response fetched while the cache was at ``generation``.
+
+        A write that landed while the recall was in flight bumps the
+        generation, and the possibly stale response is not recorded.
+        """
+        digest = _digest(response)
+        with self._lock:
+            if generation != self._generation:
+                return
+            entry = self._entries.get(key)
+            now = time.time()
+            # An unchanged response is rewritten only once the saved copy is
+            # half way to max_age, so routine refreshes do not touch the disk.
+            changed = (
+                entry is None
+                or entry.get("digest") != digest
+                or entry["args"] != args
+                or now - entry["fetched_at"] > self.max_age / 2
+            )
+            if not changed:
+                return
+            self._entries[key] = {"args": args, "response": response, "digest": digest, "fetched_at": now}
+            self._dirty = True
+            while len(self._entries) > self.max_entries:
+                oldest = min(self._entries, key=lambda name: self._entries[name]["fetched_at"])
+                del self._entries[oldest]
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Drop the entries for ``keys``, or every entry when None."""
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+            else:
+                for key in keys:
+                    self._entries.pop(key, None)
+            self._generation += 1
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Write the file if anything changed since load; returns whether it was written."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            state = {
+                "version": WARM_START_VERSION,
+                "scope": self._scope,
+                "entries": dict(self._entries),
+                "saved_at": time.time(),
+            }
+            self._dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, self.path)
+        return True
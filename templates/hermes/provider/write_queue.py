@@ -0,0 +1,210 @@
+"""Bounded background write queue for AutoMem auto-capture.
+
+sync_turn used to hand each captured turn to its own thread and drop the turn
+when the previous write was still running. The queue instead accepts turns
+without blocking the caller, and one long-lived worker sends them in batches.
+It coalesces duplicate turns, retries failed batches with jittered
+exponential backoff, and drains within a deadline on shutdown.
+
+Every item gets an idempotency key when it is enqueued. The sender receives
+the keys alongside the items, so a batch resent after a lost response (or an
+item later replayed from the spool) is recognised by the server instead of
+being stored twice.
+"""
+
+from __future__ import annotations
+
+import queue
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_DEPTH = 256
+DEFAULT_MAX_BATCH = 20
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 8.0
+
+_POLL_INTERVAL = 0.25
+
+# (enqueued at, idempotency key, item): the timestamp only feeds the on_sent
+# latency hook.
+_Pending = Tuple[float, str, Dict[str, Any]]
+
+
+class BatchWriteError(Exception):
+    """Raised by a batch sender that durably wrote only the first ``written`` items."""
+
+    def __init__(self, written: int, cause: BaseException):
+        super().__init__(f"{written} item(s) written before failure: {cause}")
+        self.written = written
+        self.cause = cause
+
+
+class WriteQueue:
+    def __init__(
+        self,
+        send: Callable[[List[Dict[str, Any]], List[str]], Any],
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        name: str = "automem-write-queue",
+    ):
+        self._send = send
+        self.max_batch = max(1, int(max_batch))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        # Called with the items a batch still held after its final attempt and
+        # their idempotency keys, e.g. to hand them to a durable spool instead
+        # of losing them.
+        self.on_give_up: Optional[Callable[[List[Dict[str, Any]], List[str]], None]] = None
+        # Called with the enqueue-to-ack wait, in seconds, of every item a
+        # batch delivered.
+        self.on_sent: Optional[Callable[[List[float]], None]] = None
+        self._name = name
+        self._queue: "queue.Queue[_Pending]" = queue.Queue(maxsize=max(1, int(max_depth)))
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._counters = {
+            "enqueued": 0,
+            "sent": 0,
+            "batches": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "failed": 0,
+            "dropped": 0,
+        }
+
+    def put(self, item: Dict[str, Any]) -> bool:
+        """Enqueue without blocking; return False (and count a drop) when full or closed."""
+        if self._stop.is_set():
+            self._count("dropped")
+            return False
+        try:
+            self._queue.put_nowait((time.monotonic(), f"capture-{uuid.uuid4()}", item))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        self._ensure_worker()
+        return True
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["depth"] = self.depth()
+        return counters
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """Drain pending writes within ``timeout`` seconds, then stop the worker.
+
+        Returns True when everything enqueued was processed. Items still queued
+        at the deadline are counted as dropped.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            if not (self._worker and self._worker.is_alive()):
+                break
+            time.sleep(0.01)
+        drained = not self._queue.unfinished_tasks
+        self._stop.set()
+        worker = self._worker
+        if worker and worker.is_alive():
+            worker.join(timeout=max(0.0, deadline - time.monotonic()) + _POLL_INTERVAL)
+        leftover = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+            leftover += 1
+        if leftover:
+            self._count("dropped", leftover)
+        return drained
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True, name=self._name)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._deliver(self._coalesce(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _coalesce(self, batch: List[_Pending]) -> List[_Pending]:
+        unique: List[_Pending] = []
+        seen = set()
+        for entry in batch:
+            key = str(entry[2].get("content") or "")
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(entry)
+        if len(unique) < len(batch):
+            self._count("coalesced", len(batch) - len(unique))
+        return unique
+
+    def _deliver(self, batch: List[_Pending]) -> None:
+        remaining = batch
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self._send([item for _, _, item in remaining], [key for _, key, _ in remaining])
+                self._acked(remaining)
+                self._count("batches")
+                return
+            except BatchWriteError as exc:
+                self._acked(remaining[: exc.written])
+                remaining = remaining[exc.written :]
+            except Exception:
+                pass
+            if attempt == self.max_attempts or self._stop.is_set():
+                break
+            self._count("retries")
+            delay = min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1)))
+            # Full jitter keeps several providers from retrying in lockstep.
+            if self._stop.wait(random.uniform(0, delay)):
+                break
+        self._count("failed", len(remaining))
+        if self.on_give_up is not None:
+            try:
+                self.on_give_up([item for _, _, item in remaining], [key for _, key, _ in remaining])
+            except Exception:
+                pass
+
+    def _acked(self, entries: List[_Pending]) -> None:
+        self._count("sent", len(entries))
+        if self.on_sent is not None and entries:
+            now = time.monotonic()
+            try:
+                self.on_sent([now - enqueued_at for enqueued_at, _, _ in entries])
+            except Exception:
+                pass
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += amount
@@ -15,7 +15,14 @@ export interface FakeAutoMemApi {
   close: () => Promise<void>;
 }
 
-export async function startFakeAutoMemApi(): Promise<FakeAutoMemApi> {
+export interface FakeAutoMemApiOptions {
+  /** Delay every /recall response by this many milliseconds. */
+  recallDelayMs?: number;
+}
+
+export async function startFakeAutoMemApi(
+  options: FakeAutoMemApiOptions = {}
+): Promise<FakeAutoMemApi> {
   const requests: FakeAutoMemApi['requests'] = [];
   let memoryCounter = 0;
 
@@ -58,6 +65,9 @@ export async function startFakeAutoMemApi(): Promise<FakeAutoMemApi> {
     }
 
     if (method === 'GET' && url.pathname === '/recall') {
+      if (options.recallDelayMs) {
+        await new Promise((resolve) => setTimeout(resolve, options.recallDelayMs));
+      }
       const tags = url.searchParams.getAll('tags');
       const query = url.searchParams.get('query') || '';
       const kind = tags.includes('preference')
@@ -0,0 +1,107 @@
+/**
+ * Unit tests for the Hermes provider (templates/hermes/provider/).
+ *
+ * The provider is stdlib-only Python, so its tests are plain unittest modules
+ * next to this file. Each case below runs one module in a python3 subprocess
+ * and fails with the module's own output. Run a module directly while
+ * iterating: `cd tests/hermes-provider && python3 -m unittest test_mirror -v`.
+ */
+
+import { spawnSync } from 'child_process';
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { describe, expect, it } from 'vitest';
+
+const TEST_DIR = path.dirname(fileURLToPath(import.meta.url));
+const HAS_PYTHON3 = spawnSync('python3', ['--version']).status === 0;
+
+function runUnittest(module: string): void {
+  const home = fs.mkdtempSync(path.join(os.tmpdir(), 'automem-hermes-units-'));
+  try {
+    const result = spawnSync('python3', ['-m', 'unittest', module], {
+      cwd: TEST_DIR,
+      encoding: 'utf8',
+      timeout: 60_000,
+      env: { ...process.env, HERMES_HOME: home, PYTHONDONTWRITEBYTECODE: '1' },
+    });
+    expect(result.status, `${result.stdout}\n${result.stderr}`).toBe(0);
+  } finally {
+    fs.rmSync(home, { recursive: true, force: true });
+  }
+}
+
+describe.skipIf(!HAS_PYTHON3)('Hermes provider units', () => {
+  it('mirror keeps the newest copy and scopes files per endpoint and key', () => {
+    runUnittest('test_mirror');
+  });
+
+  it('metrics snapshots are kept per process and summed', () => {
+    runUnittest('test_metrics');
+  });
+
+  it('spool replays in order and live writes queue behind a backlog', () => {
+    runUnittest('test_spool');
+  });
+
+  it('transport resends only retry-safe requests and honours proxies', () => {
+    runUnittest('test_transport');
+  });
+
+  it('breaker ignores local pool exhaustion and keeps its first probe', () => {
+    runUnittest('test_breaker');
+  });
+
+  it('recall decoder stops at the section limit on an oversized response', () => {
+    runUnittest('test_recall_decoder');
+  });
+
+  it('recall_batch batches misses and fans out when batching is unsupported', () => {
+    runUnittest('test_batch');
+  });
+
+  it('batched capture writes carry stable idempotency keys', () => {
+    runUnittest('test_write_queue');
+  });
+
+  it('prefetch returns completed sections within its latency budget', () => {
+    runUnittest('test_prefetch_budget');
+  });
+
+  it('recall cache drops responses fetched across a write', () => {
+    runUnittest('test_recall_cache');
+  });
+
+  it('speculative recall answers the next turn only when it covers the topic', () => {
+    runUnittest('test_speculative_recall');
+  });
+
+  it('injected memories are de-duplicated across turns within the context budget', () => {
+    runUnittest('test_context_budget');
+  });
+
+  it('bulk import resumes from its checkpoint and remaps memory ids', () => {
+    runUnittest('test_bulk_import');
+  });
+
+  it('export pages by keyset cursor through timestamp ties', () => {
+    runUnittest('test_bulk_export');
+  });
+
+  it('warm-start cache is scoped to endpoint and key and answers the first turn', () => {
+    runUnittest('test_warm_start');
+  });
+
+  it('provider instances share a client per endpoint and key', () => {
+    runUnittest('test_shared_client');
+  });
+
+  it('reads fail over across replicas in latency order', () => {
+    runUnittest('test_routing');
+  });
+
+  it('fake backend honours time_query and updated_desc', () => {
+    runUnittest('test_fake_backend');
+  });
+});
@@ -0,0 +1,5 @@
+"""Stand-in for Hermes' MemoryProvider base class."""
+
+
+class MemoryProvider:
+    pass
@@ -0,0 +1,7 @@
+"""Stand-in for Hermes' constants module."""
+
+import os
+
+
+def get_hermes_home():
+    return os.environ["HERMES_HOME"]
@@ -0,0 +1,7 @@
+"""Stand-in for Hermes' tool registry helpers."""
+
+import json
+
+
+def tool_error(message):
+    return json.dumps({"error": message})
@@ -0,0 +1,62 @@
+import time
+import unittest
+
+from _support import load_provider
+
+automem = load_provider()
+from automem.fake_backend import start_fake_backend  # noqa: E402
+from automem.recall_cache import RecallCache  # noqa: E402
+from automem.transport import ConnectionPool  # noqa: E402
+
+QUERIES = [{"query": f"topic {index}", "limit": 3} for index in range(4)]
+
+
+class RecallBatchTest(unittest.TestCase):
+    def start(self, **options) -> automem.AutoMemClient:
+        server = start_fake_backend(memories=40, **options)
+        self.addCleanup(server.stop)
+        self.backend = server.backend
+        pool = ConnectionPool()
+        self.addCleanup(pool.close)
+        client = automem.AutoMemClient(server.url, "", pool=pool, cache=RecallCache())
+        client.health()
+        return client
+
+    def test_sends_misses_in_one_round_trip(self) -> None:
+        client = self.start()
+        self.assertTrue(client.supports_recall_batch)
+        client.recall(QUERIES[1])
+        responses = client.recall_batch(QUERIES)
+        self.assertEqual(len(responses), len(QUERIES))
+        stats = self.backend.stats()
+        self.assertEqual(stats.get("POST /recall/batch"), 1)
+        self.assertEqual(stats.get("GET /recall"), 1)
+        self.assertEqual(responses[1], client.recall(QUERIES[1]))
+        self.assertEqual(self.backend.stats().get("GET /recall"), 1)
+
+    def test_unsupported_batch_fans_out_in_query_order(self) -> None:
+        client = self.start(recall_batch=False, latency_ms=200)
+        self.assertFalse(client.supports_recall_batch)
+        started = time.perf_counter()
+        responses = client.recall_batch(QUERIES)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(self.backend.stats().get("GET /recall"), len(QUERIES))
+        self.assertIsNone(self.backend.stats().get("POST /recall/batch"))
+        # Sequential fetches would take at least 4 x 200 ms.
+        self.assertLess(elapsed, 0.6)
+        self.backend.latency_ms = 0.0
+        client.cache.invalidate()
+        self.assertEqual(responses, [client.recall(args) for args in QUERIES])
+
+    def test_batch_404_is_remembered_and_falls_back(self) -> None:
+        client = self.start()
+        client._recall_batch_supported = True
+        self.backend.recall_batch = False
+        responses = client.recall_batch(QUERIES)
+        self.assertEqual(len(responses), len(QUERIES))
+        self.assertFalse(client.supports_recall_batch)
+        self.assertEqual(self.backend.stats().get("GET /recall"), len(QUERIES))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from _support import load_provider
+
+automem = load_provider()
+from automem.breaker import CircuitBreaker, breaker_for  # noqa: E402
+from automem.fake_backend import start_fake_backend  # noqa: E402
+from automem.transport import ConnectionPool, PoolExhausted  # noqa: E402
+
+
+class SaturatedPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = start_fake_backend(memories=0, latency_ms=400)
+        self.addCleanup(self.server.stop)
+        pool = ConnectionPool(max_per_host=1)
+        self.addCleanup(pool.close)
+        self.client = automem.AutoMemClient(self.server.url, "", pool=pool)
+
+    def test_sync_pool_exhaustion_is_not_a_breaker_failure(self) -> None:
+        busy = threading.Thread(target=self.client.request, args=("GET", "health"))
+        busy.start()
+        self.addCleanup(busy.join)
+        threading.Event().wait(0.1)
+        with self.assertRaises(PoolExhausted):
+            self.client.request("GET", "health", timeout=0.05)
+        self.assertEqual(self.client.breaker.snapshot()["consecutive_failures"], 0)
+
+
+class ProbeOwnershipTest(unittest.TestCase):
+    def test_first_probe_wins(self) -> None:
+        breaker = CircuitBreaker()
+        first, second = object(), object()
+        self.assertTrue(breaker.adopt_probe(lambda: first))
+        self.assertFalse(breaker.adopt_probe(lambda: second))
+        self.assertIs(breaker.probe(), first)
+
+    def test_later_clients_keep_the_first_clients_probes(self) -> None:
+        endpoint, replica = "http://probe-owner.invalid:1", "http://probe-replica.invalid:2"
+        first = automem.AutoMemClient(endpoint, "", replicas=[replica])
+        primary_probe = breaker_for(endpoint).probe
+        replica_probe = breaker_for(replica).probe
+        automem.AutoMemClient(endpoint, "", replicas=[replica])
+        self.assertEqual(breaker_for(endpoint).probe, first.health)
+        self.assertIs(breaker_for(endpoint).probe, primary_probe)
+        self.assertIs(breaker_for(replica).probe, replica_probe)
+
+
+if __name__ == "__main__":
+    unittest.main()
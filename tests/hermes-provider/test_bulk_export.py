@@ -0,0 +1,124 @@
+import os
+import random
+import unittest
+
+from _support import TempDirTestCase, load_provider
+
+load_provider()
+from automem.bulk_export import Exporter, ExportFailed, _timestamp  # noqa: E402
+
+
+def _order(memory):
+    # Memories without a timestamp sort first, as SQL NULLs do.
+    at = _timestamp(memory["timestamp"])
+    return (at is not None, at or 0, memory["id"])
+
+
+class _Corpus:
+    """/recall stand-in: time_asc order (ties by id), ``start``/``end`` bounds, offset and limit."""
+
+    def __init__(self):
+        self.memories = []
+        self.requests = []
+        self.ignore_start = False
+        self.shuffle_ties = False
+        self.on_fetch = None
+
+    def add(self, memory_id: str, timestamp: str) -> None:
+        self.memories.append({"id": memory_id, "content": memory_id, "timestamp": timestamp})
+
+    def fetch(self, params):
+        self.requests.append(dict(params))
+        if self.on_fetch is not None:
+            self.on_fetch(len(self.requests))
+        start, end = _timestamp(params["start"]), _timestamp(params.get("end"))
+        if self.shuffle_ties:
+            random.shuffle(self.memories)
+            ordered = sorted(self.memories, key=lambda memory: _order(memory)[:2])
+        else:
+            ordered = sorted(self.memories, key=_order)
+        matching = [
+            memory
+            for memory in ordered
+            if _timestamp(memory["timestamp"]) is None
+            or (self.ignore_start or _timestamp(memory["timestamp"]) >= start)
+            and (end is None or _timestamp(memory["timestamp"]) <= end)
+        ]
+        offset = int(params.get("offset", 0))
+        page = matching[offset : offset + int(params["limit"])]
+        return {"results": [{"id": memory["id"], "memory": dict(memory)} for memory in page]}
+
+
+class ExporterTest(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.corpus = _Corpus()
+        self.corpus.add("before", "2026-01-01T04:00:00+00:00")
+        # Seven memories share a timestamp, more than two pages of three.
+        for index in range(7):
+            self.corpus.add(f"tie-{index}", "2026-01-01T05:00:00+00:00")
+        self.corpus.add("after", "2026-01-01T06:00:00+00:00")
+        self.watermark = os.path.join(self.tmp, "export.json")
+
+    def export(self, **options):
+        written = []
+        exporter = Exporter(self.corpus.fetch, page_size=3, backoff_base=0.0, watermark_path=self.watermark)
+        stats = exporter.run(lambda page: written.extend(memory["id"] for memory in page), **options)
+        return written, stats
+
+    def test_pages_through_ties_without_gaps_or_repeats(self) -> None:
+        written, stats = self.export()
+        self.assertEqual(written, ["before", *(f"tie-{index}" for index in range(7)), "after"])
+        self.assertEqual(stats["exported"], 9)
+        tie_pages = [request for request in self.corpus.requests if request["start"].startswith("2026-01-01T05")]
+        # Each tie page re-reads the last memory written at the cursor.
+        self.assertEqual([request.get("offset") for request in tie_pages], [1, 3, 5])
+        self.assertEqual(stats["tie_restarts"], 0)
+
+    def test_memory_stored_inside_a_tie_mid_export_is_not_skipped(self) -> None:
+        def store(count):
+            if count == 3:
+                # Sorts before the tie rows already written, shifting the offset.
+                self.corpus.add("tie-0a", "2026-01-01T05:00:00+00:00")
+
+        self.corpus.on_fetch = store
+        written, stats = self.export()
+        self.assertEqual(sorted(written), sorted(["before", "tie-0a", "after", *(f"tie-{index}" for index in range(7))]))
+        self.assertEqual(len(written), len(set(written)))
+        self.assertEqual(stats["tie_restarts"], 1)
+
+    def test_unstable_tie_order_fails_instead_of_skipping(self) -> None:
+        random.seed(7)
+        self.corpus.shuffle_ties = True
+        with self.assertRaises(ExportFailed) as raised:
+            self.export()
+        self.assertIn("--page-size", str(raised.exception))
+
+    def test_memories_without_a_timestamp_are_written_once(self) -> None:
+        self.corpus.memories.append({"id": "undated", "content": "undated", "timestamp": None})
+        written, stats = self.export()
+        self.assertEqual(written.count("undated"), 1)
+        self.assertEqual(stats["untimed"], 1)
+        self.assertEqual(stats["exported"], 10)
+
+    def test_incremental_export_fetches_only_new_memories(self) -> None:
+        self.export()
+        self.corpus.add("tie-7", "2026-01-01T05:00:00+00:00")
+        self.corpus.add("later", "2026-01-02T00:00:00+00:00")
+        written, stats = self.export(incremental=True)
+        self.assertEqual(written, ["later"])
+        self.assertEqual(stats["resumed_from"], "2026-01-01T06:00:00+00:00")
+
+    def test_window_bounds_are_applied(self) -> None:
+        written, _ = self.export(since="2026-01-01T04:30:00+00:00", until="2026-01-01T05:30:00+00:00")
+        self.assertEqual(written, [f"tie-{index}" for index in range(7)])
+
+    def test_server_ignoring_the_cursor_fails_instead_of_looping(self) -> None:
+        self.corpus.ignore_start = True
+        self.corpus.memories.insert(0, {"id": "old", "content": "old", "timestamp": "2025-01-01T00:00:00+00:00"})
+        with self.assertRaises(ExportFailed):
+            self.export(since="2026-01-01T00:00:00+00:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
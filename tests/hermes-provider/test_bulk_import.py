@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+import unittest
+
+from _support import TempDirTestCase, load_provider
+
+load_provider()
+from automem.bulk_import import BulkImporter, ImportAborted  # noqa: E402
+
+
+class _Backend:
+    """Sender stand-in that assigns its own ids and can refuse one memory's store."""
+
+    def __init__(self, refuse: str = ""):
+        self.refuse = refuse
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def send(self, op, payload, key):
+        if op == "store" and payload.get("id") == self.refuse:
+            raise ConnectionRefusedError("backend down")
+        with self.lock:
+            self.calls.append((op, payload, key))
+        return {"memory_id": "srv-" + payload["id"]} if op == "store" else {}
+
+    def sent(self, op):
+        return [payload for kind, payload, _ in self.calls if kind == op]
+
+
+class BulkImporterTest(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.source = os.path.join(self.tmp, "memories.jsonl")
+        self.checkpoint = os.path.join(self.tmp, "import.json")
+        lines = []
+        for index in range(10):
+            lines.append({"id": f"m{index}", "content": f"note {index}", "tags": ["import"]})
+            if index % 3 == 2:
+                lines.append({"memory1_id": f"m{index}", "memory2_id": "m0", "type": "RELATES_TO"})
+        with open(self.source, "w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(line) + "\n" for line in lines)
+            handle.write("\nnot json\n" + json.dumps({"id": "blank", "content": " "}) + "\n")
+
+    def importer(self, backend, **options):
+        return BulkImporter(backend.send, self.checkpoint, max_attempts=1, backoff_base=0.0, **options)
+
+    def test_associations_use_the_server_assigned_ids(self) -> None:
+        backend = _Backend()
+        stats = self.importer(backend, concurrency=4).run(self.source)
+        self.assertEqual((stats["stored"], stats["associated"], stats["skipped"], stats["rejected"]), (10, 3, 1, 2))
+        for association in backend.sent("associate"):
+            self.assertTrue(association["memory1_id"].startswith("srv-m"))
+            self.assertEqual(association["memory2_id"], "srv-m0")
+        with open(self.checkpoint.replace(".json", ".rejected.jsonl"), encoding="utf-8") as handle:
+            self.assertEqual([json.loads(line)["line"] for line in handle], [15, 16])
+
+    def test_resumes_after_an_abort_with_the_remembered_ids(self) -> None:
+        with self.assertRaises(ImportAborted) as aborted:
+            self.importer(_Backend(refuse="m6"), concurrency=1).run(self.source)
+        # m0..m5 and the two associations after m2 and m5 finished.
+        self.assertEqual(aborted.exception.stats["line"], 8)
+
+        backend = _Backend()
+        stats = self.importer(backend, concurrency=1).run(self.source)
+        self.assertEqual(stats["resumed_at_line"], 8)
+        self.assertEqual([memory["id"] for memory in backend.sent("store")], ["m6", "m7", "m8", "m9"])
+        self.assertEqual(backend.sent("associate")[0]["memory2_id"], "srv-m0")
+
+    def test_resent_lines_keep_their_idempotency_keys(self) -> None:
+        first, second = _Backend(), _Backend()
+        self.importer(first).run(self.source)
+        self.importer(second).run(self.source, restart=True)
+        first_keys = {key for *_, key in first.calls}
+        self.assertEqual(len(first_keys), len(first.calls))
+        self.assertEqual(first_keys, {key for *_, key in second.calls})
+
+    def test_a_changed_file_starts_over(self) -> None:
+        with self.assertRaises(ImportAborted):
+            self.importer(_Backend(refuse="m6"), concurrency=1).run(self.source)
+        with open(self.source, "r+", encoding="utf-8") as handle:
+            content = handle.read()
+            handle.seek(0)
+            handle.write(content.replace("note 0", "note 9"))
+        stats = self.importer(_Backend(), concurrency=1).run(self.source)
+        self.assertEqual(stats["resumed_at_line"], 0)
+        self.assertEqual(stats["stored"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from _support import load_provider
+
+automem = load_provider()
+from automem.session_state import SessionState  # noqa: E402
+
+
+def _response(*memories):
+    return {"results": [{"id": key, "memory": {"id": key, "content": content}} for key, content in memories]}
+
+
+class ContextBudgetTest(unittest.TestCase):
+    def render(self, state, response, window=2, chars=None, limit=5):
+        budget = automem._ContextBudget(state, window, chars)
+        section = automem._format_recall_section("Task context", response, set(), limit, budget)
+        state.mark_injected(budget.injected)
+        return section
+
+    def test_repeats_inside_the_window_are_suppressed_then_shortened(self) -> None:
+        state = SessionState()
+        long_note = "Deploys go through Railway after CI passes on the main branch. " * 4
+        state.turns = 1
+        self.assertIn(long_note.strip(), self.render(state, _response(("m1", long_note))))
+        state.turns = 3
+        self.assertEqual(self.render(state, _response(("m1", long_note))), "")
+        state.turns = 4
+        section = self.render(state, _response(("m1", long_note)))
+        line = section.splitlines()[1]
+        self.assertTrue(line.endswith("…"))
+        self.assertLessEqual(len(line), automem.REPEAT_PREVIEW_CHARS + 2)
+
+    def test_unseen_memories_rank_before_repeats(self) -> None:
+        state = SessionState()
+        state.turns = 1
+        self.render(state, _response(("old", "An older note about the billing service")))
+        state.turns = 10
+        section = self.render(
+            state,
+            _response(("old", "An older note about the billing service"), ("new", "A new note about the billing service")),
+            limit=1,
+        )
+        self.assertIn("A new note", section)
+        self.assertNotIn("An older note", section)
+
+    def test_budget_clips_then_skips_lines(self) -> None:
+        state = SessionState()
+        first = "a" * 150
+        second = "b" * 150
+        section = self.render(state, _response(("m1", first), ("m2", second)), window=0, chars=220)
+        lines = section.splitlines()[1:]
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith("…"))
+        section = self.render(state, _response(("m1", first), ("m2", second)), window=0, chars=180)
+        self.assertEqual(len(section.splitlines()[1:]), 1)
+
+    def test_zero_window_turns_de_duplication_off(self) -> None:
+        state = SessionState()
+        state.turns = 1
+        self.render(state, _response(("m1", "A note about staging backups")), window=0)
+        state.turns = 2
+        self.assertIn("staging backups", self.render(state, _response(("m1", "A note about staging backups")), window=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
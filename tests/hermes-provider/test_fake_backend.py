@@ -0,0 +1,41 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from _support import load_provider
+
+load_provider()
+from automem.fake_backend import FakeAutoMem  # noqa: E402
+
+
+def _ago(**delta) -> str:
+    return (datetime.now(timezone.utc) - timedelta(**delta)).isoformat()
+
+
+class FakeRecallTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = FakeAutoMem()
+        self.backend.add({"id": "old", "content": "billing note", "tags": ["p"], "timestamp": _ago(days=200)})
+        self.backend.add({"id": "month", "content": "billing note", "tags": ["p"], "timestamp": _ago(days=30)})
+        self.backend.add({"id": "hour", "content": "billing note", "tags": ["p"], "timestamp": _ago(hours=1)})
+
+    def ids(self, **options) -> list:
+        return [result["id"] for result in self.backend.recall("", ["p"], 10, **options)]
+
+    def test_time_query_limits_the_window(self) -> None:
+        self.assertEqual(set(self.ids(time_query="last 90 days")), {"month", "hour"})
+        self.assertEqual(self.ids(time_query="past 2 hours"), ["hour"])
+        self.assertEqual(set(self.ids(time_query="whenever")), {"old", "month", "hour"})
+
+    def test_updated_desc_orders_by_the_latest_edit(self) -> None:
+        self.assertEqual(self.ids(sort="updated_desc"), ["hour", "month", "old"])
+        self.backend.update("old", {"content": "billing note, revised"})
+        self.assertEqual(self.ids(sort="updated_desc"), ["old", "hour", "month"])
+
+    def test_seeded_memories_fall_inside_recent_windows(self) -> None:
+        backend = FakeAutoMem()
+        backend.seed(50)
+        self.assertEqual(len(backend.recall("", [], 100, time_query="last 1 day")), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import time
+import unittest
+from unittest import mock
+
+from _support import TempDirTestCase, load_provider
+
+load_provider()
+from automem.metrics import Metrics, load_snapshots, merge_snapshots, snapshot_path, write_atomic, write_snapshot  # noqa: E402
+
+
+def _snapshot(pid: int, recalls: int, latency: float) -> dict:
+    registry = Metrics()
+    registry.inc("automem_recall_total", recalls, outcome="ok")
+    registry.observe("automem_recall_seconds", latency, section="preferences")
+    snapshot = registry.snapshot({"automem_sessions": 1})
+    snapshot["pid"] = pid
+    return snapshot
+
+
+class SnapshotAggregationTest(TempDirTestCase):
+    def test_processes_keep_separate_snapshots_and_stats_sums_them(self) -> None:
+        gateway, cron = _snapshot(100, 7, 0.004), _snapshot(200, 1, 0.2)
+        write_atomic(snapshot_path(self.tmp, 100), json.dumps(gateway))
+        prometheus = os.path.join(self.tmp, "automem.prom")
+        write_snapshot(self.tmp, cron, prometheus)  # written as this process
+
+        merged = merge_snapshots(load_snapshots(self.tmp))
+        self.assertEqual(len(merged["pids"]), 2)
+        self.assertEqual(merged["counters"][0]["value"], 8)
+        histogram = merged["histograms"][0]
+        self.assertEqual(histogram["count"], 2)
+        self.assertEqual(histogram["max"], 0.2)
+        self.assertEqual(sorted(gauge["labels"]["pid"] for gauge in merged["gauges"]), ["100", "200"])
+        with open(prometheus, encoding="utf-8") as handle:
+            self.assertIn('automem_recall_total{outcome="ok"} 8', handle.read())
+
+    def test_expired_snapshots_are_pruned(self) -> None:
+        stale = snapshot_path(self.tmp, 300)
+        write_atomic(stale, json.dumps(_snapshot(300, 5, 0.01)))
+        expired = time.time() - 2 * 86400
+        os.utime(stale, (expired, expired))
+        write_snapshot(self.tmp, _snapshot(400, 1, 0.01))
+        self.assertFalse(os.path.exists(stale))
+        self.assertEqual(merge_snapshots(load_snapshots(self.tmp))["counters"][0]["value"], 1)
+
+    def test_flush_without_prometheus_file_does_not_read_other_snapshots(self) -> None:
+        with open(snapshot_path(self.tmp, 500), "w", encoding="utf-8") as handle:
+            handle.write("{")
+        with mock.patch("automem.metrics.load_snapshot", side_effect=AssertionError("parsed")):
+            write_snapshot(self.tmp, _snapshot(600, 1, 0.01))
+        self.assertTrue(os.path.exists(snapshot_path(self.tmp, 500)))
+
+
+if __name__ == "__main__":
+    unittest.main()
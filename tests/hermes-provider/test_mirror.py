@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import unittest
+
+from _support import TempDirTestCase, load_provider
+
+automem = load_provider()
+from automem.mirror import LocalMirror, mirror_path_for  # noqa: E402
+
+
+def _fts5_available() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.Error:
+        return False
+    return True
+
+
+@unittest.skipUnless(_fts5_available(), "SQLite without FTS5")
+class LocalMirrorTest(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.mirror = LocalMirror(os.path.join(self.tmp, "mirror.sqlite3"))
+        self.addCleanup(self.mirror.close)
+
+    def test_newer_copy_wins(self) -> None:
+        self.mirror.upsert([{"id": "m1", "content": "deploy with blue green", "updated_at": "2026-02-01T00:00:00Z"}])
+        written = self.mirror.upsert(
+            [{"id": "m1", "content": "deploy with canaries", "updated_at": "2026-01-01T00:00:00Z"}]
+        )
+        self.assertEqual(written, 0)
+        self.assertEqual(self.mirror.search("deploy")[0]["memory"]["content"], "deploy with blue green")
+
+        self.mirror.upsert([{"id": "m1", "content": "deploy with canaries", "updated_at": "2026-03-01T00:00:00Z"}])
+        self.assertEqual(self.mirror.search("deploy")[0]["memory"]["content"], "deploy with canaries")
+        self.assertEqual(self.mirror.search("green"), [])
+
+    def test_undated_memories_rank_oldest(self) -> None:
+        self.mirror.upsert(
+            [
+                {"id": "dated", "content": "recent note", "tags": ["p"], "updated_at": "2026-01-01T00:00:00Z"},
+                {"id": "undated", "content": "old note", "tags": ["p"]},
+            ]
+        )
+        self.assertEqual([row["id"] for row in self.mirror.search(tags=["p"])], ["dated", "undated"])
+        # An undated copy never replaces a dated one.
+        self.mirror.upsert([{"id": "dated", "content": "stale copy", "tags": ["p"]}])
+        self.assertEqual(self.mirror.search(tags=["p"])[0]["memory"]["content"], "recent note")
+
+    def test_path_is_scoped_to_endpoint_and_key(self) -> None:
+        base = mirror_path_for(self.tmp, "http://a:8001", "k1")
+        self.assertEqual(base, mirror_path_for(self.tmp, "http://a:8001/", "k1"))
+        self.assertNotEqual(base, mirror_path_for(self.tmp, "http://a:8001", "k2"))
+        self.assertNotEqual(base, mirror_path_for(self.tmp, "http://b:8001", "k1"))
+        self.assertNotIn("k1", base)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import time
+import unittest
+
+from _support import ProviderTestCase
+
+PROMPT = "What do you remember about the Billing-Service deployment error traceback?"
+
+
+class PrefetchBudgetTest(ProviderTestCase):
+    backend_options = {"recall_batch": False}
+    env = {"AUTOMEM_HERMES_PREFETCH_BUDGET_MS": "300"}
+
+    def slow_task_context(self, provider, delay: float) -> None:
+        """Delay the Task context recall (the one with a time window) by ``delay`` seconds."""
+        client = provider._client
+        recall = client.recall
+
+        def slow_recall(args, *rest, **options):
+            if args.get("time_query"):
+                time.sleep(delay)
+            return recall(args, *rest, **options)
+
+        client.recall = slow_recall
+        self.addCleanup(vars(client).pop, "recall", None)
+
+    def dropped(self) -> float:
+        snapshot = self.automem.metrics.snapshot()
+        return sum(
+            counter["value"]
+            for counter in snapshot["counters"]
+            if counter["name"] == "automem_recall_total" and counter["labels"].get("outcome") == "dropped"
+        )
+
+    def test_returns_completed_sections_when_the_budget_runs_out(self) -> None:
+        provider = self.start_provider()
+        self.slow_task_context(provider, 1.5)
+        dropped = self.dropped()
+        started = time.perf_counter()
+        with self.assertLogs("automem", "WARNING") as logs:
+            context = provider.prefetch(PROMPT, session_id="budget")
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertIn("Preferences:", context)
+        self.assertNotIn("Task context:", context)
+        self.assertEqual(self.dropped() - dropped, 1)
+        self.assertIn("Task context", "\n".join(logs.output))
+
+    def test_disabled_budget_waits_for_every_section(self) -> None:
+        self.set_env(AUTOMEM_HERMES_PREFETCH_BUDGET_MS="0")
+        provider = self.start_provider()
+        self.slow_task_context(provider, 0.4)
+        context = provider.prefetch(PROMPT, session_id="no-budget")
+        self.assertIn("Preferences:", context)
+        self.assertIn("Task context:", context)
+
+
+if __name__ == "__main__":
+    unittest.main()
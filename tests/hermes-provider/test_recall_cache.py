@@ -0,0 +1,75 @@
+import threading
+import unittest
+
+from _support import load_provider
+
+automem = load_provider()
+from automem.fake_backend import start_fake_backend  # noqa: E402
+from automem.recall_cache import RecallCache  # noqa: E402
+from automem.transport import ConnectionPool  # noqa: E402
+
+
+class RecallCacheTest(unittest.TestCase):
+    def test_put_after_an_invalidation_is_discarded(self) -> None:
+        cache = RecallCache()
+        generation = cache.generation
+        cache.invalidate()
+        cache.put("key", {"results": []}, 10, "query", generation)
+        self.assertIsNone(cache.get("key"))
+        cache.put("key", {"results": []}, 10, "query", cache.generation)
+        self.assertEqual(cache.get("key"), {"results": []})
+
+    def test_expired_entries_miss(self) -> None:
+        cache = RecallCache(ttls={"query": 0.0, "preference": 60.0})
+        cache.put("query", 1, 1, "query", cache.generation)
+        cache.put("preference", 2, 1, "preference", cache.generation)
+        self.assertIsNone(cache.get("query"))
+        self.assertEqual(cache.get("preference"), 2)
+
+    def test_evicts_least_recently_used_by_count_and_bytes(self) -> None:
+        cache = RecallCache(max_entries=2, max_bytes=100)
+        cache.put("a", "a", 10, "query", 0)
+        cache.put("b", "b", 10, "query", 0)
+        cache.get("a")
+        cache.put("c", "c", 10, "query", 0)
+        self.assertIsNone(cache.get("b"))
+        cache.put("d", "d", 95, "query", 0)
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.assertEqual(cache.get("d"), "d")
+
+
+class WriteDuringRecallTest(unittest.TestCase):
+    def test_write_landing_mid_recall_keeps_the_response_out_of_the_cache(self) -> None:
+        server = start_fake_backend(memories=10)
+        self.addCleanup(server.stop)
+        pool = ConnectionPool()
+        self.addCleanup(pool.close)
+        client = automem.AutoMemClient(server.url, "", pool=pool, cache=RecallCache())
+        args = {"query": "deployment", "limit": 3}
+
+        # Hold the recall's response until a store has gone through.
+        in_flight, stored = threading.Event(), threading.Event()
+        read = client._read
+
+        def paused_read(*call, **options):
+            result = read(*call, **options)
+            in_flight.set()
+            stored.wait(5)
+            return result
+
+        client._read = paused_read
+        recall = threading.Thread(target=client.recall, args=(args,))
+        recall.start()
+        self.assertTrue(in_flight.wait(5))
+        del client._read
+        client.store({"content": "A fresh deployment note", "tags": ["deploy"]})
+        stored.set()
+        recall.join(5)
+
+        requests = server.backend.stats().get("GET /recall")
+        client.recall(args)
+        self.assertEqual(server.backend.stats().get("GET /recall"), requests + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
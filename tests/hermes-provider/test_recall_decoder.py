@@ -0,0 +1,51 @@
+import json
+import unittest
+
+from _support import load_provider
+
+automem = load_provider()
+from automem.recall_decoder import decode_recall_response  # noqa: E402
+
+
+def _body(count: int) -> str:
+    results = [{"id": f"m{index}", "memory": {"id": f"m{index}", "content": f"memory {index}"}} for index in range(count)]
+    return json.dumps({"status": "success", "results": results, "count": count})
+
+
+class RecallDecoderTest(unittest.TestCase):
+    def test_stops_early_on_an_oversized_response(self) -> None:
+        args = {"query": "anything", "limit": 3}
+        cap = automem._ambient_decode_cap(args)
+        self.assertEqual(cap, 3)
+        raw = _body(50)
+        payload, decoded = decode_recall_response(raw, cap, automem._displayable_key)
+        self.assertEqual([item["id"] for item in payload["results"]], ["m0", "m1", "m2"])
+        self.assertLess(decoded, len(raw) // 10)
+        self.assertNotIn("count", payload)
+
+    def test_decodes_a_conforming_response_in_full(self) -> None:
+        raw = _body(3)
+        payload, decoded = decode_recall_response(raw, 3, automem._displayable_key)
+        self.assertEqual(payload, json.loads(raw))
+        self.assertEqual(decoded, len(raw))
+
+    def test_skipped_and_duplicate_results_do_not_count_towards_the_cap(self) -> None:
+        results = [
+            {"id": "m0", "memory": {"id": "m0", "content": "first"}},
+            {"id": "m0", "memory": {"id": "m0", "content": "first"}},
+            {"id": "blank", "memory": {"id": "blank", "content": ""}},
+            {"id": "m1", "memory": {"id": "m1", "content": "second"}},
+            {"id": "m2", "memory": {"id": "m2", "content": "third"}},
+        ]
+        raw = json.dumps({"results": results})
+        payload, decoded = decode_recall_response(raw, 2, automem._displayable_key)
+        self.assertEqual([item["id"] for item in payload["results"]], ["m0", "m0", "blank", "m1"])
+        self.assertLess(decoded, len(raw))
+
+    def test_malformed_input_raises_like_json_loads(self) -> None:
+        with self.assertRaises(json.JSONDecodeError):
+            decode_recall_response('{"results": [1, 2', 5, automem._displayable_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import urllib.error
+
+from _support import load_provider
+
+automem = load_provider()
+from automem.fake_backend import start_fake_backend  # noqa: E402
+from automem.routing import FAILURE_PENALTY_SECONDS, EndpointRouter, parse_endpoints  # noqa: E402
+
+ARGS = {"query": "billing deploy", "limit": 3}
+
+
+class FailoverTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.primary = start_fake_backend(memories=20, error_rate=1.0)
+        self.replica = start_fake_backend(memories=20)
+        for server in (self.primary, self.replica):
+            self.addCleanup(server.stop)
+        self.client = automem.AutoMemClient(self.primary.url, "", replicas=[self.replica.url])
+
+    def test_a_failing_primary_read_fails_over_to_the_replica(self) -> None:
+        response = self.client.recall(ARGS)
+        self.assertTrue(response["results"])
+        self.assertEqual(self.replica.backend.stats().get("GET /recall"), 1)
+        rows = {row["endpoint"]: row for row in self.client.router.snapshot()}
+        self.assertEqual(rows[self.primary.url]["failures"], 1)
+        self.assertEqual(rows[self.replica.url]["reads"], 1)
+
+    def test_the_failed_endpoint_is_tried_last_afterwards(self) -> None:
+        self.client.recall(ARGS)
+        self.assertEqual(self.client.router.read_order(), [self.replica.url, self.primary.url])
+        failed = self.primary.backend.stats().get("GET /recall")
+        self.client.recall({**ARGS, "query": "another query"})
+        self.assertEqual(self.primary.backend.stats().get("GET /recall"), failed)
+
+    def test_writes_stay_on_the_primary(self) -> None:
+        with self.assertRaises(urllib.error.HTTPError):
+            self.client.request("POST", "memory", {"content": "note"})
+        self.assertIsNone(self.replica.backend.stats().get("POST /memory"))
+
+
+class RouterTest(unittest.TestCase):
+    def test_only_server_side_errors_fail_over(self) -> None:
+        def http_error(code):
+            return urllib.error.HTTPError("http://a.test", code, "error", {}, None)
+
+        self.assertTrue(automem._fails_over(http_error(503)))
+        self.assertTrue(automem._fails_over(http_error(429)))
+        self.assertFalse(automem._fails_over(http_error(400)))
+        self.assertTrue(automem._fails_over(ConnectionRefusedError()))
+
+    def test_lowest_latency_goes_first_and_stale_endpoints_are_remeasured(self) -> None:
+        primary, replica = "http://primary.route.test", "http://replica.route.test"
+        router = EndpointRouter([primary, replica])
+        router.observe(primary, 0.2)
+        router.observe(replica, 0.05)
+        self.assertEqual(router.read_order(), [replica, primary])
+        router.observe(replica, 0.05)
+        router.failed(primary)
+        self.assertEqual(router.snapshot()[0]["ewma_ms"], FAILURE_PENALTY_SECONDS * 1000)
+        self.assertEqual(router.read_order(), [replica, primary])
+        # Once its penalty is stale the failed endpoint is measured again.
+        router.stale_after = 0.0
+        self.assertEqual(router.read_order(), [primary, replica])
+
+    def test_parse_endpoints_keeps_the_primary_first(self) -> None:
+        self.assertEqual(
+            parse_endpoints("http://a.test/, http://b.test http://a.test"),
+            ["http://a.test", "http://b.test"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
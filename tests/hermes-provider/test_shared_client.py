@@ -0,0 +1,54 @@
+import unittest
+
+from _support import ProviderTestCase
+
+PROMPT = "What do you remember about the Billing-Service deployment?"
+
+
+class SharedClientTest(ProviderTestCase):
+    backend_options = {"recall_batch": False}
+    env = {
+        "AUTOMEM_HERMES_RECALL_CACHE": "true",
+        "AUTOMEM_HERMES_SHARED_CLIENT": "true",
+        "AUTOMEM_HERMES_AUTO_CAPTURE": "false",
+    }
+
+    def recalls(self) -> int:
+        return self.backend.stats().get("GET /recall", 0)
+
+    def test_instances_share_one_client_and_its_recall_cache(self) -> None:
+        parent = self.start_provider("parent")
+        subagent = self.start_provider("child", agent_context="subagent")
+        self.assertIs(parent._client, subagent._client)
+        parent.prefetch(PROMPT, session_id="parent")
+        requests = self.recalls()
+        self.assertGreater(requests, 0)
+        subagent.prefetch(PROMPT, session_id="child")
+        self.assertEqual(self.recalls(), requests)
+
+    def test_another_api_key_gets_its_own_client(self) -> None:
+        first = self.start_provider()
+        self.set_env(AUTOMEM_API_KEY="other-key")
+        second = self.start_provider()
+        self.assertIsNot(first._client, second._client)
+
+    def test_the_last_release_closes_the_client(self) -> None:
+        first = self.start_provider()
+        second = self.start_provider()
+        shared = first._shared
+        self.assertEqual(shared.refs, 2)
+        first.shutdown()
+        self.assertIs(self.automem._shared_clients.get(shared.key), shared)
+        second.shutdown()
+        self.assertNotIn(shared.key, self.automem._shared_clients)
+
+    def test_sharing_can_be_turned_off(self) -> None:
+        self.set_env(AUTOMEM_HERMES_SHARED_CLIENT="false")
+        first = self.start_provider()
+        second = self.start_provider()
+        self.assertIsNot(first._client, second._client)
+        self.assertEqual(self.automem._shared_clients, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from _support import ProviderTestCase
+
+FIRST = "What do you remember about the Billing-Service deployment error traceback?"
+ANSWER = "The Billing-Service failure traces back to the Webhook-Worker retry loop in Ledger-Sync."
+
+
+class SpeculativeRecallTest(ProviderTestCase):
+    backend_options = {"recall_batch": False}
+    env = {"AUTOMEM_HERMES_SPECULATIVE_RECALL": "true", "AUTOMEM_HERMES_AUTO_CAPTURE": "false"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.provider = self.start_provider()
+        self.assertTrue(self.provider.prefetch(FIRST, session_id="s"))
+        self.provider.sync_turn(FIRST, ANSWER, session_id="s")
+        self.speculation = self.provider._session_state.get("s").speculation
+        self.assertIsNotNone(self.speculation)
+        self.speculation[1].result(timeout=5)
+
+    def outcomes(self, outcome: str) -> float:
+        return sum(
+            counter["value"]
+            for counter in self.automem.metrics.snapshot()["counters"]
+            if counter["name"] == "automem_recall_total" and counter["labels"].get("outcome") == outcome
+        )
+
+    def test_next_turn_on_the_new_topic_uses_the_speculative_recall(self) -> None:
+        self.assertIn("webhook-worker", self.speculation[0])
+        used = self.outcomes("speculative")
+        requests = self.backend.stats().get("GET /recall")
+        context = self.provider.prefetch("How is the Webhook-Worker deployed?", session_id="s")
+        self.assertIn("Task context:", context)
+        self.assertEqual(self.outcomes("speculative") - used, 1)
+        self.assertEqual(self.backend.stats().get("GET /recall"), requests)
+
+    def test_unrelated_next_turn_discards_it(self) -> None:
+        used = self.outcomes("speculative")
+        requests = self.backend.stats().get("GET /recall")
+        self.provider.prefetch("How is the Payments-Gateway cluster provisioned?", session_id="s")
+        self.assertEqual(self.outcomes("speculative"), used)
+        self.assertIsNone(self.provider._session_state.get("s").speculation)
+        self.assertGreater(self.backend.stats().get("GET /recall"), requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
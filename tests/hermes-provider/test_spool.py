@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+import time
+import unittest
+
+from _support import TempDirTestCase, load_provider
+
+automem = load_provider()
+from automem.fake_backend import start_fake_backend  # noqa: E402
+from automem.spool import ReplayRejected, WriteSpool, spool_path_for  # noqa: E402
+
+
+class WriteSpoolTest(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = os.path.join(self.tmp, "spool.sqlite3")
+        self.spool = WriteSpool(self.path)
+        self.addCleanup(self.spool.close)
+
+    def test_replays_oldest_first_and_stops_at_a_failure(self) -> None:
+        for index in range(5):
+            self.spool.append("update", {"memory_id": "m1", "content": f"v{index}"})
+        sent = []
+
+        def send(op, payload, key):
+            if payload["content"] == "v1":
+                raise ReplayRejected("HTTP 400")
+            if payload["content"] == "v3":
+                raise OSError("connection refused")
+            sent.append(payload["content"])
+
+        self.assertEqual(self.spool.replay(send), (2, 1))
+        self.assertEqual(sent, ["v0", "v2"])
+        self.assertEqual(self.spool.pending(), 2)
+
+        keys = []
+        self.assertEqual(self.spool.replay(lambda op, payload, key: keys.append((payload["content"], key))), (2, 0))
+        self.assertEqual([content for content, _ in keys], ["v3", "v4"])
+        self.assertEqual(len({key for _, key in keys}), 2)
+        self.assertEqual(self.spool.pending(), 0)
+
+    def test_pending_counts_rows_written_by_other_instances(self) -> None:
+        other = WriteSpool(self.path)
+        self.addCleanup(other.close)
+        self.assertEqual(self.spool.pending(), 0)
+        other.append("store", {"content": "from another process"})
+        self.assertEqual(self.spool.pending(), 1)
+        self.assertEqual(self.spool.replay(lambda op, payload, key: None), (1, 0))
+        self.assertEqual(other.pending(), 0)
+
+    def test_concurrent_replayers_send_each_row_once_in_order(self) -> None:
+        other = WriteSpool(self.path)
+        self.addCleanup(other.close)
+        for index in range(30):
+            self.spool.append("store", {"content": f"n{index}"})
+        sent = []
+        started = threading.Event()
+
+        def send(op, payload, key):
+            started.set()
+            time.sleep(0.005)
+            sent.append(payload["content"])
+
+        first = threading.Thread(target=self.spool.replay, args=(send,))
+        first.start()
+        started.wait(5)
+        self.assertEqual(other.replay(send), (0, 0))
+        first.join()
+        self.assertEqual(sent, [f"n{index}" for index in range(30)])
+        self.assertEqual(other.pending(), 0)
+
+    def test_an_expired_lease_is_taken_over(self) -> None:
+        self.spool.append("store", {"content": "a"})
+        self.spool._renew_lease()
+        other = WriteSpool(self.path)
+        self.addCleanup(other.close)
+        self.assertEqual(other.replay(lambda op, payload, key: None), (0, 0))
+        self.spool._conn.execute("UPDATE replay_lease SET expires_at = 0")
+        self.assertEqual(other.replay(lambda op, payload, key: None), (1, 0))
+
+    def test_each_endpoint_and_key_gets_its_own_file(self) -> None:
+        path = spool_path_for(self.tmp, "http://a.test/")
+        self.assertEqual(path, spool_path_for(self.tmp, "http://a.test"))
+        self.assertNotEqual(path, spool_path_for(self.tmp, "http://b.test"))
+        self.assertNotEqual(path, spool_path_for(self.tmp, "http://a.test", "key"))
+
+    def test_append_refuses_when_full(self) -> None:
+        small = WriteSpool(os.path.join(self.tmp, "small.sqlite3"), max_entries=2)
+        self.addCleanup(small.close)
+        self.assertIsNotNone(small.append("store", {"content": "a"}))
+        self.assertIsNotNone(small.append("store", {"content": "b"}))
+        self.assertIsNone(small.append("store", {"content": "c"}))
+
+
+class SpoolOrderingTest(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.server = start_fake_backend(memories=0)
+        self.addCleanup(self.server.stop)
+        for name, value in (("AUTOMEM_API_URL", self.server.url), ("AUTOMEM_HERMES_SPOOL", "true")):
+            os.environ[name] = value
+            self.addCleanup(os.environ.pop, name, None)
+        self.provider = automem.AutoMemMemoryProvider()
+        self.provider.initialize("spool-order", hermes_home=self.tmp)
+        self.addCleanup(self.provider.shutdown)
+
+    def test_live_write_waits_behind_spooled_backlog(self) -> None:
+        memory_id = self.server.backend.add({"content": "original"})
+        # An update spooled earlier, e.g. by another process during an outage.
+        self.provider._spool.append("update", {"memory_id": memory_id, "content": "older update"})
+
+        result = json.loads(
+            self.provider.handle_tool_call("automem_update_memory", {"memory_id": memory_id, "content": "newer update"})
+        )
+        self.assertEqual(result["status"], "spooled")
+
+        deadline = time.monotonic() + 5
+        while self.provider._spool.pending() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.provider._spool.pending(), 0)
+        self.assertEqual(self.server.backend._memories[memory_id]["content"], "newer update")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import http.client
+import os
+import socket
+import threading
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from _support import load_provider
+
+load_provider()
+from automem.transport import ConnectionPool, TransportResponse, raise_for_status, same_host_redirect  # noqa: E402
+
+
+class _FlakyServer:
+    """Answers the first request on each connection, then drops the connection
+    on the next one after reading it, like a server restarting mid-request."""
+
+    def __init__(self) -> None:
+        self.requests = []
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.url = f"http://127.0.0.1:{self._sock.getsockname()[1]}"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket) -> None:
+        with conn, conn.makefile("rb") as reader:
+            for answered in (True, False):
+                request_line = reader.readline().decode("latin-1").strip()
+                if not request_line:
+                    return
+                length = 0
+                while True:
+                    line = reader.readline()
+                    if line in {b"\r\n", b"\n", b""}:
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                reader.read(length)
+                self.requests.append(request_line.split(" ")[0])
+                if not answered:
+                    return
+                conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+
+
+class StaleConnectionRetryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = _FlakyServer()
+        self.addCleanup(self.server.close)
+
+    def test_blocking_pool_resends_only_retry_safe_requests(self) -> None:
+        pool = ConnectionPool()
+        self.addCleanup(pool.close)
+        pool.request("GET", f"{self.server.url}/health")
+        with self.assertRaises(http.client.RemoteDisconnected):
+            pool.request("POST", f"{self.server.url}/memory", body=b"{}")
+        self.assertEqual(self.server.requests, ["GET", "POST"])
+
+        # A GET is sent again; a POST is not, even with an Idempotency-Key.
+        pool.request("GET", f"{self.server.url}/health")
+        self.assertEqual(pool.request("GET", f"{self.server.url}/recall").status, 200)
+        with self.assertRaises(http.client.RemoteDisconnected):
+            pool.request("POST", f"{self.server.url}/memory", body=b"{}", headers={"Idempotency-Key": "k"})
+        self.assertEqual(self.server.requests, ["GET", "POST", "GET", "GET", "GET", "POST"])
+
+
+class ProxyTest(unittest.TestCase):
+    def test_plain_http_goes_through_the_proxy_with_an_absolute_target(self) -> None:
+        proxy = _FlakyServer()
+        self.addCleanup(proxy.close)
+        seen = []
+        original = proxy._handle
+
+        def record(conn):
+            seen.append(conn.recv(4096, socket.MSG_PEEK).decode("latin-1"))
+            original(conn)
+
+        proxy._handle = record
+        proxy_url = proxy.url.replace("http://", "http://user:secret@")
+        with mock.patch.dict(os.environ, {"http_proxy": proxy_url, "no_proxy": ""}):
+            pool = ConnectionPool()
+            self.addCleanup(pool.close)
+            self.assertEqual(pool.request("GET", "http://automem.internal:8001/health").status, 200)
+        self.assertTrue(seen[0].startswith("GET http://automem.internal:8001/health HTTP/1.1"))
+        self.assertIn("Proxy-Authorization: Basic dXNlcjpzZWNyZXQ=", seen[0])
+
+    def test_no_proxy_hosts_connect_directly(self) -> None:
+        server = _FlakyServer()
+        self.addCleanup(server.close)
+        with mock.patch.dict(os.environ, {"http_proxy": "http://127.0.0.1:9", "no_proxy": "127.0.0.1"}):
+            pool = ConnectionPool()
+            self.addCleanup(pool.close)
+            self.assertEqual(pool.request("GET", f"{server.url}/health").status, 200)
+
+
+class _Redirects(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self._answer()
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._answer()
+
+    def _answer(self) -> None:
+        routes = {"/old": "/health", "/away": "http://elsewhere.invalid/health", "/loop": "/loop"}
+        if self.path in routes:
+            self.send_response(308)
+            self.send_header("Location", routes[self.path])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class RedirectTest(unittest.TestCase):
+    def setUp(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Redirects)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = f"http://127.0.0.1:{server.server_address[1]}"
+        self.pool = ConnectionPool()
+        self.addCleanup(self.pool.close)
+
+    def test_reads_follow_same_host_redirects(self) -> None:
+        response = self.pool.request("GET", f"{self.url}/old")
+        self.assertEqual((response.status, response.url), (200, f"{self.url}/health"))
+
+    def test_writes_other_hosts_and_loops_are_not_followed(self) -> None:
+        self.assertEqual(self.pool.request("POST", f"{self.url}/old", body=b"{}").status, 308)
+        self.assertEqual(self.pool.request("GET", f"{self.url}/away").status, 308)
+        self.assertEqual(self.pool.request("GET", f"{self.url}/loop").status, 308)
+        self.assertIsNone(same_host_redirect("https://a.test/health", "http://a.test/health"))
+        self.assertEqual(same_host_redirect("http://a.test/health", "https://a.test/health/"), "https://a.test/health/")
+
+    def test_unfollowed_redirects_surface_as_http_errors(self) -> None:
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            raise_for_status("http://a/recall", TransportResponse(308, "Permanent Redirect", {}, b""))
+        self.assertEqual(raised.exception.code, 308)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import json
+import os
+import time
+import unittest
+
+from _support import ProviderTestCase, TempDirTestCase, load_provider
+
+load_provider()
+from automem.warm_start import WARM_START_FILENAME, WarmStartCache  # noqa: E402
+
+ARGS = {"tags": ["preference"], "limit": 5}
+RESPONSE = {"results": [{"id": "p1", "memory": {"id": "p1", "content": "Prefers tabs"}}]}
+
+
+class WarmStartCacheTest(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = os.path.join(self.tmp, WARM_START_FILENAME)
+
+    def saved(self, endpoint="http://a.test/", api_key="key"):
+        cache = WarmStartCache(self.path, endpoint, api_key)
+        cache.put("preferences", ARGS, RESPONSE, cache.generation)
+        self.assertTrue(cache.save())
+        return cache
+
+    def test_entries_load_only_for_the_same_endpoint_and_key(self) -> None:
+        self.saved()
+        self.assertEqual(WarmStartCache(self.path, "http://a.test", "key").load(), 1)
+        self.assertEqual(WarmStartCache(self.path, "http://b.test", "key").load(), 0)
+        self.assertEqual(WarmStartCache(self.path, "http://a.test", "other").load(), 0)
+        with open(self.path, encoding="utf-8") as handle:
+            self.assertNotIn("key", json.load(handle)["scope"].values())
+
+    def test_entries_need_matching_args_and_freshness(self) -> None:
+        self.saved()
+        cache = WarmStartCache(self.path, "http://a.test", "key", max_age=60)
+        cache.load()
+        self.assertEqual(cache.get("preferences", ARGS), RESPONSE)
+        self.assertIsNone(cache.get("preferences", {**ARGS, "limit": 6}))
+        cache._entries["preferences"]["fetched_at"] = time.time() - 120
+        self.assertIsNone(cache.get("preferences", ARGS))
+
+    def test_a_write_during_a_refresh_drops_its_response(self) -> None:
+        cache = WarmStartCache(self.path, "http://a.test", "key")
+        generation = cache.generation
+        cache.invalidate()
+        cache.put("preferences", ARGS, RESPONSE, generation)
+        self.assertEqual(len(cache), 0)
+
+    def test_an_unchanged_refresh_does_not_rewrite_the_file(self) -> None:
+        self.saved()
+        cache = WarmStartCache(self.path, "http://a.test", "key")
+        cache.load()
+        cache.put("preferences", ARGS, RESPONSE, cache.generation)
+        self.assertFalse(cache.save())
+
+
+class WarmStartProviderTest(ProviderTestCase):
+    env = {"AUTOMEM_HERMES_WARM_START": "true", "AUTOMEM_HERMES_SHARED_CLIENT": "false"}
+    prompt = "How do deploys work for the billing service?"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.project = self.automem._default_project_tags()[0]
+        self.backend.add({"id": "proj", "content": "Staging deploys pause the queue first", "tags": [self.project]})
+        self.backend.add({"id": "pref", "content": "Prefers rebase merges", "tags": ["preference"]})
+        first = self.start_provider()
+        first._refresh_warm_start()
+        first.shutdown()
+
+    def warm_outcomes(self) -> float:
+        return sum(
+            counter["value"]
+            for counter in self.automem.metrics.snapshot()["counters"]
+            if counter["name"] == "automem_recall_total" and counter["labels"].get("outcome") == "warm_start"
+        )
+
+    def test_preferences_come_from_disk_and_task_context_is_still_recalled(self) -> None:
+        path = os.path.join(self.tmp, "plugins", "automem", WARM_START_FILENAME)
+        self.assertTrue(os.path.exists(path))
+        provider = self.start_provider()
+        plan = provider._plan_prefetch(self.prompt, "s")
+        labels = [label for label, _, _ in plan.sections]
+        self.assertEqual([labels[index] for index in plan.warm], ["Preferences"])
+        self.assertEqual([labels[index] for index in plan.fallback], ["Task context"])
+
+    def test_saved_project_context_covers_a_failed_task_context_recall(self) -> None:
+        provider = self.start_provider()
+        self.backend.error_rate = 1.0
+        before = self.warm_outcomes()
+        context = provider.prefetch(self.prompt, session_id="s")
+        self.assertIn("Staging deploys pause the queue", context)
+        self.assertIn("Prefers rebase merges", context)
+        self.assertEqual(self.warm_outcomes() - before, 2)
+
+    def test_a_write_invalidates_and_refreshes_only_its_entry(self) -> None:
+        provider = self.start_provider()
+        project_key = "project:" + self.project
+        self.assertEqual(provider._stale_warm_keys("store", {"content": "x", "tags": ["preference"]}), ["preferences"])
+        self.assertEqual(provider._stale_warm_keys("store", {"content": "x", "tags": ["other"]}), [])
+        self.assertEqual(provider._stale_warm_keys("update", {"memory_id": "m"}), ["preferences", project_key])
+        self.assertEqual(provider._stale_warm_keys("associate", {"memory1_id": "a"}), [])
+
+        provider.handle_tool_call("automem_store_memory", {"content": "Prefers squash merges", "tags": ["preference"]})
+        preferences = provider._warm_targets()[0][2]
+        deadline = time.monotonic() + 5
+        while provider._warm.get("preferences", preferences) is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        refreshed = provider._warm.get("preferences", preferences)
+        self.assertIn("Prefers squash merges", json.dumps(refreshed))
+        self.assertIsNotNone(provider._warm.get(project_key, provider._warm_targets()[1][2]))
+
+    def test_another_endpoint_ignores_the_saved_file(self) -> None:
+        self.set_env(AUTOMEM_API_URL=self.server.url.replace("127.0.0.1", "localhost"))
+        provider = self.start_provider()
+        self.assertEqual(len(provider._warm), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import threading
+import unittest
+import urllib.error
+
+from _support import TempDirTestCase, load_provider
+
+automem = load_provider()
+from automem.spool import WriteSpool  # noqa: E402
+from automem.write_queue import BatchWriteError, WriteQueue  # noqa: E402
+
+
+class _RecordingClient(automem.AutoMemClient):
+    """Records writes instead of sending them; /memory/batch answers ``batch_status``."""
+
+    def __init__(self, batch_status: int = 200):
+        super().__init__("http://write-queue.invalid:1", "")
+        self.batch_status = batch_status
+        self.sent = []
+
+    def request(self, method, path, body=None, timeout=None, idempotency_key=None, endpoint=None):
+        if path == "memory/batch" and self.batch_status != 200:
+            raise urllib.error.HTTPError(path, self.batch_status, "Not Found", {}, None)
+        self.sent.append((path, idempotency_key))
+        return {"status": "success"}
+
+
+class WriteQueueKeysTest(unittest.TestCase):
+    def run_queue(self, fail, items, **options):
+        """Run ``items`` through a queue whose sender raises ``fail(call)`` when truthy.
+
+        Returns ({content: [keys it was sent with]}, [(items, keys) given up]).
+        """
+        lock = threading.Lock()
+        sent = {}
+        calls = []
+
+        def send(batch, keys):
+            with lock:
+                calls.append(None)
+                call = len(calls)
+                for item, key in zip(batch, keys):
+                    sent.setdefault(item["content"], []).append(key)
+            error = fail(call)
+            if error:
+                raise error
+
+        given_up = []
+        queue = WriteQueue(send, backoff_base=0.0, **options)
+        queue.on_give_up = lambda items, keys: given_up.append((items, keys))
+        for item in items:
+            self.assertTrue(queue.put(item))
+        self.assertTrue(queue.close(timeout=5.0))
+        return sent, given_up
+
+    def test_retries_resend_the_same_keys(self) -> None:
+        sent, _ = self.run_queue(
+            lambda call: OSError("reset") if call < 3 else None,
+            [{"content": f"t{i}"} for i in range(3)],
+        )
+        self.assertTrue(any(len(keys) > 1 for keys in sent.values()))
+        self.assertTrue(all(len(set(keys)) == 1 for keys in sent.values()))
+        self.assertEqual(len({keys[0] for keys in sent.values()}), 3)
+
+    def test_partial_write_resends_only_the_rest_under_their_keys(self) -> None:
+        sent, _ = self.run_queue(
+            lambda call: BatchWriteError(1, OSError("reset")) if call == 1 else None,
+            [{"content": f"t{i}"} for i in range(3)],
+        )
+        self.assertEqual(len(sent["t0"]), 1)
+        self.assertTrue(all(len(set(keys)) == 1 for keys in sent.values()))
+
+    def test_given_up_items_keep_their_keys(self) -> None:
+        sent, given_up = self.run_queue(lambda call: OSError("down"), [{"content": "a"}], max_attempts=2)
+        self.assertEqual(given_up, [([{"content": "a"}], [sent["a"][0]])])
+
+
+class StoreBatchKeysTest(unittest.TestCase):
+    def test_batch_key_is_derived_from_the_item_keys(self) -> None:
+        client = _RecordingClient()
+        memories = [{"content": "a"}, {"content": "b"}]
+        client.store_batch(memories, ["k1", "k2"])
+        client.store_batch(memories, ["k1", "k2"])
+        client.store_batch([{"content": "b"}, {"content": "c"}], ["k2", "k3"])
+        (path, first), (_, second), (_, third) = client.sent
+        self.assertEqual(path, "memory/batch")
+        self.assertTrue(first.startswith("batch-"))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+
+    def test_single_store_fallback_uses_each_items_key(self) -> None:
+        client = _RecordingClient(batch_status=404)
+        client.store_batch([{"content": "a"}, {"content": "b"}], ["k1", "k2"])
+        self.assertEqual(client.sent, [("memory", "k1"), ("memory", "k2")])
+
+
+class SpoolKeyTest(TempDirTestCase):
+    def test_append_keeps_a_given_key(self) -> None:
+        spool = WriteSpool(os.path.join(self.tmp, "spool.sqlite3"))
+        self.addCleanup(spool.close)
+        self.assertEqual(spool.append("store", {"content": "a"}, "capture-1"), "capture-1")
+        replayed = []
+        spool.replay(lambda op, payload, key: replayed.append(key))
+        self.assertEqual(replayed, ["capture-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -395,6 +395,165 @@ print(json.dumps(outputs))
   return JSON.parse(lastJsonLine);
 }
 
+async function timeHermesProviderPrefetch(
+  home: string,
+  prompt: string,
+  cwd: string = projectCwd
+): Promise<{ output: string; elapsedMs: number }> {
+  if (!HERMES_PYTHON) {
+    throw new Error('Hermes Python is not available');
+  }
+
+  const script = String.raw`
+import json
+import logging
+import os
+import time
+
+from hermes_cli.env_loader import load_hermes_dotenv
+from plugins.memory import load_memory_provider
+
+logging.disable(logging.CRITICAL)
+load_hermes_dotenv(hermes_home=os.environ.get("HERMES_HOME"))
+
+provider = load_memory_provider("automem")
+if not provider:
+    raise RuntimeError("AutoMem provider did not load")
+
+provider.initialize("provider-prefetch-timing", hermes_home=os.environ.get("HERMES_HOME"), platform="cli", agent_context="primary")
+started = time.perf_counter()
+output = provider.prefetch(os.environ["PREFETCH_PROMPT"], session_id="provider-prefetch-timing")
+elapsed_ms = (time.perf_counter() - started) * 1000
+provider.shutdown()
+print(json.dumps({"output": output, "elapsedMs": elapsed_ms}))
+`;
+
+  const { stdout } = await execFileAsync(HERMES_PYTHON, ['-c', script], {
+    encoding: 'utf8',
+    cwd,
+    timeout: 30_000,
+    maxBuffer: 1024 * 1024 * 10,
+    env: {
+      ...process.env,
+      HERMES_HOME: home,
+      HERMES_IGNORE_RULES: 'true',
+      PREFETCH_PROMPT: prompt,
+      AUTOMEM_API_KEY: '',
+      AUTOMEM_API_TOKEN: '',
+      DOTENV_CONFIG_QUIET: 'true',
+    },
+  });
+  const lastJsonLine = stdout
+    .trim()
+    .split(/\r?\n/)
+    .reverse()
+    .find((line) => line.startsWith('{'));
+  if (!lastJsonLine) {
+    throw new Error(`Hermes provider prefetch timing did not emit JSON:\n${stdout}`);
+  }
+  return JSON.parse(lastJsonLine);
+}
+
+async function runHermesProviderConcurrentSessions(
+  home: string,
+  sessions: number,
+  turnsPerSession: number,
+  cwd: string = projectCwd
+): Promise<{ errors: string[]; firstTurnPreferences: number[]; emptyOutputs: number }> {
+  if (!HERMES_PYTHON) {
+    throw new Error('Hermes Python is not available');
+  }
+
+  const script = String.raw`
+import json
+import logging
+import os
+import threading
+
+from hermes_cli.env_loader import load_hermes_dotenv
+from plugins.memory import load_memory_provider
+
+logging.disable(logging.CRITICAL)
+load_hermes_dotenv(hermes_home=os.environ.get("HERMES_HOME"))
+
+provider = load_memory_provider("automem")
+if not provider:
+    raise RuntimeError("AutoMem provider did not load")
+
+provider.initialize("provider-stress", hermes_home=os.environ.get("HERMES_HOME"), platform="cli", agent_context="primary")
+sessions = int(os.environ["STRESS_SESSIONS"])
+turns = int(os.environ["STRESS_TURNS"])
+outputs = {}
+errors = []
+lock = threading.Lock()
+start = threading.Barrier(sessions * turns)
+
+def run(session, turn):
+    try:
+        start.wait()
+        # Every turn of a session races on the same session id.
+        output = provider.prefetch(f"Session{session} deployment notes for Railway", session_id=f"stress-{session}")
+        provider.sync_turn(
+            f"user message for session {session} turn {turn}",
+            "assistant message long enough to pass the capture threshold",
+            session_id=f"stress-{session}",
+        )
+        with lock:
+            outputs.setdefault(session, []).append(output)
+    except Exception as exc:
+        with lock:
+            errors.append(f"{type(exc).__name__}: {exc}")
+
+threads = [
+    threading.Thread(target=run, args=(session, turn))
+    for session in range(sessions)
+    for turn in range(turns)
+]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+provider.shutdown()
+print(json.dumps({
+    "errors": errors,
+    "firstTurnPreferences": [
+        sum("Preferences" in output for output in outputs.get(session, []))
+        for session in range(sessions)
+    ],
+    "emptyOutputs": sum(
+        1 for session_outputs in outputs.values() for output in session_outputs if not output
+    ),
+}))
+`;
+
+  const { stdout } = await execFileAsync(HERMES_PYTHON, ['-c', script], {
+    encoding: 'utf8',
+    cwd,
+    timeout: 60_000,
+    maxBuffer: 1024 * 1024 * 10,
+    env: {
+      ...process.env,
+      HERMES_HOME: home,
+      HERMES_IGNORE_RULES: 'true',
+      STRESS_SESSIONS: String(sessions),
+      STRESS_TURNS: String(turnsPerSession),
+      AUTOMEM_HERMES_AUTO_CAPTURE: 'true',
+      AUTOMEM_API_KEY: '',
+      AUTOMEM_API_TOKEN: '',
+      DOTENV_CONFIG_QUIET: 'true',
+    },
+  });
+  const lastJsonLine = stdout
+    .trim()
+    .split(/\r?\n/)
+    .reverse()
+    .find((line) => line.startsWith('{'));
+  if (!lastJsonLine) {
+    throw new Error(`Hermes provider stress run did not emit JSON:\n${stdout}`);
+  }
+  return JSON.parse(lastJsonLine);
+}
+
 async function callHermesProviderRecallTool(home: string): Promise<{
   toolLimitMaximum: number | null;
   recall: string;
@@ -685,6 +844,71 @@ describe.skipIf(!HERMES_PYTHON)('Hermes real host integration', () => {
     expect(debug?.searchParams.getAll('tags')).toEqual([]);
   }, 45_000);
 
+  it('provider prefetch runs its recall sections concurrently', async () => {
+    const recallDelayMs = 600;
+    const slowApi = await startFakeAutoMemApi({ recallDelayMs });
+    try {
+      await applyHermesSetup({
+        mode: 'provider',
+        targetDir: tmpDir,
+        endpoint: slowApi.url,
+        apiKey: 'test-key',
+        projectName: 'host-smoke',
+        quiet: true,
+      });
+
+      // First substantive debug prompt → Preferences, Task context and Debug
+      // context: three recalls that would take ~3x the delay in sequence.
+      const { output, elapsedMs } = await timeHermesProviderPrefetch(
+        tmpDir,
+        'TimeoutError stack trace failing in provider'
+      );
+
+      expect(recallRequests(slowApi)).toHaveLength(3);
+      expect(elapsedMs).toBeGreaterThanOrEqual(recallDelayMs);
+      expect(elapsedMs).toBeLessThan(recallDelayMs * 2);
+      // Section order is the plan order regardless of completion order. (The
+      // fake keys debug and task-context hits by query alone, so the debug hit
+      // is de-duplicated against task context exactly as it was sequentially.)
+      expect(output.indexOf('Preferences')).toBeGreaterThanOrEqual(0);
+      expect(output.indexOf('Preferences')).toBeLessThan(output.indexOf('Task context'));
+      expect(output).not.toContain('Debug context');
+    } finally {
+      await slowApi.close();
+    }
+  }, 45_000);
+
+  it('provider serves hundreds of concurrent sessions without races', async () => {
+    const stressApi = await startFakeAutoMemApi({ recallDelayMs: 20 });
+    try {
+      await applyHermesSetup({
+        mode: 'provider',
+        targetDir: tmpDir,
+        endpoint: stressApi.url,
+        apiKey: 'test-key',
+        projectName: 'host-smoke',
+        quiet: true,
+      });
+
+      const sessions = 200;
+      const result = await runHermesProviderConcurrentSessions(tmpDir, sessions, 2);
+
+      expect(result.errors).toEqual([]);
+      // Two racing turns per session: exactly one of them claims the
+      // first-substantive recall, so each session injects Preferences once.
+      expect(result.firstTurnPreferences).toEqual(Array(sessions).fill(1));
+      // The losing turn repeats the same entities, so it plans no recall.
+      expect(result.emptyOutputs).toBe(sessions);
+      expect(
+        stressApi.requests.filter(
+          (request) => request.method === 'POST' && request.path.startsWith('/memory')
+        ).length
+      ).toBeGreaterThan(0);
+    } finally {
+      await stressApi.close();
+    }
+  }, 90_000);
+
   it('provider prefetch omits ambiguous project gates', async () => {
     await applyHermesSetup({
       mode: 'provider',